@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any
+
+import click
+import pandas as pd
+
+from config import config
+from src.backtest import THROUGHPUT_LOG_LEVEL
+from src.batch import (
+    BATCH_LOG_LEVEL,
+    DONE,
+    FAILED,
+    NO_DATA,
+    BatchState,
+    job_key,
+    load_jobs,
+    run_batch,
+)
+from src.result_cache import REPORT_DEFERRED, REPORT_MODES, ResultCache
+
+
+@click.argument(
+    "jobs_file",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+@click.option(
+    "-w",
+    "--workers",
+    default=os.cpu_count(),
+    type=click.IntRange(min=1),
+    help="Jobs running at the same time (default: number of cores)",
+)
+@click.option(
+    "--report",
+    default=REPORT_DEFERRED,
+    type=click.Choice(REPORT_MODES),
+    help="Render the PDF reports in the jobs (inline), queue them for `bt report` "
+    "(deferred) or skip them (none) (default: deferred)",
+)
+@click.option(
+    "--export_trades",
+    is_flag=True,
+    help="Export the fills, positions and account balances of every job to "
+    "Parquet files in results/<environment>/trades/<result key>/",
+)
+@click.option(
+    "--throughput",
+    is_flag=True,
+    help="Bypass the engine logging of the jobs, errors included, for long "
+    "backtests where logging dominates the run time",
+)
+@click.command(
+    "batch",
+    help="Run the backtests of a JSON Lines file, one job per line with strategy, "
+    "fast_period, slow_period and optional start, end, trade_size, source and "
+    "chunk_size. An interrupted batch resumes without running finished jobs again, "
+    "and backtests in the result cache are not run again.",
+)
+def batch(
+    jobs_file: Path,
+    workers: int,
+    report: str,
+    export_trades: bool,  # noqa: FBT001
+    throughput: bool,  # noqa: FBT001
+) -> None:
+    try:
+        jobs = load_jobs(jobs_file)
+    except ValueError as e:
+        click.echo(str(e))
+        return
+
+    output_dir = Path(config.results_path()) / f"batch_{jobs_file.stem}"
+    state = BatchState(output_dir / "state.json")
+    keys = list(dict.fromkeys(job_key(job) for job in jobs))
+    done = sum(state.status(key) == DONE for key in keys)
+    click.echo(
+        f"Running {len(keys)} jobs on {workers} processes"
+        + (f", {done} already done" if done else "")
+    )
+
+    def on_finish(key: str, job_state: dict[str, Any]) -> None:
+        job = job_state["job"]
+        line = f"{key} {job['strategy']} {job['fast_period']}/{job['slow_period']}: "
+        if job_state["status"] == DONE:
+            line += f"PnL {job_state['summary']['pnl']}"
+            if job_state["cached"]:
+                line += " (cached)"
+        elif job_state["status"] == NO_DATA:
+            line += "no price data found for the range"
+        else:
+            line += "failed\n" + job_state["error"]
+        click.echo(line)
+
+    cache = ResultCache(Path(config.result_cache_path()))
+    completed = run_batch(
+        jobs,
+        state,
+        cache,
+        max_workers=workers,
+        on_finish=on_finish,
+        report=report,
+        export=export_trades,
+        log_level=THROUGHPUT_LOG_LEVEL if throughput else BATCH_LOG_LEVEL,
+    )
+
+    statuses = [state.status(key) for key in keys]
+    rows = [
+        {
+            "key": key,
+            **state.jobs[key]["job"],
+            **state.jobs[key]["summary"],
+            "result": state.jobs[key]["result"],
+            "pdf": cache.pdf_path(state.jobs[key]["result"]),
+        }
+        for key in keys
+        if state.status(key) == DONE
+    ]
+    if rows:
+        pd.DataFrame(rows).to_csv(output_dir / "summary.csv", index=False)
+    click.echo(
+        f"{statuses.count(DONE)} done, {statuses.count(FAILED)} failed, "
+        f"{statuses.count(NO_DATA)} without data. Directory: {output_dir}"
+    )
+    if report == REPORT_DEFERRED:
+        click.echo("PDF reports deferred, run `bt report` to render them")
+    if not completed:
+        click.echo("Interrupted, run the same command again to resume")
+        raise click.exceptions.Exit(130)
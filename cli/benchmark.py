@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from pathlib import Path
+
+import click
+
+from config import config
+from src.benchmark import (
+    DEFAULT_THRESHOLD,
+    SIZES,
+    find_regressions,
+    load_baseline,
+    run_benchmarks,
+)
+from src.utils import save_data
+
+
+@click.option(
+    "--size",
+    "sizes",
+    multiple=True,
+    default=["1d", "1m"],
+    type=click.Choice(list(SIZES)),
+    help="Size of the synthetic data, repeat the option for more sizes "
+    "(default: 1d and 1m)",
+)
+@click.option(
+    "-r",
+    "--repeat",
+    default=3,
+    type=click.IntRange(min=1),
+    help="Runs of each benchmark, the best time is kept (default: 3)",
+)
+@click.option(
+    "--threshold",
+    default=DEFAULT_THRESHOLD,
+    type=click.FloatRange(min=0),
+    help="Fail when a benchmark is slower than its baseline by more than this "
+    f"fraction (default: {DEFAULT_THRESHOLD})",
+)
+@click.option(
+    "--baseline",
+    default=None,
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Baseline file (default: results/<environment>/benchmarks/baseline.json)",
+)
+@click.option(
+    "--save_baseline",
+    is_flag=True,
+    help="Save this run as the baseline instead of comparing it with the baseline",
+)
+@click.command(
+    "benchmark",
+    help="Time the loader, the ma_cross/ema_cross pipelines, saving and PDF "
+    "rendering on synthetic ES bars generated offline, and compare the times with a "
+    "baseline",
+)
+def benchmark(
+    sizes: tuple[str, ...],
+    repeat: int,
+    threshold: float,
+    baseline: Path | None,
+    save_baseline: bool,  # noqa: FBT001
+) -> None:
+    benchmarks_dir = Path(config.results_path()) / "benchmarks"
+    benchmarks_dir.mkdir(parents=True, exist_ok=True)
+    baseline_path = baseline or benchmarks_dir / "baseline.json"
+
+    click.echo(f"Running benchmarks of sizes {', '.join(sizes)}, best of {repeat}")
+    run = run_benchmarks(list(sizes), repeat=repeat)
+    timestamp = datetime.now(UTC).strftime("%Y-%m-%d_%H:%M:%S")
+    run_path = benchmarks_dir / f"benchmark_{timestamp}.json"
+    save_data(data=run, file_path=run_path)
+
+    base = None if save_baseline else load_baseline(baseline_path)
+    for name, seconds in run["benchmarks"].items():
+        line = f"{name:<20}{seconds:>10.3f}s"
+        if base is not None and name in base["benchmarks"]:
+            line += f"  baseline {base['benchmarks'][name]:.3f}s"
+        click.echo(line)
+    click.echo(f"Saved benchmark results. File: {run_path}")
+
+    if save_baseline:
+        save_data(data=run, file_path=baseline_path)
+        click.echo(f"Saved baseline. File: {baseline_path}")
+        return
+    if base is None:
+        click.echo("No baseline to compare with, create one with --save_baseline")
+        return
+
+    regressions = find_regressions(run, base, threshold)
+    for regression in regressions:
+        click.echo(
+            f"Regression: {regression['name']} took {regression['seconds']:.3f}s, "
+            f"{regression['ratio']:.2f}x its baseline of {regression['baseline_s']:.3f}s"
+        )
+    if regressions:
+        raise click.exceptions.Exit(1)
+    click.echo(f"No benchmark regressed by more than {threshold:.0%}")
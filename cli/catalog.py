@@ -0,0 +1,48 @@
+from datetime import UTC, datetime
+from pathlib import Path
+
+import click
+
+from config import config
+from src.catalog import PriceDataCatalog
+from src.utils import date_to_ns
+
+
+@click.option(
+    "--start",
+    default=None,
+    type=str,
+    help="List files with data from this date (format: YYYY-MM-DD)",
+)
+@click.option(
+    "--end",
+    default=None,
+    type=str,
+    help="List files with data before this date (format: YYYY-MM-DD)",
+)
+@click.command("catalog", help="Index the saved price data and list the indexed files")
+def catalog(start: str, end: str) -> None:
+    price_data_catalog = PriceDataCatalog.load(Path(config.price_data_path()))
+    price_data_catalog.refresh()
+    entries = price_data_catalog.query(
+        start=date_to_ns(start) if start else None,
+        end=date_to_ns(end) if end else None,
+    )
+
+    click.echo(
+        click.style(
+            f"{'First':<17} {'Last':<17} {'Count':>9}  {'Symbol':<10} File",
+            bold=True,
+            underline=True,
+        )
+    )
+    for entry in entries:
+        first = datetime.fromtimestamp(entry.start / 1e9, UTC)
+        last = datetime.fromtimestamp(entry.end / 1e9, UTC)
+        click.echo(
+            f"{first:%Y-%m-%d %H:%M} {last:%Y-%m-%d %H:%M} {entry.count:>9}  "
+            + click.style(f"{entry.symbol:<10}", fg="green")
+            + f" {entry.path}"
+        )
+
+    click.echo(f"{len(entries)} files, {sum(e.count for e in entries)} data points")
@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import click
+from nautilus_trader.model import InstrumentId
+
+from config import config
+from src.bars import load_bars
+from src.catalog import PriceDataCatalog
+from src.parquet_store import ParquetBarStore
+from src.utils import date_to_ns
+
+
+@click.option(
+    "--start",
+    default=None,
+    type=str,
+    help="Convert files with data from this date (format: YYYY-MM-DD)",
+)
+@click.option(
+    "--end",
+    default=None,
+    type=str,
+    help="Convert files with data before this date (format: YYYY-MM-DD)",
+)
+@click.command(
+    "convert",
+    help="Decode the saved price data once into a Parquet catalog for backtests",
+)
+def convert(start: str, end: str) -> None:
+    catalog = PriceDataCatalog.load(Path(config.price_data_path()))
+    store = ParquetBarStore(Path(config.parquet_path()))
+
+    entries = catalog.query(
+        start=date_to_ns(start) if start else None,
+        end=date_to_ns(end) if end else None,
+    )
+    pending = store.pending(entries)
+    click.echo(f"Converting {len(pending)} files ({len(entries) - len(pending)} done)")
+
+    for entry in pending:
+        venue_str = entry.dataset.split(".")[0]
+        instrument_id = InstrumentId.from_str(f"{entry.symbol}.{venue_str}")
+        bars = load_bars(catalog, [entry], instrument_id)
+        # The bars of a file downloaded again replace those converted from it
+        written = store.write(bars, replace=store.is_changed(entry))
+        store.mark_converted(entry)
+        click.echo(f"Wrote {written} bars. File: {catalog.path(entry)}")
+
+    click.echo(f"Parquet catalog: {store.path}")
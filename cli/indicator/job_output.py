@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import click
+
+from src.profiling import profile_table
+from src.result_cache import REPORT_DEFERRED, REPORT_INLINE
+
+if TYPE_CHECKING:
+    from src.backtest import JobResult
+    from src.profiling import Profiler
+    from src.result_cache import ResultCache
+
+
+def echo_job_result(
+    job_result: JobResult,
+    cache: ResultCache,
+    report: str,
+    profiler: Profiler | None,
+) -> None:
+    """Print where the result, report, exported trades and profile of a job went."""
+    if job_result.cached:
+        click.echo("Same backtest found in the result cache, not run again")
+    click.echo(f"Saved result {job_result.key}. Database: {cache.db_path}")
+    if report == REPORT_INLINE:
+        click.echo(f"Generated pdf. File: {cache.pdf_path(job_result.key)}")
+    elif report == REPORT_DEFERRED:
+        click.echo("PDF report deferred, run `bt report` to render it")
+    if job_result.trades_dir is not None:
+        click.echo(
+            "Exported fills, positions and account balances. "
+            f"Directory: {job_result.trades_dir}"
+        )
+    if profiler is not None:
+        click.echo(profile_table(profiler.phases))
+        if profiler.cprofile_dir is not None:
+            click.echo(f"Saved cProfile dumps. Directory: {profiler.cprofile_dir}")
@@ -1,28 +1,16 @@
+from __future__ import annotations
+
 from datetime import UTC, datetime
-from decimal import Decimal
 from pathlib import Path
 
 import click
-from databento.common.dbnstore import DBNStore
-from nautilus_trader.adapters.databento import DatabentoDataLoader
-from nautilus_trader.backtest.engine import BacktestEngine
-from nautilus_trader.model import (
-    Currency,
-    InstrumentId,
-    Money,
-    Price,
-    Quantity,
-    Symbol,
-    Venue,
-)
-from nautilus_trader.model.currencies import USD
-from nautilus_trader.model.enums import AccountType, AssetClass, OmsType
-from nautilus_trader.model.instruments import FuturesContract
 
+from cli.indicator.job_output import echo_job_result
 from config import config
-from src.backtest_report_generator import BacktestReportGenerator
-from src.strategies.ma_cross import MACross, MACrossConfig
-from src.utils import replace_nan_to_none, save_data
+from src.backtest import THROUGHPUT_LOG_LEVEL, BacktestJob, run_job
+from src.profiling import Profiler
+from src.resample import TIMEFRAME_INTERVALS
+from src.result_cache import REPORT_INLINE, REPORT_MODES, ResultCache
 
 
 @click.option(
@@ -39,91 +27,118 @@ from src.utils import replace_nan_to_none, save_data
     type=int,
     help="Slow MA period (default: 50)",
 )
+@click.option(
+    "--start",
+    default=None,
+    type=str,
+    help="Backtest start (format: YYYY-MM-DD, default: first available data)",
+)
+@click.option(
+    "--end",
+    default=None,
+    type=str,
+    help="Backtest end, exclusive (format: YYYY-MM-DD, default: last available data)",
+)
+@click.option(
+    "--source",
+    default="dbn",
+    type=click.Choice(["dbn", "parquet"]),
+    help="Read bars from the .dbn files or from the converted Parquet catalog "
+    "(default: dbn)",
+)
+@click.option(
+    "--timeframe",
+    default=None,
+    type=click.Choice(list(TIMEFRAME_INTERVALS)),
+    help="Run on bars resampled from the 1-minute data, built once and stored "
+    "next to it (default: the 1-minute bars)",
+)
+@click.option(
+    "--chunk_size",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Stream the bars into the engine in chunks of this many bars, so memory "
+    "does not grow with the backtest length (default: load all bars at once)",
+)
+@click.option(
+    "--report",
+    default=REPORT_INLINE,
+    type=click.Choice(REPORT_MODES),
+    help="Render the PDF report now (inline), queue it for `bt report` (deferred) "
+    "or skip it (none) (default: inline)",
+)
+@click.option(
+    "--export_trades",
+    is_flag=True,
+    help="Export the fills, positions and account balances of the run to Parquet "
+    "files, running it again if it is in the result cache without them",
+)
+@click.option(
+    "--throughput",
+    is_flag=True,
+    help="Bypass the engine logging and skip the logs of every bar, for long "
+    "backtests where logging dominates the run time",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Run the backtest even if it is in the result cache, and add the wall time, "
+    "CPU time and peak RSS of each phase of the run to its cached result",
+)
+@click.option(
+    "--cprofile",
+    is_flag=True,
+    help="With --profile, also dump a cProfile of each phase to a "
+    "profile_<strategy>_<timestamp> folder of results",
+)
 @click.command("ma_cross", help="Backtest MA cross")
-def ma_cross(fast_period: int, slow_period: int) -> None:
-    file_path = sorted(Path(config.price_data_path()).glob("*.dbn"))[-1]
-    metadata = DBNStore.from_file(file_path).metadata
-
-    symbol_str = metadata.symbols[0]
-    symbol = Symbol(symbol_str)
-    venue_str = metadata.dataset.split(".")[0]
-    venue = Venue(venue_str)
-
-    instrument_id = InstrumentId.from_str(f"{symbol_str}.{venue_str}")
-    loader = DatabentoDataLoader()
-    data = loader.from_dbn_file(
-        path=file_path,
-        instrument_id=instrument_id,
-    )
-
-    engine = BacktestEngine()
-    engine.add_venue(
-        venue=venue,
-        oms_type=OmsType.NETTING,
-        account_type=AccountType.MARGIN,
-        starting_balances=[Money(10_000, Currency.from_str("USD"))],
-        base_currency=Currency.from_str("USD"),
-        default_leverage=Decimal(1),
-        bar_adaptive_high_low_ordering=True,
-    )
-
-    activation_ns = metadata.start
-    expiration_ns = metadata.end
-    ts_event_ns = int(datetime.now(tz=UTC).timestamp() * 1_000_000_000)
-    ts_init_ns = metadata.start
-
-    instrument = FuturesContract(
-        instrument_id=InstrumentId(symbol=symbol, venue=venue),
-        raw_symbol=symbol,
-        asset_class=AssetClass.INDEX,
-        exchange="XCME",
-        currency=USD,
-        price_precision=2,
-        price_increment=Price.from_str("0.01"),
-        multiplier=Quantity.from_int(1),
-        lot_size=Quantity.from_int(1),
-        underlying="ES",
-        activation_ns=activation_ns,
-        expiration_ns=expiration_ns,
-        ts_event=ts_event_ns,
-        ts_init=ts_init_ns,
-    )
-
-    engine.add_instrument(instrument)
-    engine.add_data(data)
-
-    strategy_config = MACrossConfig(
-        instrument_id=instrument_id,
-        bar_type=data[0].bar_type,
-        trade_size=Decimal(100),
-        fast_ma_period=fast_period,
-        slow_ma_period=slow_period,
+def ma_cross(  # noqa: PLR0913
+    fast_period: int,
+    slow_period: int,
+    start: str,
+    end: str,
+    source: str,
+    timeframe: str | None,
+    chunk_size: int | None,
+    report: str,
+    export_trades: bool,  # noqa: FBT001
+    throughput: bool,  # noqa: FBT001
+    profile: bool,  # noqa: FBT001
+    cprofile: bool,  # noqa: FBT001
+) -> None:
+    job = BacktestJob(
+        strategy="ma_cross",
+        fast_period=fast_period,
+        slow_period=slow_period,
+        start=start,
+        end=end,
+        source=source,
+        chunk_size=chunk_size,
+        timeframe=timeframe,
     )
-
-    strategy = MACross(config=strategy_config)
-    engine.add_strategy(strategy=strategy)
-
-    engine.run()
-
-    timestamp = datetime.now(UTC).strftime("%Y-%m-%d_%H:%M:%S")
-    file_path = (
-        Path(config.results_path())
-        / f"ma_cross_{fast_period}_{slow_period}_{timestamp}.json"
-    )
-    output_data = replace_nan_to_none(vars(engine.get_result()))
-
-    save_data(
-        data=output_data,
-        file_path=Path(file_path),
-    )
-    click.echo(f"Saved json data. File: {file_path}")
-
-    pdf_file_path = (
-        Path(config.results_path())
-        / f"ma_cross_{fast_period}_{slow_period}_{timestamp}.pdf"
-    )
-
-    generator = BacktestReportGenerator()
-    generator.generate(output_data, pdf_file_path)
-
-    click.echo(f"Generated pdf. File: {pdf_file_path}")
+    cache = ResultCache(Path(config.result_cache_path()))
+    log_level = THROUGHPUT_LOG_LEVEL if throughput else None
+    profiler = None
+    if profile:
+        cprofile_dir = None
+        if cprofile:
+            timestamp = datetime.now(UTC).strftime("%Y-%m-%d_%H:%M:%S")
+            cprofile_dir = Path(config.results_path()) / f"profile_ma_cross_{timestamp}"
+        profiler = Profiler(cprofile_dir)
+    try:
+        job_result = run_job(
+            job,
+            cache,
+            log_level=log_level,
+            profiler=profiler,
+            report=report,
+            export=export_trades,
+        )
+    except ValueError as e:
+        click.echo(str(e))
+        return
+    if job_result is None:
+        click.echo("No price data found for the requested range")
+        return
+
+    echo_job_result(job_result, cache, report, profiler)
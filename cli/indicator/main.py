@@ -1,13 +1,16 @@
 import click
 
-from .ema_cross import ema_cross
-from .ma_cross import ma_cross
+from cli.lazy_group import LazyGroup
 
 
-@click.group(name="indicator", help="Indicators")
+@click.group(
+    name="indicator",
+    help="Indicators",
+    cls=LazyGroup,
+    lazy_subcommands={
+        "ema_cross": ("cli.indicator.ema_cross:ema_cross", "Backtest EMA cross"),
+        "ma_cross": ("cli.indicator.ma_cross:ma_cross", "Backtest MA cross"),
+    },
+)
 def indicator_subcommands() -> None:
     pass
-
-
-indicator_subcommands.add_command(ema_cross)
-indicator_subcommands.add_command(ma_cross)
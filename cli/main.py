@@ -5,20 +5,59 @@ import click
 
 sys.path.append(Path(__file__).resolve().parent.parent.as_posix())
 
-from .indicator.main import indicator_subcommands
-from .save_data import save
-from .stats import stats
-
-
-@click.group(context_settings={"help_option_names": ["-h", "--help"]})
+from .lazy_group import LazyGroup
+
+# Imported when they run, `bt` is started many times a day and most commands do
+# not need the backtesting stack
+SUBCOMMANDS = {
+    "batch": ("cli.batch:batch", "Run the backtests of a JSON Lines file"),
+    "benchmark": (
+        "cli.benchmark:benchmark",
+        "Time the loader, the ma_cross/ema_cross pipelines",
+    ),
+    "catalog": (
+        "cli.catalog:catalog",
+        "Index the saved price data and list the indexed files",
+    ),
+    "convert": (
+        "cli.convert:convert",
+        "Decode the saved price data once into a Parquet catalog",
+    ),
+    "indicator": ("cli.indicator.main:indicator_subcommands", "Indicators"),
+    "report": (
+        "cli.report:report",
+        "Render the PDF reports deferred by --report deferred",
+    ),
+    "resample": (
+        "cli.resample:resample",
+        "Resample the saved 1-minute price data into 5m/15m/1h/1d bars",
+    ),
+    "results": (
+        "cli.results:results",
+        "Query the backtest results of the result cache",
+    ),
+    "save": ("cli.save_data:save", "Load Databento data and save it in json format"),
+    "stats": ("cli.stats:stats", "Show stats of the price data in a date range"),
+    "sweep": ("cli.sweep:sweep", "Backtest a grid of fast/slow periods of a strategy"),
+    "throughput": (
+        "cli.throughput:throughput",
+        "Measure the bars per second of a backtest",
+    ),
+    "walkforward": (
+        "cli.walkforward:walkforward",
+        "Optimise the fast/slow periods of a strategy",
+    ),
+}
+
+
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands=SUBCOMMANDS,
+    context_settings={"help_option_names": ["-h", "--help"]},
+)
 def main() -> None:
     pass
 
 
-main.add_command(indicator_subcommands)
-main.add_command(save)
-main.add_command(stats)
-
-
 if __name__ == "__main__":
     main()
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import click
+
+from config import config
+from src.result_cache import ResultCache, render_reports
+
+
+@click.option(
+    "--all",
+    "all_results",
+    is_flag=True,
+    help="Render every result of the cache without a PDF report, not only the "
+    "deferred ones",
+)
+@click.option(
+    "-w",
+    "--workers",
+    default=os.cpu_count(),
+    type=click.IntRange(min=1),
+    help="Reports rendered at the same time (default: number of cores)",
+)
+@click.command(
+    "report",
+    help="Render the PDF reports deferred by --report deferred on a process pool",
+)
+def report(all_results: bool, workers: int) -> None:  # noqa: FBT001
+    cache = ResultCache(Path(config.result_cache_path()))
+    keys = cache.deferred_reports()
+    if all_results:
+        keys = list(dict.fromkeys([*keys, *cache.missing_reports()]))
+    if not keys:
+        click.echo("No PDF reports to render")
+        return
+
+    click.echo(f"Rendering {len(keys)} PDF reports on {workers} processes")
+
+    def on_finish(key: str, path: Path | None, error: str | None) -> None:
+        if error is None:
+            click.echo(f"Generated pdf. File: {path}")
+        else:
+            click.echo(f"{key}: failed\n{error}")
+
+    # The reports not rendered stay deferred for the next run
+    failed = render_reports(cache, keys, max_workers=workers, on_finish=on_finish)
+    if failed:
+        click.echo(f"{len(failed)} reports failed")
+        raise click.exceptions.Exit(1)
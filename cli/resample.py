@@ -0,0 +1,55 @@
+from pathlib import Path
+
+import click
+from nautilus_trader.model import InstrumentId
+
+from config import config
+from src.catalog import CatalogEntry, PriceDataCatalog
+from src.resample import SOURCE_SCHEMA, TIMEFRAME_INTERVALS, ResampledBarStore
+
+
+@click.option(
+    "-t",
+    "--timeframe",
+    "timeframes",
+    multiple=True,
+    default=list(TIMEFRAME_INTERVALS),
+    type=click.Choice(list(TIMEFRAME_INTERVALS)),
+    help="Timeframe to build, repeatable (default: all of them)",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Resample again even if the stored bars are up to date",
+)
+@click.command(
+    "resample",
+    help="Resample the saved 1-minute price data into 5m/15m/1h/1d bars for backtests",
+)
+def resample(timeframes: tuple[str, ...], force: bool) -> None:  # noqa: FBT001
+    catalog = PriceDataCatalog.load(Path(config.price_data_path()))
+    store = ResampledBarStore(Path(config.resampled_path()))
+
+    symbols: dict[tuple[str, str], list[CatalogEntry]] = {}
+    for entry in catalog.entries:
+        if entry.schema == SOURCE_SCHEMA:
+            symbols.setdefault((entry.dataset, entry.symbol), []).append(entry)
+    if not symbols:
+        click.echo(f"No {SOURCE_SCHEMA} price data found")
+        return
+
+    for (dataset, symbol), entries in symbols.items():
+        instrument_id = InstrumentId.from_str(f"{symbol}.{dataset.split('.')[0]}")
+        pending = [
+            timeframe
+            for timeframe in timeframes
+            if force or not store.is_current(catalog, entries, instrument_id, timeframe)
+        ]
+        if not pending:
+            click.echo(f"{instrument_id}: up to date")
+            continue
+        counts = store.build(catalog, entries, instrument_id, pending)
+        for timeframe, count in counts.items():
+            click.echo(f"{instrument_id} {timeframe}: {count} bars")
+
+    click.echo(f"Resampled bars: {store.directory}")
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import click
+
+from config import config
+from src.result_cache import SORT_ALIASES, ResultCache
+from src.utils import replace_nan_to_none
+
+# Columns of `bt results query`, next to the sort column
+QUERY_COLUMNS = (
+    "key",
+    "strategy",
+    "fast_period",
+    "slow_period",
+    "bar_type",
+    "pnl",
+    "pnl_pct",
+    "win_rate",
+    "sharpe",
+    "sortino",
+    "profit_factor",
+    "total_positions",
+)
+# Characters of the key shown, enough to tell results apart and accepted by
+# `bt results show`
+KEY_LENGTH = 12
+# Left-aligned, the others are numbers
+TEXT_COLUMNS = ("key", "strategy", "bar_type")
+
+
+def _format(name: str, value: Any) -> str:  # noqa: ANN401
+    if value is None:
+        return ""
+    if name == "key":
+        return value[:KEY_LENGTH]
+    if isinstance(value, float):
+        return f"{value:.4f}"
+    return str(value)
+
+
+def _table(rows: list[dict[str, Any]], sort: str) -> str:
+    columns = [*QUERY_COLUMNS, *([sort] if sort not in QUERY_COLUMNS else [])]
+    cells = [[_format(name, row.get(name)) for name in columns] for row in rows]
+    widths = [
+        max(len(name), *(len(line[i]) for line in cells))
+        for i, name in enumerate(columns)
+    ]
+    lines = [columns, *cells]
+    return "\n".join(
+        "  ".join(
+            cell.ljust(width) if name in TEXT_COLUMNS else cell.rjust(width)
+            for name, cell, width in zip(columns, line, widths, strict=True)
+        ).rstrip()
+        for line in lines
+    )
+
+
+@click.group(
+    "results",
+    help="Query the backtest results of the result cache, one row per run",
+)
+def results() -> None:
+    pass
+
+
+@click.option(
+    "--sort",
+    default="sharpe",
+    type=str,
+    help=f"Statistic to sort by, one of {', '.join(SORT_ALIASES)} or the column of "
+    "any statistic of stats_pnls/stats_returns, such as pnls_usd_max_winner "
+    "(default: sharpe)",
+)
+@click.option(
+    "--top",
+    default=20,
+    type=click.IntRange(min=1),
+    help="Number of results shown (default: 20)",
+)
+@click.option(
+    "--strategy",
+    default=None,
+    type=str,
+    help="Only show the results of this strategy (default: all strategies)",
+)
+@click.option(
+    "--ascending",
+    is_flag=True,
+    help="Show the lowest values first instead of the highest",
+)
+@click.command(
+    "query",
+    help="Show the best results of the cache by a statistic, read from its indexes",
+)
+def query(sort: str, top: int, strategy: str | None, ascending: bool) -> None:  # noqa: FBT001
+    cache = ResultCache(Path(config.result_cache_path()))
+    try:
+        rows = cache.query(sort=sort, top=top, strategy=strategy, ascending=ascending)
+    except ValueError as e:
+        click.echo(str(e))
+        return
+    if not rows:
+        click.echo("No results found in the result cache")
+        return
+    click.echo(_table(rows, sort))
+
+
+@click.argument("key", type=str)
+@click.command(
+    "show",
+    help="Print a result of the cache as JSON, from its key or the start of it",
+)
+def show(key: str) -> None:
+    cache = ResultCache(Path(config.result_cache_path()))
+    keys = cache.keys(prefix=key)
+    if len(keys) != 1:
+        found = "No result" if not keys else f"{len(keys)} results"
+        click.echo(f"{found} with key {key} in the result cache")
+        return
+    data = cache.data(keys[0])
+    click.echo(json.dumps(replace_nan_to_none(data), indent=3, sort_keys=True))
+
+
+results.add_command(query)
+results.add_command(show)
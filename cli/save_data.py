@@ -4,7 +4,11 @@ from pathlib import Path
 import click
 
 from config import config
+from src.catalog import PriceDataCatalog
 from src.databento_client import DatabentoClient
+from src.download_cache import DownloadCache
+from src.downloader import PARTITION_FREQUENCIES, Partition, PartitionedDownloader
+from src.utils import date_to_ns
 
 
 @click.option(
@@ -26,25 +30,155 @@ from src.databento_client import DatabentoClient
     "--limit",
     default=1,
     type=int,
-    help="Limit (default: 1)",
+    help="Limit, per partition when partitioning (default: 1)",
+)
+@click.option(
+    "-p",
+    "--partition",
+    default="none",
+    type=click.Choice(["none", *PARTITION_FREQUENCIES]),
+    help="Split the range into partitions downloaded in parallel (default: none)",
+)
+@click.option(
+    "-w",
+    "--workers",
+    default=4,
+    type=int,
+    help="Parallel partition downloads (default: 4)",
+)
+@click.option(
+    "-r",
+    "--retries",
+    default=3,
+    type=int,
+    help="Retries per partition, with exponential backoff (default: 3)",
+)
+@click.option(
+    "--cache/--no-cache",
+    default=True,
+    help="Only download the parts of the range that are not saved yet (default: cache)",
 )
 @click.command("save", help="Load Databento data and save it in json format")
-def save(start_date: str, end_date: str, limit: int) -> None:
+def save(  # noqa: PLR0913
+    start_date: str,
+    end_date: str,
+    limit: int,
+    partition: str,
+    workers: int,
+    retries: int,
+    cache: bool,  # noqa: FBT001
+) -> None:
     click.echo("Loading data from Databento")
 
+    if partition != "none":
+        client = DatabentoClient(api_key=config.DATABENTO_API_KEY)
+        save_partitions(client, start_date, end_date, limit, partition, workers, retries)
+        return
+
+    if cache:
+        save_cached(start_date, end_date, limit)
+        return
+
     client = DatabentoClient(api_key=config.DATABENTO_API_KEY)
+    timestamp = datetime.datetime.now(datetime.UTC).strftime("%Y-%m-%d_%H:%M:%S")
+    filename = Path(config.price_data_path()) / f"{timestamp}.dbn"
     try:
-        data = client.get_range(
+        client.get_range(
             start_date=start_date,
             end_date=end_date,
             limit=limit,
+            path=filename,
         )
     except Exception as e:  # noqa: BLE001
+        filename.unlink(missing_ok=True)
         click.echo(f"Unable to retrieve data from Databento: {e}")
         return
 
-    timestamp = datetime.datetime.now(datetime.UTC).strftime("%Y-%m-%d_%H:%M:%S")
-    filename = Path(config.price_data_path()) / f"{timestamp}.dbn"
-    data.to_file(filename)
+    catalog = PriceDataCatalog.load(Path(config.price_data_path()))
+    entry = catalog.add(filename)
+    catalog.save()
+
+    count = entry.count if entry else 0
+    click.echo(f"Saved {count} data points from Databento. File: {filename}")
+
+
+def save_cached(start_date: str, end_date: str, limit: int) -> None:
+    catalog = PriceDataCatalog.load(Path(config.price_data_path()))
+    download_cache = DownloadCache(
+        directory=Path(config.price_data_path()) / "cache",
+        catalog=catalog,
+    )
+    client = DatabentoClient(api_key=config.DATABENTO_API_KEY, cache=download_cache)
+
+    missing = download_cache.missing(
+        dataset=client.DATASET,
+        schema=client.SCHEMA,
+        symbol=client.SYMBOL,
+        start=date_to_ns(start_date),
+        end=date_to_ns(end_date),
+    )
+    click.echo(f"Downloading {len(missing)} missing ranges")
+
+    try:
+        paths = client.download_missing(
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+        )
+    except Exception as e:  # noqa: BLE001
+        click.echo(f"Unable to retrieve data from Databento: {e}")
+        return
+
+    entries = [catalog.entry(path) for path in paths]
+    count = sum(entry.count for entry in entries if entry is not None)
+    click.echo(
+        f"Saved {count} new data points from Databento. "
+        f"Folder: {download_cache.directory}"
+    )
+
+
+def save_partitions(  # noqa: PLR0913
+    client: DatabentoClient,
+    start_date: str,
+    end_date: str,
+    limit: int,
+    frequency: str,
+    workers: int,
+    retries: int,
+) -> None:
+    directory = (
+        Path(config.price_data_path())
+        / "partitions"
+        / client.DATASET
+        / client.SCHEMA
+        / client.SYMBOL
+    )
+    catalog = PriceDataCatalog.load(Path(config.price_data_path()))
+    downloader = PartitionedDownloader(
+        client=client,
+        directory=directory,
+        max_workers=workers,
+        retries=retries,
+    )
+
+    def on_partition(partition: Partition, path: Path) -> None:
+        entry = catalog.add(path)
+        count = entry.count if entry else 0
+        click.echo(f"Saved {count} data points for {partition.key}. File: {path}")
+
+    try:
+        written = downloader.download(
+            start_date=start_date,
+            end_date=end_date,
+            frequency=frequency,
+            limit=limit,
+            on_partition=on_partition,
+        )
+    except Exception as e:  # noqa: BLE001
+        click.echo(f"Unable to retrieve data from Databento: {e}")
+        click.echo("Finished partitions are recorded, re-run the command to resume")
+        return
+    finally:
+        catalog.save()
 
-    click.echo(f"Saved {len(list(data))} data points from Databento. File: {filename}")
+    click.echo(f"Saved {len(written)} partitions from Databento. Folder: {directory}")
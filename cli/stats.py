@@ -1,43 +1,137 @@
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime
 from pathlib import Path
 
 import click
-from databento.common.dbnstore import DBNStore
 
 from config import config
+from src.catalog import CatalogEntry, PriceDataCatalog
+from src.quality import scan_files
+from src.summary import load_summary
+from src.utils import date_to_ns
 
 
-@click.command("stats", help="Show stats of the latest saved price data")
-def stats() -> None:
-    file_path = sorted(Path(config.price_data_path()).glob("*.dbn"))[-1]
+@click.option(
+    "--start",
+    default=None,
+    type=str,
+    help="Show every file with data from this date (format: YYYY-MM-DD)",
+)
+@click.option(
+    "--end",
+    default=None,
+    type=str,
+    help="Show every file with data before this date (format: YYYY-MM-DD)",
+)
+@click.option(
+    "--recount",
+    is_flag=True,
+    default=False,
+    help="Decode the files again instead of reading their cached summary",
+)
+@click.option(
+    "--deep",
+    is_flag=True,
+    default=False,
+    help="Scan the records of every file in the range (default: all) for data issues",
+)
+@click.option(
+    "-w",
+    "--workers",
+    default=4,
+    type=int,
+    help="Processes scanning files in parallel with --deep",
+)
+@click.command(
+    "stats",
+    help="Show stats of the price data in a date range (default: latest saved file)",
+)
+def stats(start: str, end: str, recount: bool, deep: bool, workers: int) -> None:  # noqa: FBT001
+    catalog = PriceDataCatalog.load(Path(config.price_data_path()))
+    if start or end or deep:
+        entries = catalog.query(
+            start=date_to_ns(start) if start else None,
+            end=date_to_ns(end) if end else None,
+        )
+    else:
+        entries = [entry for entry in [catalog.latest()] if entry is not None]
+
+    if not entries:
+        click.echo("No price data found")
+        return
+
+    if deep:
+        show_quality(catalog, entries, workers)
+        return
+
+    for entry in entries:
+        show_file_stats(catalog.path(entry), recount=recount)
+
 
-    data = DBNStore.from_file(file_path)
-    metadata = data.metadata
+def show_quality(
+    catalog: PriceDataCatalog,
+    entries: list[CatalogEntry],
+    workers: int,
+) -> None:
+    reports = scan_files([catalog.path(entry) for entry in entries], workers)
+
+    columns = (
+        "Count",
+        "Missing",
+        "Breaks",
+        "Duplicates",
+        "Unordered",
+        "Single",
+        "Spikes",
+    )
+    click.echo(
+        click.style(
+            " ".join(f"{column:>10}" for column in columns) + "  File",
+            bold=True,
+            underline=True,
+        )
+    )
+    for entry, report in zip(entries, reports, strict=True):
+        values = (
+            report.count,
+            report.missing,
+            report.session_breaks,
+            report.duplicates,
+            report.out_of_order,
+            report.single_price,
+            report.spikes,
+        )
+        click.echo(" ".join(f"{value:>10}" for value in values) + f"  {entry.path}")
+
+
+def show_file_stats(file_path: Path, recount: bool = False) -> None:  # noqa: FBT001, FBT002
+    summary = load_summary(file_path, recount=recount)
+    metadata = summary["metadata"]
 
     click.echo(click.style("File:", bold=True, fg="blue") + f" {file_path}")
     click.echo(click.style("Metadata", bold=True, fg="cyan"))
-    click.echo(f"  Version: {metadata.version}")
-    click.echo(f"  Dataset: {metadata.dataset}")
-    click.echo(f"  Schema: {metadata.schema}")
+    click.echo(f"  Version: {metadata['version']}")
+    click.echo(f"  Dataset: {metadata['dataset']}")
+    click.echo(f"  Schema: {metadata['schema']}")
     click.echo(
-        f"  Start: {metadata.start} "
-        f"({datetime.fromtimestamp(metadata.start / 1e9, UTC):%Y-%m-%d})"
+        f"  Start: {metadata['start']} "
+        f"({datetime.fromtimestamp(metadata['start'] / 1e9, UTC):%Y-%m-%d})"
     )
     click.echo(
-        f"  End: {metadata.end} "
-        f"({datetime.fromtimestamp(metadata.end / 1e9, UTC):%Y-%m-%d})"
-        if metadata.end
+        f"  End: {metadata['end']} "
+        f"({datetime.fromtimestamp(metadata['end'] / 1e9, UTC):%Y-%m-%d})"
+        if metadata["end"]
         else "  End: None"
     )
-    click.echo(f"  Count: {len(list(data))}")
-    click.echo(f"  Limit: {metadata.limit}")
-    click.echo(f"  stype_in: {metadata.stype_in}")
-    click.echo(f"  stype_out: {metadata.stype_out}")
-    click.echo(f"  Symbols: {', '.join(metadata.symbols) if metadata.symbols else '[]'}")
+    click.echo(f"  Count: {summary['count']}")
+    click.echo(f"  Limit: {metadata['limit']}")
+    click.echo(f"  stype_in: {metadata['stype_in']}")
+    click.echo(f"  stype_out: {metadata['stype_out']}")
+    symbols = metadata["symbols"]
+    click.echo(f"  Symbols: {', '.join(symbols) if symbols else '[]'}")
     click.echo("")
     click.echo(click.style("Symbol Mappings", bold=True, fg="yellow"))
 
-    for raw_symbol, intervals in metadata.mappings.items():
+    for raw_symbol, intervals in metadata["mappings"].items():
         click.echo(click.style(f"  Raw Symbol: {raw_symbol}", bold=True))
         click.echo(
             "    "
@@ -48,20 +142,9 @@ def stats() -> None:
             )
         )
         for interval in intervals:
-            start = (
-                interval.start_date
-                if hasattr(interval, "start_date")
-                else interval["start_date"]
-            )
-            end = (
-                interval.end_date
-                if hasattr(interval, "end_date")
-                else interval["end_date"]
-            )
-            symbol = (
-                interval.symbol if hasattr(interval, "symbol") else interval["symbol"]
-            )
-
+            symbol = interval["symbol"]
+            start = date.fromisoformat(interval["start_date"])
+            end = date.fromisoformat(interval["end_date"])
             click.echo(
                 "    "
                 + click.style(f"{symbol:<10}", fg="green")
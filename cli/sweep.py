@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import os
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+import click
+import pandas as pd
+
+from config import config
+from src.backtest import STRATEGIES, THROUGHPUT_LOG_LEVEL, load_backtest_data
+from src.indicators import IndicatorCache
+from src.prescreen import prescreen_bars, top_combinations
+from src.result_cache import REPORT_DEFERRED, REPORT_MODES, REPORT_NONE, ResultCache
+from src.sweep import SWEEP_LOG_LEVEL, parameter_grid, parse_range, run_sweep
+from src.utils import date_to_ns
+
+
+def range_option(_ctx: click.Context, _param: click.Parameter, value: str) -> list[int]:
+    try:
+        return parse_range(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+
+
+@click.argument("strategy", type=click.Choice(sorted(STRATEGIES)))
+@click.option(
+    "-f",
+    "--fast",
+    default="5:50:5",
+    callback=range_option,
+    help="Fast periods, start:stop:step with stop included (default: 5:50:5)",
+)
+@click.option(
+    "-s",
+    "--slow",
+    default="20:200:10",
+    callback=range_option,
+    help="Slow periods, start:stop:step with stop included (default: 20:200:10)",
+)
+@click.option(
+    "--start",
+    default=None,
+    type=str,
+    help="Backtest start (format: YYYY-MM-DD, default: first available data)",
+)
+@click.option(
+    "--end",
+    default=None,
+    type=str,
+    help="Backtest end, exclusive (format: YYYY-MM-DD, default: last available data)",
+)
+@click.option(
+    "--source",
+    default="dbn",
+    type=click.Choice(["dbn", "parquet"]),
+    help="Read bars from the .dbn files or from the converted Parquet catalog "
+    "(default: dbn)",
+)
+@click.option(
+    "-w",
+    "--workers",
+    default=os.cpu_count(),
+    type=int,
+    help="Backtests running in parallel (default: number of cores)",
+)
+@click.option(
+    "-k",
+    "--top",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Pre-screen the grid with vectorised approximate backtests and only run "
+    "the top K combinations by approximate PnL on the engine",
+)
+@click.option(
+    "--report",
+    default=REPORT_NONE,
+    type=click.Choice(REPORT_MODES),
+    help="Render the PDF report of each combination run (inline), queue them for "
+    "`bt report` (deferred) or skip them (none) (default: none)",
+)
+@click.option(
+    "--throughput",
+    is_flag=True,
+    help="Bypass the engine logging of the combinations, errors included, for long "
+    "backtests where logging dominates the run time",
+)
+@click.command("sweep", help="Backtest a grid of fast/slow periods of a strategy")
+def sweep(  # noqa: PLR0913
+    strategy: str,
+    fast: list[int],
+    slow: list[int],
+    start: str,
+    end: str,
+    source: str,
+    workers: int,
+    top: int | None,
+    report: str,
+    throughput: bool,  # noqa: FBT001
+) -> None:
+    grid = parameter_grid(fast, slow)
+    if not grid:
+        click.echo("No combinations with a fast period below the slow period")
+        return
+
+    data = load_backtest_data(
+        start_ns=date_to_ns(start) if start else None,
+        end_ns=date_to_ns(end) if end else None,
+        source=source,
+    )
+    if data is None:
+        click.echo("No price data found for the requested range")
+        return
+
+    timestamp = datetime.now(UTC).strftime("%Y-%m-%d_%H:%M:%S")
+    screen = None
+    if top is not None:
+        screen_start = time.perf_counter()
+        screen = pd.DataFrame(prescreen_bars(strategy, data.bars, grid, workers))
+        screen_path = (
+            Path(config.results_path()) / f"prescreen_{strategy}_{timestamp}.csv"
+        )
+        screen.to_csv(screen_path, index=False)
+        click.echo(
+            f"Pre-screened {len(grid)} combinations in "
+            f"{time.perf_counter() - screen_start:.2f}s. File: {screen_path}"
+        )
+        grid = top_combinations(screen.to_dict("records"), top)
+
+    click.echo(f"Running {len(grid)} combinations on {workers} processes")
+    cache = ResultCache(Path(config.result_cache_path()))
+    indicators = IndicatorCache(
+        Path(config.indicator_cache_path()), config.INDICATOR_CACHE_MAX_BYTES
+    )
+    results = pd.DataFrame(
+        run_sweep(
+            data,
+            strategy,
+            grid,
+            max_workers=workers,
+            cache=cache,
+            indicators=indicators,
+            report=report,
+            log_level=THROUGHPUT_LOG_LEVEL if throughput else SWEEP_LOG_LEVEL,
+        )
+    )
+    if screen is not None:
+        # The engine results next to the approximations they are cross-checked with
+        results = results.merge(screen, on=["fast_period", "slow_period"])
+
+    file_path = Path(config.results_path()) / f"sweep_{strategy}_{timestamp}.csv"
+    results.to_csv(file_path, index=False)
+    click.echo(f"Saved sweep results. File: {file_path}")
+    if cached := int(results["cached"].sum()):
+        click.echo(f"{cached} combinations found in the result cache, not run again")
+    run = results[~results["cached"]]
+    if not run.empty:
+        click.echo(
+            f"Per run: {run['overhead_s'].mean():.3f}s engine overhead "
+            f"(setup on the first run of each process, reset afterwards), "
+            f"{run['run_s'].mean():.3f}s backtest"
+        )
+
+    if report == REPORT_DEFERRED:
+        click.echo("PDF reports deferred, run `bt report` to render them")
+
+    best = results.drop(columns=["overhead_s", "run_s", "cached"])
+    best = best.sort_values("pnl", ascending=False).head(10)
+    click.echo(best.to_string(index=False))
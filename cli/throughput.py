@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import click
+
+from src.backtest import STRATEGIES, load_backtest_data
+from src.throughput import LOGGING_OFF, LOGGING_ON, measure_throughput
+from src.utils import date_to_ns
+
+
+@click.argument("strategy", type=click.Choice(sorted(STRATEGIES)))
+@click.option(
+    "-f",
+    "--fast_period",
+    default=20,
+    type=int,
+    help="Fast period (default: 20)",
+)
+@click.option(
+    "-s",
+    "--slow_period",
+    default=50,
+    type=int,
+    help="Slow period (default: 50)",
+)
+@click.option(
+    "--start",
+    default=None,
+    type=str,
+    help="Backtest start (format: YYYY-MM-DD, default: first available data)",
+)
+@click.option(
+    "--end",
+    default=None,
+    type=str,
+    help="Backtest end, exclusive (format: YYYY-MM-DD, default: last available data)",
+)
+@click.option(
+    "--source",
+    default="dbn",
+    type=click.Choice(["dbn", "parquet"]),
+    help="Read bars from the .dbn files or from the converted Parquet catalog "
+    "(default: dbn)",
+)
+@click.command(
+    "throughput",
+    help="Measure the bars per second of a backtest with logging on and in the "
+    "throughput mode, where logging is off",
+)
+def throughput(  # noqa: PLR0913
+    strategy: str,
+    fast_period: int,
+    slow_period: int,
+    start: str,
+    end: str,
+    source: str,
+) -> None:
+    data = load_backtest_data(
+        start_ns=date_to_ns(start) if start else None,
+        end_ns=date_to_ns(end) if end else None,
+        source=source,
+    )
+    if data is None:
+        click.echo("No price data found for the requested range")
+        return
+
+    bars_per_second = measure_throughput(data, strategy, fast_period, slow_period)
+    on, off = bars_per_second[LOGGING_ON], bars_per_second[LOGGING_OFF]
+    click.echo(f"{len(data.bars)} bars")
+    click.echo(f"Logging on ({LOGGING_ON}): {on:,.0f} bars/s")
+    click.echo(f"Logging off (throughput mode): {off:,.0f} bars/s, {off / on:.2f}x")
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import os
+from datetime import UTC, datetime
+from pathlib import Path
+
+import click
+import pandas as pd
+
+from cli.sweep import range_option
+from config import config
+from src.backtest import STRATEGIES, THROUGHPUT_LOG_LEVEL, load_backtest_data
+from src.sweep import parameter_grid
+from src.utils import date_to_ns, save_data
+from src.walkforward import (
+    WALKFORWARD_LOG_LEVEL,
+    run_walkforward,
+    split_folds,
+    stitch_out_of_sample,
+)
+
+
+def duration_option(_ctx: click.Context, _param: click.Parameter, value: str) -> int:
+    try:
+        duration = pd.Timedelta(value).value
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+    if duration <= 0:
+        err = "must be a positive duration"
+        raise click.BadParameter(err)
+    return duration
+
+
+@click.argument("strategy", type=click.Choice(sorted(STRATEGIES)))
+@click.option(
+    "-f",
+    "--fast",
+    default="5:50:5",
+    callback=range_option,
+    help="Fast periods, start:stop:step with stop included (default: 5:50:5)",
+)
+@click.option(
+    "-s",
+    "--slow",
+    default="20:200:10",
+    callback=range_option,
+    help="Slow periods, start:stop:step with stop included (default: 20:200:10)",
+)
+@click.option(
+    "--in_sample",
+    default="30D",
+    callback=duration_option,
+    help="Length of the in-sample range the periods are optimised on (default: 30D)",
+)
+@click.option(
+    "--out_of_sample",
+    default="7D",
+    callback=duration_option,
+    help="Length of the out-of-sample range the best periods are evaluated on, and "
+    "step between folds (default: 7D)",
+)
+@click.option(
+    "--start",
+    default=None,
+    type=str,
+    help="Walk-forward start (format: YYYY-MM-DD, default: first available data)",
+)
+@click.option(
+    "--end",
+    default=None,
+    type=str,
+    help="Walk-forward end, exclusive (format: YYYY-MM-DD, default: last available data)",
+)
+@click.option(
+    "--source",
+    default="dbn",
+    type=click.Choice(["dbn", "parquet"]),
+    help="Read bars from the .dbn files or from the converted Parquet catalog "
+    "(default: dbn)",
+)
+@click.option(
+    "-w",
+    "--workers",
+    default=os.cpu_count(),
+    type=int,
+    help="Folds running in parallel (default: number of cores)",
+)
+@click.option(
+    "--throughput",
+    is_flag=True,
+    help="Bypass the engine logging of the folds, errors included, for long "
+    "backtests where logging dominates the run time",
+)
+@click.command(
+    "walkforward",
+    help="Optimise the fast/slow periods of a strategy on rolling in-sample ranges "
+    "and evaluate them on the following out-of-sample ranges",
+)
+def walkforward(  # noqa: PLR0913
+    strategy: str,
+    fast: list[int],
+    slow: list[int],
+    in_sample: int,
+    out_of_sample: int,
+    start: str,
+    end: str,
+    source: str,
+    workers: int,
+    throughput: bool,  # noqa: FBT001
+) -> None:
+    grid = parameter_grid(fast, slow)
+    if not grid:
+        click.echo("No combinations with a fast period below the slow period")
+        return
+
+    data = load_backtest_data(
+        start_ns=date_to_ns(start) if start else None,
+        end_ns=date_to_ns(end) if end else None,
+        source=source,
+    )
+    if data is None:
+        click.echo("No price data found for the requested range")
+        return
+
+    # Bars are stamped at their close, the range starts with the first bar opening
+    first_bar = data.bars[0]
+    interval = first_bar.bar_type.spec.timedelta.value
+    range_start = first_bar.ts_event - interval
+    try:
+        folds = split_folds(range_start, data.bars[-1].ts_event, in_sample, out_of_sample)
+    except ValueError as e:
+        click.echo(str(e))
+        return
+
+    click.echo(
+        f"Running {len(folds)} folds of {len(grid)} combinations on {workers} processes"
+    )
+    fold_results = run_walkforward(
+        data,
+        strategy,
+        grid,
+        folds,
+        max_workers=workers,
+        log_level=THROUGHPUT_LOG_LEVEL if throughput else WALKFORWARD_LOG_LEVEL,
+    )
+
+    timestamp = datetime.now(UTC).strftime("%Y-%m-%d_%H:%M:%S")
+    directory = Path(config.results_path()) / f"walkforward_{strategy}_{timestamp}"
+    directory.mkdir(parents=True)
+    for fold_result in fold_results:
+        save_data(
+            data=fold_result,
+            file_path=directory / f"fold_{fold_result['index']:02d}.json",
+        )
+
+    summary = stitch_out_of_sample(fold_results)
+    save_data(data=summary, file_path=directory / "summary.json")
+    # reportlab is slow to import and only needed here
+    from src.backtest_report_generator import (  # noqa: PLC0415
+        BacktestReportGenerator,
+    )
+
+    BacktestReportGenerator().generate(summary, directory / "summary.pdf")
+    click.echo(f"Saved walk-forward results. Directory: {directory}")
+
+    click.echo(pd.DataFrame(summary["folds"]).to_string(index=False))
+    click.echo(
+        f"Out-of-sample PnL: {summary['stats_pnls']['USD']['PnL (total)']:.2f} USD"
+    )
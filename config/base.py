@@ -6,6 +6,10 @@ import os
 class BaseConfig:
     ENVIRONMENT: str | None = None
     DATABENTO_API_KEY: str = os.getenv("DATABENTO_API_KEY", "")
+    BAR_CACHE_MAX_BYTES: int = int(os.getenv("BAR_CACHE_MAX_BYTES", str(2 * 1024**3)))
+    INDICATOR_CACHE_MAX_BYTES: int = int(
+        os.getenv("INDICATOR_CACHE_MAX_BYTES", str(1024**3))
+    )
 
     def is_production(self) -> bool:
         return self.ENVIRONMENT == "production"
@@ -19,8 +23,26 @@ class BaseConfig:
     def price_data_path(self) -> str:
         return f"price_data/{self.ENVIRONMENT}"
 
+    def parquet_path(self) -> str:
+        return f"price_data/{self.ENVIRONMENT}/parquet"
+
+    def bar_cache_path(self) -> str:
+        return f"price_data/{self.ENVIRONMENT}/bar_cache"
+
+    def resampled_path(self) -> str:
+        return f"price_data/{self.ENVIRONMENT}/resampled"
+
+    def indicator_cache_path(self) -> str:
+        return f"price_data/{self.ENVIRONMENT}/indicator_cache"
+
     def results_path(self) -> str:
         return f"results/{self.ENVIRONMENT}"
 
+    def result_cache_path(self) -> str:
+        return f"results/{self.ENVIRONMENT}/cache"
+
+    def trades_path(self) -> str:
+        return f"results/{self.ENVIRONMENT}/trades"
+
     def __repr__(self) -> str:
         return self.__class__.__name__
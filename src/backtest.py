@@ -0,0 +1,884 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from decimal import Decimal
+from functools import partial
+from itertools import chain
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Self
+
+import nautilus_trader
+import numpy as np
+import pandas as pd
+from nautilus_trader.backtest.engine import BacktestEngine, BacktestEngineConfig
+from nautilus_trader.config import LoggingConfig
+from nautilus_trader.model import (
+    InstrumentId,
+    Money,
+    Price,
+    Quantity,
+    Symbol,
+    Venue,
+)
+from nautilus_trader.model.currencies import USD
+from nautilus_trader.model.enums import AccountType, AssetClass, OmsType
+from nautilus_trader.model.instruments import FuturesContract
+
+from config import config
+from src.bar_cache import BarCache
+from src.bars import STREAM_CHUNK_SIZE, bar_type_for, load_bars, stream_bars
+from src.catalog import PriceDataCatalog
+from src.databento_client import DatabentoClient
+from src.indicators import bar_closes, closes_hash
+from src.parquet_store import ParquetBarStore
+from src.profiling import phase
+from src.quality import SCHEMA_INTERVALS
+from src.resample import TIMEFRAME_INTERVALS, ResampledBarStore, timeframe_bar_type
+from src.result_cache import REPORT_INLINE
+from src.strategies.ema_cross import EMACross, EMACrossConfig
+from src.strategies.ma_cross import MACross, MACrossConfig
+from src.summary import load_summary
+from src.trade_export import export_trades, has_trades
+from src.utils import date_to_ns
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from types import TracebackType
+
+    from nautilus_trader.backtest.results import BacktestResult
+    from nautilus_trader.config import StrategyConfig
+    from nautilus_trader.model import Bar, BarType
+    from nautilus_trader.trading import Strategy
+
+    from src.catalog import CatalogEntry
+    from src.indicators import IndicatorCache
+    from src.profiling import Profiler
+    from src.result_cache import ResultCache
+
+
+# USD balance of the account every backtest starts with
+STARTING_BALANCE = 10_000
+
+# Contracts bought or sold on every crossover
+DEFAULT_TRADE_SIZE = 100
+
+# Settings of the venue every backtest trades on
+VENUE_SETTINGS = {
+    "oms_type": OmsType.NETTING,
+    "account_type": AccountType.MARGIN,
+    "starting_balances": [Money(STARTING_BALANCE, USD)],
+    "base_currency": USD,
+    "default_leverage": Decimal(1),
+    "bar_adaptive_high_low_ordering": True,
+}
+
+# Log level of the throughput mode: engine logging is bypassed and the strategies
+# skip their logs of every bar, instead of formatting messages that are dropped
+THROUGHPUT_LOG_LEVEL = "OFF"
+
+# Log levels that show the info logs of the strategies on every bar
+_BAR_LOG_LEVELS = ("TRACE", "DEBUG", "INFO")
+
+# Part of the result cache keys, bump it when a change to this code changes results
+RESULT_CACHE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class StrategySpec:
+    """
+    A crossover strategy, the names of its fast/slow period settings and the kind of
+    its moving averages in an `IndicatorCache`.
+    """
+
+    name: str
+    strategy_class: type[Strategy]
+    config_class: type[StrategyConfig]
+    fast_field: str
+    slow_field: str
+    average_kind: str
+
+    def config(  # noqa: PLR0913
+        self,
+        instrument_id: InstrumentId,
+        bar_type: BarType,
+        fast_period: int,
+        slow_period: int,
+        trade_size: int = DEFAULT_TRADE_SIZE,
+        *,
+        log_bars: bool = True,
+        indicator_cache: str | None = None,
+        indicator_data: str | None = None,
+    ) -> StrategyConfig:
+        return self.config_class(
+            instrument_id=instrument_id,
+            bar_type=bar_type,
+            trade_size=Decimal(trade_size),
+            log_bars=log_bars,
+            indicator_cache=indicator_cache,
+            indicator_data=indicator_data,
+            **{self.fast_field: fast_period, self.slow_field: slow_period},
+        )
+
+    def create(  # noqa: PLR0913
+        self,
+        instrument_id: InstrumentId,
+        bar_type: BarType,
+        fast_period: int,
+        slow_period: int,
+        trade_size: int = DEFAULT_TRADE_SIZE,
+        *,
+        log_bars: bool = True,
+        indicator_cache: str | None = None,
+        indicator_data: str | None = None,
+    ) -> Strategy:
+        return self.strategy_class(
+            config=self.config(
+                instrument_id,
+                bar_type,
+                fast_period,
+                slow_period,
+                trade_size,
+                log_bars=log_bars,
+                indicator_cache=indicator_cache,
+                indicator_data=indicator_data,
+            )
+        )
+
+
+STRATEGIES = {
+    "ma_cross": StrategySpec(
+        name="ma_cross",
+        strategy_class=MACross,
+        config_class=MACrossConfig,
+        fast_field="fast_ma_period",
+        slow_field="slow_ma_period",
+        average_kind="sma",
+    ),
+    "ema_cross": StrategySpec(
+        name="ema_cross",
+        strategy_class=EMACross,
+        config_class=EMACrossConfig,
+        fast_field="fast_ema_period",
+        slow_field="slow_ema_period",
+        average_kind="ema",
+    ),
+}
+
+
+@dataclass
+class BacktestData:
+    """Bars of a backtest and the instrument they are traded on."""
+
+    bars: list[Bar]
+    instrument: FuturesContract
+    # Identifies the bars for the result cache, see `DataSelection.fingerprint`
+    fingerprint: str | None = None
+
+    @property
+    def venue(self) -> Venue:
+        return self.instrument.id.venue
+
+
+@dataclass
+class BacktestStream:
+    """
+    Bars of a backtest read in time-ordered chunks, and the instrument they are
+    traded on. Every call of `chunks` reads the bars again from the start.
+    """
+
+    bar_type: BarType
+    instrument: FuturesContract
+    chunks: Callable[[], Iterator[list[Bar]]]
+    fingerprint: str | None = None
+
+    @property
+    def venue(self) -> Venue:
+        return self.instrument.id.venue
+
+
+def create_instrument(
+    symbol_str: str,
+    venue_str: str,
+    activation_ns: int,
+    expiration_ns: int,
+) -> FuturesContract:
+    symbol = Symbol(symbol_str)
+    venue = Venue(venue_str)
+    return FuturesContract(
+        instrument_id=InstrumentId(symbol=symbol, venue=venue),
+        raw_symbol=symbol,
+        asset_class=AssetClass.INDEX,
+        exchange="XCME",
+        currency=USD,
+        price_precision=2,
+        price_increment=Price.from_str("0.01"),
+        multiplier=Quantity.from_int(1),
+        lot_size=Quantity.from_int(1),
+        underlying="ES",
+        activation_ns=activation_ns,
+        expiration_ns=expiration_ns,
+        ts_event=int(datetime.now(tz=UTC).timestamp() * 1_000_000_000),
+        ts_init=activation_ns,
+    )
+
+
+@dataclass(frozen=True)
+class DataSelection:
+    """
+    Catalog files of a backtest range, which identify its bars without decoding
+    them. Bars open in [start_ns, end_ns) and are read from the `.dbn` files, or
+    from the Parquet store when `source` is "parquet". With a `timeframe`, they are
+    read from the `ResampledBarStore` built from the `.dbn` files instead.
+    """
+
+    catalog: PriceDataCatalog
+    entries: list[CatalogEntry]
+    start_ns: int | None
+    end_ns: int | None
+    source: str
+    timeframe: str | None = None
+
+    @property
+    def symbol_str(self) -> str:
+        return self.entries[0].symbol
+
+    @property
+    def venue_str(self) -> str:
+        return self.entries[0].dataset.split(".")[0]
+
+    @property
+    def instrument_id(self) -> InstrumentId:
+        return InstrumentId.from_str(f"{self.symbol_str}.{self.venue_str}")
+
+    @property
+    def bar_type(self) -> BarType:
+        if self.timeframe is not None:
+            return timeframe_bar_type(self.instrument_id, self.timeframe)
+        return bar_type_for(self.instrument_id, self.entries[0].schema)
+
+    def _source_entries(self) -> list[CatalogEntry]:
+        """Entries the timeframes are resampled from: every file of the symbol."""
+        first = self.entries[0]
+        return [
+            entry
+            for entry in self.catalog.entries
+            if (entry.dataset, entry.schema, entry.symbol)
+            == (first.dataset, first.schema, first.symbol)
+        ]
+
+    def _parquet_store(self) -> ParquetBarStore:
+        """Parquet store of the bars, checked to hold every selected file."""
+        store = ParquetBarStore(Path(config.parquet_path()))
+        if pending := store.pending(self.entries):
+            err = (
+                f"{len(pending)} of the {len(self.entries)} files of the range are not "
+                "converted to Parquet or changed since, run bt convert first"
+            )
+            raise ValueError(err)
+        return store
+
+    def _parquet_intervals(self, store: ParquetBarStore) -> list[tuple[int, int]]:
+        """Return the stored intervals of the bar type with bars opening in the range."""
+        # Bars are timestamped on close, so a bar opening in [start, end) closes in
+        # (start, end]
+        return [
+            (first, last)
+            for first, last in store.intervals(self.bar_type)
+            if (self.start_ns is None or last > self.start_ns)
+            and (self.end_ns is None or first <= self.end_ns)
+        ]
+
+    def fingerprint(self) -> str:
+        """
+        Hash of the content of the files and of the range of the bars, and of the
+        intervals of the Parquet store the bars are read from.
+        """
+        files = sorted(
+            load_summary(self.catalog.path(entry))["sha256"] for entry in self.entries
+        )
+        selection = {
+            "files": files,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "source": self.source,
+        }
+        if self.timeframe is not None:
+            selection["timeframe"] = self.timeframe
+        elif self.source == "parquet":
+            intervals = self._parquet_intervals(self._parquet_store())
+            selection["parquet_intervals"] = [list(interval) for interval in intervals]
+        return hashlib.sha256(json.dumps(selection).encode()).hexdigest()
+
+    def _instrument(self, last_ts: int | None) -> FuturesContract:
+        return create_instrument(
+            symbol_str=self.symbol_str,
+            venue_str=self.venue_str,
+            activation_ns=self.start_ns or self.entries[0].start,
+            expiration_ns=self.end_ns or last_ts,
+        )
+
+    def load(self) -> BacktestData | None:
+        """Decode the bars, None when there are none in the range."""
+        if self.timeframe is not None:
+            bars = ResampledBarStore(Path(config.resampled_path())).bars(
+                self.catalog,
+                self._source_entries(),
+                self.instrument_id,
+                self.timeframe,
+                start=self.start_ns,
+                end=self.end_ns,
+            )
+        elif self.source == "parquet":
+            bars = self._parquet_store().bars(
+                bar_type=self.bar_type,
+                start=self.start_ns,
+                end=self.end_ns,
+            )
+        else:
+            bars = load_bars(
+                catalog=self.catalog,
+                entries=self.entries,
+                instrument_id=self.instrument_id,
+                start=self.start_ns,
+                end=self.end_ns,
+                cache=BarCache(Path(config.bar_cache_path()), config.BAR_CACHE_MAX_BYTES),
+            )
+        if not bars:
+            return None
+
+        return BacktestData(
+            bars=bars,
+            instrument=self._instrument(bars[-1].ts_event),
+            fingerprint=self.fingerprint(),
+        )
+
+    def stream(self, chunk_size: int = STREAM_CHUNK_SIZE) -> BacktestStream | None:
+        """Stream the bars `chunk_size` at a time, None when there are none."""
+        bar_type = self.bar_type
+        if self.timeframe is not None:
+            chunks = partial(
+                ResampledBarStore(Path(config.resampled_path())).stream,
+                self.catalog,
+                self._source_entries(),
+                self.instrument_id,
+                self.timeframe,
+                self.start_ns,
+                self.end_ns,
+                chunk_size,
+            )
+            # The last bucket closes at the end of the timeframe interval
+            interval = TIMEFRAME_INTERVALS[self.timeframe]
+            last_ts = (
+                max(entry.end for entry in self.entries) // interval + 1
+            ) * interval
+        elif self.source == "parquet":
+            store = self._parquet_store()
+            chunks = partial(
+                store.stream, bar_type, self.start_ns, self.end_ns, chunk_size
+            )
+            # The last bar of the range closes at the end of the last interval
+            # holding one, or at the end of the range
+            intervals = self._parquet_intervals(store)
+            last_ts = intervals[-1][1] if intervals else None
+            if last_ts is not None and self.end_ns is not None:
+                last_ts = min(last_ts, self.end_ns)
+        else:
+            chunks = partial(
+                stream_bars,
+                self.catalog,
+                self.entries,
+                self.instrument_id,
+                self.start_ns,
+                self.end_ns,
+                chunk_size,
+            )
+            # Bars are timestamped on close
+            schema = self.entries[0].schema
+            last_ts = max(entry.end for entry in self.entries) + SCHEMA_INTERVALS[schema]
+        if next(chunks(), None) is None:
+            return None
+
+        return BacktestStream(
+            bar_type=bar_type,
+            instrument=self._instrument(last_ts),
+            chunks=chunks,
+            fingerprint=self.fingerprint(),
+        )
+
+
+def select_data(  # noqa: PLR0913
+    start_ns: int | None = None,
+    end_ns: int | None = None,
+    source: str = "dbn",
+    timeframe: str | None = None,
+    dataset: str = DatabentoClient.DATASET,
+    schema: str = DatabentoClient.SCHEMA,
+    symbol: str = DatabentoClient.SYMBOL,
+) -> DataSelection | None:
+    """
+    Catalog files of the range of one instrument, by default the one downloaded.
+    None when there are none.
+    """
+    if timeframe is not None and source != "dbn":
+        err = "Resampled timeframes are built from the .dbn files, use source dbn"
+        raise ValueError(err)
+
+    catalog = PriceDataCatalog.load(Path(config.price_data_path()))
+    entries = catalog.query(
+        start=start_ns, end=end_ns, dataset=dataset, schema=schema, symbol=symbol
+    )
+    if not entries:
+        return None
+    return DataSelection(
+        catalog=catalog,
+        entries=entries,
+        start_ns=start_ns,
+        end_ns=end_ns,
+        source=source,
+        timeframe=timeframe,
+    )
+
+
+def load_backtest_data(
+    start_ns: int | None = None,
+    end_ns: int | None = None,
+    source: str = "dbn",
+) -> BacktestData | None:
+    """
+    Bars opening in [start_ns, end_ns) from the catalog, or from the Parquet store
+    when `source` is "parquet". None when there is no data in the range.
+    """
+    selection = select_data(start_ns=start_ns, end_ns=end_ns, source=source)
+    return None if selection is None else selection.load()
+
+
+def load_backtest_stream(
+    start_ns: int | None = None,
+    end_ns: int | None = None,
+    source: str = "dbn",
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> BacktestStream | None:
+    """
+    Stream of the bars `load_backtest_data` returns, read `chunk_size` bars at a
+    time. None when there is no data in the range.
+    """
+    selection = select_data(start_ns=start_ns, end_ns=end_ns, source=source)
+    return None if selection is None else selection.stream(chunk_size)
+
+
+def _create_venue_engine(
+    instrument: FuturesContract, log_level: str | None = None
+) -> BacktestEngine:
+    engine_config = None
+    if log_level is not None:
+        logging_config = LoggingConfig(
+            log_level=log_level,
+            bypass_logging=log_level == THROUGHPUT_LOG_LEVEL,
+        )
+        engine_config = BacktestEngineConfig(logging=logging_config)
+
+    engine = BacktestEngine(config=engine_config)
+    engine.add_venue(venue=instrument.id.venue, **VENUE_SETTINGS)
+    engine.add_instrument(instrument)
+    return engine
+
+
+def logs_bars(log_level: str | None) -> bool:
+    """Whether the strategies log every bar at `log_level`, None being INFO."""
+    return log_level is None or log_level in _BAR_LOG_LEVELS
+
+
+def create_engine(data: BacktestData, log_level: str | None = None) -> BacktestEngine:
+    """Engine with the venue, instrument and bars of `data` loaded."""
+    engine = _create_venue_engine(data.instrument, log_level=log_level)
+    engine.add_data(data.bars)
+    return engine
+
+
+class BacktestRunner:
+    """
+    Engine set up once with the venue, instrument and bars of `data`, running
+    strategies one after another.
+
+    Between runs the engine is reset and the strategy swapped, so the setup and the
+    sorting of the data are paid once. `overhead` is the time spent before the last
+    run started (setup on the first run, reset and swap afterwards) and `run_time`
+    the time of the last run. With a `profiler`, they are recorded as its
+    "engine_setup" and "engine_run" phases.
+
+    The bars of a `BacktestStream` are not held by the engine: every run feeds
+    them again from `chunks`, a chunk at a time, so memory does not grow with the
+    number of bars.
+
+    With `indicators`, the moving averages of the strategies are computed once per
+    period in that cache, and read by bar index during the runs. `indicator_data`
+    is the hash of the closes of the bars, computed from them on the first run when
+    not given. Runs whose averages are cached already do not read the closes.
+    """
+
+    def __init__(
+        self,
+        data: BacktestData | BacktestStream,
+        log_level: str | None = None,
+        profiler: Profiler | None = None,
+        indicators: IndicatorCache | None = None,
+        indicator_data: str | None = None,
+    ):
+        self.data = data
+        self.log_level = log_level
+        self.profiler = profiler
+        self.indicators = indicators
+        self.indicator_data = indicator_data
+        self._closes: np.ndarray | None = None
+        self.engine: BacktestEngine | None = None
+        self.overhead = 0.0
+        self.run_time = 0.0
+
+    def run(
+        self,
+        strategy: StrategySpec,
+        fast_period: int,
+        slow_period: int,
+        trade_size: int = DEFAULT_TRADE_SIZE,
+    ) -> BacktestResult:
+        start = time.perf_counter()
+        with phase(self.profiler, "engine_setup"):
+            if self.engine is None:
+                self.engine = self._create_engine()
+            else:
+                self.engine.reset()
+                self.engine.clear_strategies()
+                # Resetting clears the cache, instruments included
+                self.engine.cache.add_instrument(self.data.instrument)
+            run_start_ns = self._add_stream()
+
+            self.engine.add_strategy(
+                strategy.create(
+                    instrument_id=self.data.instrument.id,
+                    bar_type=self.bar_type,
+                    fast_period=fast_period,
+                    slow_period=slow_period,
+                    trade_size=trade_size,
+                    log_bars=logs_bars(self.log_level),
+                    **self.indicator_settings(strategy, [fast_period, slow_period]),
+                )
+            )
+        run_start = time.perf_counter()
+        self.overhead = run_start - start
+
+        with phase(self.profiler, "engine_run"):
+            self.engine.run(start=run_start_ns)
+            result = self.engine.get_result()
+        self.run_time = time.perf_counter() - run_start
+        return result
+
+    def _create_engine(self) -> BacktestEngine:
+        if isinstance(self.data, BacktestStream):
+            return _create_venue_engine(self.data.instrument, log_level=self.log_level)
+        return create_engine(self.data, log_level=self.log_level)
+
+    def _add_stream(self) -> int | None:
+        """
+        Feed the bars of a stream to the engine for the next run and return the
+        time the run starts at, None for loaded bars.
+        """
+        if not isinstance(self.data, BacktestStream):
+            return None
+        chunks = self.data.chunks()
+        first_chunk = next(chunks, None)
+        if first_chunk is None:
+            err = "No bars to stream"
+            raise ValueError(err)
+        self.engine.add_data_iterator("bars", chain([first_chunk], chunks))
+        # Without data added up front the engine clock would start at 0
+        return first_chunk[0].ts_init
+
+    @property
+    def bar_type(self) -> BarType:
+        if isinstance(self.data, BacktestStream):
+            return self.data.bar_type
+        return self.data.bars[0].bar_type
+
+    @property
+    def closes(self) -> np.ndarray:
+        if self._closes is None:
+            if isinstance(self.data, BacktestStream):
+                chunks = [bar_closes(chunk) for chunk in self.data.chunks()]
+                self._closes = np.concatenate(chunks) if chunks else np.empty(0)
+            else:
+                self._closes = bar_closes(self.data.bars)
+        return self._closes
+
+    def indicator_settings(
+        self, strategy: StrategySpec, periods: list[int]
+    ) -> dict[str, str]:
+        """
+        Precompute the averages of `strategy` over `periods`, return the settings
+        pointing the strategy to them, empty without `indicators`.
+        """
+        if self.indicators is None:
+            return {}
+        if self.indicator_data is None:
+            self.indicator_data = closes_hash(self.closes)
+        kind = strategy.average_kind
+        # Computed before the runs, unless evicted since
+        if not self.indicators.has_series(self.indicator_data, kind, periods):
+            self.indicators.precompute(
+                self.closes, kind, periods, data_hash=self.indicator_data
+            )
+        return {
+            "indicator_cache": str(self.indicators.directory),
+            "indicator_data": self.indicator_data,
+        }
+
+    def dispose(self) -> None:
+        if self.engine is not None:
+            self.engine.dispose()
+            self.engine = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.dispose()
+
+
+def run_backtest(  # noqa: PLR0913
+    data: BacktestData | BacktestStream,
+    strategy: StrategySpec,
+    fast_period: int,
+    slow_period: int,
+    log_level: str | None = None,
+    trade_size: int = DEFAULT_TRADE_SIZE,
+    profiler: Profiler | None = None,
+    export_dir: Path | None = None,
+) -> BacktestResult:
+    """
+    Backtest the bars of `data`. With an `export_dir` the fills, positions and
+    account balances of the run are exported there (see `src.trade_export`).
+    """
+    with BacktestRunner(data, log_level=log_level, profiler=profiler) as runner:
+        result = runner.run(strategy, fast_period, slow_period, trade_size)
+        if export_dir is not None:
+            with phase(profiler, "export"):
+                export_trades(runner.engine, export_dir)
+        return result
+
+
+def run_streaming_backtest(  # noqa: PLR0913
+    stream: BacktestStream,
+    strategy: StrategySpec,
+    fast_period: int,
+    slow_period: int,
+    log_level: str | None = None,
+    trade_size: int = DEFAULT_TRADE_SIZE,
+    profiler: Profiler | None = None,
+    export_dir: Path | None = None,
+) -> BacktestResult:
+    """
+    Backtest the bars of `stream`, fed to the engine chunk by chunk while it runs.
+    Only the chunks being processed are held in memory, and they are decoded in the
+    "engine_run" phase of `profiler`. `export_dir` is as for `run_backtest`.
+    """
+    return run_backtest(
+        stream,
+        strategy,
+        fast_period,
+        slow_period,
+        log_level=log_level,
+        trade_size=trade_size,
+        profiler=profiler,
+        export_dir=export_dir,
+    )
+
+
+@dataclass(frozen=True)
+class BacktestJob:
+    """
+    Backtest of a strategy on a date range, as run by `bt indicator` and `bt batch`.
+
+    `start`/`end` are YYYY-MM-DD dates, `end` exclusive, None for the first/last
+    available data. With a `chunk_size` the bars are streamed into the engine, and
+    with a `timeframe` the 1-minute bars are replaced by resampled ones.
+    """
+
+    strategy: str
+    fast_period: int
+    slow_period: int
+    start: str | None = None
+    end: str | None = None
+    trade_size: int = DEFAULT_TRADE_SIZE
+    source: str = "dbn"
+    chunk_size: int | None = None
+    timeframe: str | None = None
+
+
+def result_key(  # noqa: PLR0913
+    data_fingerprint: str,
+    strategy: StrategySpec,
+    instrument_id: InstrumentId,
+    bar_type: BarType,
+    fast_period: int,
+    slow_period: int,
+    trade_size: int = DEFAULT_TRADE_SIZE,
+) -> str:
+    """
+    Hash the inputs of a backtest into its result cache key: the bars, the strategy
+    class and its full config, the venue settings and the library versions.
+    """
+    strategy_config = strategy.config(
+        instrument_id, bar_type, fast_period, slow_period, trade_size
+    )
+    inputs = {
+        "data": data_fingerprint,
+        "strategy": f"{strategy.strategy_class.__module__}."
+        f"{strategy.strategy_class.__qualname__}",
+        "config": strategy_config.json().decode(),
+        "venue": {name: str(value) for name, value in VENUE_SETTINGS.items()},
+        "starting_balance": STARTING_BALANCE,
+        "versions": {
+            "nautilus_trader": nautilus_trader.__version__,
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "cache": RESULT_CACHE_VERSION,
+        },
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+
+def result_params(  # noqa: PLR0913
+    data_fingerprint: str,
+    strategy: StrategySpec,
+    instrument_id: InstrumentId,
+    bar_type: BarType,
+    fast_period: int,
+    slow_period: int,
+    trade_size: int = DEFAULT_TRADE_SIZE,
+) -> dict[str, Any]:
+    """Return the inputs of a backtest saved with its result in the result cache."""
+    return {
+        "strategy": strategy.name,
+        "fast_period": fast_period,
+        "slow_period": slow_period,
+        "trade_size": trade_size,
+        "instrument_id": str(instrument_id),
+        "bar_type": str(bar_type),
+        "data_hash": data_fingerprint,
+    }
+
+
+@dataclass(frozen=True)
+class JobResult:
+    key: str
+    result: BacktestResult
+    # True when the result was read from the cache instead of being run
+    cached: bool
+    # Folder of the exported fills, positions and account balances, if exported
+    trades_dir: Path | None = None
+
+
+def run_job(  # noqa: PLR0913
+    job: BacktestJob,
+    cache: ResultCache,
+    log_level: str | None = None,
+    profiler: Profiler | None = None,
+    report: str = REPORT_INLINE,
+    export: bool = False,  # noqa: FBT001, FBT002
+) -> JobResult | None:
+    """
+    Backtest `job`, or read its result from `cache` when the same backtest was run
+    before on the same data. New results are saved to the cache, and their PDF
+    report rendered, deferred or skipped as `report` says. None when there is no
+    data in the range.
+
+    With `export`, the fills, positions and account balances of the run are
+    exported to a folder of `trades_path` named after the result key. A cached
+    result without an export is run again to export them.
+
+    With a `profiler` the backtest always runs, and the phases of the run are
+    saved with its result under "profile".
+    """
+    with phase(profiler, "metadata"):
+        selection = select_data(
+            start_ns=date_to_ns(job.start) if job.start else None,
+            end_ns=date_to_ns(job.end) if job.end else None,
+            source=job.source,
+            timeframe=job.timeframe,
+        )
+        if selection is None:
+            return None
+
+        strategy = STRATEGIES[job.strategy]
+        # Streamed and loaded bars give the same result, so chunk_size is not in it
+        inputs = (
+            selection.fingerprint(),
+            strategy,
+            selection.instrument_id,
+            selection.bar_type,
+            job.fast_period,
+            job.slow_period,
+            job.trade_size,
+        )
+        key = result_key(*inputs)
+        trades_dir = Path(config.trades_path()) / key if export else None
+    if (
+        profiler is None
+        and (trades_dir is None or has_trades(trades_dir))
+        and (result := cache.get(key)) is not None
+    ):
+        cache.handle_report(key, report)
+        return JobResult(key=key, result=result, cached=True, trades_dir=trades_dir)
+
+    with phase(profiler, "decode"):
+        if job.chunk_size is None:
+            data = selection.load()
+            run = run_backtest
+        else:
+            data = selection.stream(job.chunk_size)
+            run = run_streaming_backtest
+    if data is None:
+        return None
+
+    result = run(
+        data,
+        strategy,
+        job.fast_period,
+        job.slow_period,
+        log_level=log_level,
+        trade_size=job.trade_size,
+        profiler=profiler,
+        export_dir=trades_dir,
+    )
+    with phase(profiler, "save"):
+        cache.put(key, result, result_params(*inputs))
+    with phase(profiler, "report"):
+        cache.handle_report(key, report)
+    if profiler is not None:
+        cache.add_profile(key, profiler.phases)
+    return JobResult(key=key, result=result, cached=False, trades_dir=trades_dir)
+
+
+def result_summary(result: BacktestResult) -> dict[str, Any]:
+    """Headline statistics of a backtest result, one row of a results table."""
+    pnls = result.stats_pnls.get("USD", {})
+    returns = result.stats_returns
+    return {
+        "pnl": pnls.get("PnL (total)"),
+        "pnl_pct": pnls.get("PnL% (total)"),
+        "win_rate": pnls.get("Win Rate"),
+        "expectancy": pnls.get("Expectancy"),
+        "sharpe": returns.get("Sharpe Ratio (252 days)"),
+        "sortino": returns.get("Sortino Ratio (252 days)"),
+        "profit_factor": returns.get("Profit Factor"),
+        "total_orders": result.total_orders,
+        "total_positions": result.total_positions,
+    }
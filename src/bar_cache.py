@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import TYPE_CHECKING
+
+import nautilus_trader
+import numpy as np
+from nautilus_trader.adapters.databento import DatabentoDataLoader
+
+from src.shared_bars import bars_to_records, records_to_bars
+from src.summary import load_summary
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from nautilus_trader.model import Bar, InstrumentId
+
+# Bumped whenever the decoding or the cached record layout changes
+BAR_CACHE_VERSION = 1
+LOADER_VERSION = f"{nautilus_trader.__version__}-{BAR_CACHE_VERSION}"
+
+
+class BarCache:
+    """
+    Disk cache of the bars decoded by `DatabentoDataLoader`, one `.npy` file of
+    columnar records per (file content hash, instrument id, loader version).
+
+    A changed file gets a new hash, so its stale entry is never read again and ages
+    out. Reads refresh the modification time of the entry, and the least recently
+    used entries are evicted once the cache is larger than `max_bytes`.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(path: Path, instrument_id: InstrumentId) -> str:
+        file_hash = load_summary(path)["sha256"]
+        return hashlib.sha256(
+            f"{file_hash}:{instrument_id}:{LOADER_VERSION}".encode()
+        ).hexdigest()
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.directory / f"{key}.npy", self.directory / f"{key}.json"
+
+    def get(self, path: Path, instrument_id: InstrumentId) -> list[Bar] | None:
+        records_path, meta_path = self._paths(self.key(path, instrument_id))
+        try:
+            with meta_path.open() as f:
+                meta = json.load(f)
+            records = np.load(records_path, mmap_mode="r")
+        except (FileNotFoundError, ValueError):
+            return None
+
+        os.utime(records_path)
+        return records_to_bars(
+            records,
+            meta["bar_type"],
+            meta["price_precision"],
+            meta["size_precision"],
+        )
+
+    def put(self, path: Path, instrument_id: InstrumentId, bars: list[Bar]) -> None:
+        if not bars:
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        records_path, meta_path = self._paths(self.key(path, instrument_id))
+
+        tmp_path = records_path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp_path.open(mode="wb") as f:
+            np.save(f, bars_to_records(bars))
+        tmp_path.replace(records_path)
+
+        tmp_path = meta_path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp_path.open(mode="w") as f:
+            json.dump(
+                {
+                    "bar_type": str(bars[0].bar_type),
+                    "price_precision": bars[0].open.precision,
+                    "size_precision": bars[0].volume.precision,
+                },
+                f,
+                indent=3,
+            )
+        tmp_path.replace(meta_path)
+
+        self.evict()
+
+    def load(self, path: Path, instrument_id: InstrumentId) -> list[Bar]:
+        """Bars of a `.dbn` file, decoded only when they are not cached."""
+        bars = self.get(path, instrument_id)
+        if bars is None:
+            bars = DatabentoDataLoader().from_dbn_file(
+                path=path,
+                instrument_id=instrument_id,
+            )
+            self.put(path, instrument_id, bars)
+        return bars
+
+    def size(self) -> int:
+        return sum(p.stat().st_size for p in self.directory.glob("*.npy"))
+
+    def evict(self) -> None:
+        """Delete the least recently used entries until the cache fits `max_bytes`."""
+        entries = sorted(
+            (p.stat().st_mtime_ns, p.stat().st_size, p)
+            for p in self.directory.glob("*.npy")
+        )
+        total = sum(size for _, size, _ in entries)
+        for _, size, records_path in entries:
+            if total <= self.max_bytes:
+                break
+            records_path.unlink(missing_ok=True)
+            records_path.with_suffix(".json").unlink(missing_ok=True)
+            total -= size
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import heapq
+from itertools import islice, takewhile
+from typing import TYPE_CHECKING
+
+from databento.common.dbnstore import DBNStore
+from nautilus_trader.adapters.databento import DatabentoDataLoader
+from nautilus_trader.model import Bar, BarType
+
+from src.quality import SCHEMA_INTERVALS
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from nautilus_trader.model import InstrumentId
+
+    from src.bar_cache import BarCache
+    from src.catalog import CatalogEntry, PriceDataCatalog
+
+# Precisions the Databento loader gives bars without instrument definitions
+DBN_PRICE_PRECISION = 2
+DBN_SIZE_PRECISION = 0
+DBN_PRICE_SCALE = 1e9
+
+STREAM_CHUNK_SIZE = 100_000
+
+BAR_SPECS = {
+    "ohlcv-1s": "1-SECOND-LAST",
+    "ohlcv-1m": "1-MINUTE-LAST",
+    "ohlcv-1h": "1-HOUR-LAST",
+    "ohlcv-1d": "1-DAY-LAST",
+}
+
+
+def bar_type_for(instrument_id: InstrumentId, schema: str) -> BarType:
+    """Bar type the Databento loader assigns to the bars of an OHLCV schema."""
+    return BarType.from_str(f"{instrument_id}-{BAR_SPECS[schema]}-EXTERNAL")
+
+
+def _check_entries(entries: list[CatalogEntry]) -> None:
+    if len({(entry.dataset, entry.schema, entry.symbol) for entry in entries}) > 1:
+        err = "Price data files must share dataset, schema and symbol"
+        raise ValueError(err)
+
+
+def load_bars(  # noqa: PLR0913
+    catalog: PriceDataCatalog,
+    entries: list[CatalogEntry],
+    instrument_id: InstrumentId,
+    start: int | None = None,
+    end: int | None = None,
+    cache: BarCache | None = None,
+) -> list[Bar]:
+    """
+    Decode the bars of the catalog entries, drop the duplicates of overlapping
+    downloads and keep the bars opening in [start, end).
+
+    With a `cache`, files decoded before are read from the cache instead.
+    """
+    _check_entries(entries)
+
+    loader = DatabentoDataLoader()
+    bars_by_ts: dict[int, Bar] = {}
+    for entry in entries:
+        path = catalog.path(entry)
+        if cache is not None:
+            file_bars = cache.load(path, instrument_id)
+        else:
+            file_bars = loader.from_dbn_file(path=path, instrument_id=instrument_id)
+        for bar in file_bars:
+            bars_by_ts.setdefault(bar.ts_event, bar)
+
+    # Bars are timestamped on close, so a bar opening in [start, end) closes in
+    # (start, end]
+    return [
+        bars_by_ts[ts]
+        for ts in sorted(bars_by_ts)
+        if (start is None or ts > start) and (end is None or ts <= end)
+    ]
+
+
+def _file_bars(
+    path: Path,
+    bar_type: BarType,
+    interval: int,
+    chunk_size: int,
+) -> Iterator[Bar]:
+    """Bars of a `.dbn` file, decoded `chunk_size` records at a time."""
+    for records in DBNStore.from_file(path).to_ndarray(count=chunk_size):
+        # Timestamped on close, as the Databento loader does
+        ts = records["ts_event"] + interval
+        yield from Bar.from_raw_arrays_to_list(
+            bar_type,
+            DBN_PRICE_PRECISION,
+            DBN_SIZE_PRECISION,
+            records["open"] / DBN_PRICE_SCALE,
+            records["high"] / DBN_PRICE_SCALE,
+            records["low"] / DBN_PRICE_SCALE,
+            records["close"] / DBN_PRICE_SCALE,
+            records["volume"].astype("f8"),
+            ts,
+            ts,
+        )
+
+
+def _merge_files(
+    catalog: PriceDataCatalog,
+    entries: list[CatalogEntry],
+    bar_type: BarType,
+    interval: int,
+    chunk_size: int,
+) -> Iterator[Bar]:
+    """
+    Bars of the entries in time order, without duplicates. A file is only opened
+    once the bars before its first one were merged.
+    """
+    pending = sorted(range(len(entries)), key=lambda i: entries[i].start, reverse=True)
+    # (ts_event, entry index, bar, bars of the file), the entry index breaks ties so
+    # the first entry wins like in `load_bars`
+    heap: list[tuple[int, int, Bar, Iterator[Bar]]] = []
+    last_ts = None
+    while heap or pending:
+        while pending and (
+            not heap or entries[pending[-1]].start + interval <= heap[0][0]
+        ):
+            index = pending.pop()
+            bars = _file_bars(
+                catalog.path(entries[index]), bar_type, interval, chunk_size
+            )
+            if (bar := next(bars, None)) is not None:
+                heapq.heappush(heap, (bar.ts_event, index, bar, bars))
+        if not heap:
+            continue
+
+        ts, index, bar, bars = heap[0]
+        if (next_bar := next(bars, None)) is not None:
+            heapq.heapreplace(heap, (next_bar.ts_event, index, next_bar, bars))
+        else:
+            heapq.heappop(heap)
+        if ts != last_ts:
+            last_ts = ts
+            yield bar
+
+
+def stream_bars(  # noqa: PLR0913
+    catalog: PriceDataCatalog,
+    entries: list[CatalogEntry],
+    instrument_id: InstrumentId,
+    start: int | None = None,
+    end: int | None = None,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> Iterator[list[Bar]]:
+    """
+    Stream the bars `load_bars` returns, in time-ordered lists of at most
+    `chunk_size` bars.
+
+    The files are decoded chunk by chunk while the lists are consumed, so memory
+    depends on `chunk_size` and not on the length of the range.
+    """
+    _check_entries(entries)
+    if not entries:
+        return
+
+    schema = entries[0].schema
+    bar_type = bar_type_for(instrument_id, schema)
+    merged = _merge_files(
+        catalog, entries, bar_type, SCHEMA_INTERVALS[schema], chunk_size
+    )
+    # Bars opening in [start, end), the merge stops at the first bar past the end
+    bars = takewhile(
+        lambda bar: end is None or bar.ts_event <= end,
+        (bar for bar in merged if start is None or bar.ts_event > start),
+    )
+    while chunk := list(islice(bars, chunk_size)):
+        yield chunk
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import signal
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict, fields
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+from src.backtest import STRATEGIES, BacktestJob, result_summary, run_job
+from src.resample import TIMEFRAME_INTERVALS
+from src.result_cache import REPORT_INLINE
+from src.utils import date_to_ns, replace_nan_to_none
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from src.result_cache import ResultCache
+
+BATCH_LOG_LEVEL = "ERROR"
+SOURCES = ("dbn", "parquet")
+
+PENDING = "pending"
+DONE = "done"
+NO_DATA = "no_data"
+FAILED = "failed"
+
+
+def _positive_int(spec: dict[str, Any], name: str) -> None:
+    value = spec[name]
+    if not isinstance(value, int) or isinstance(value, bool) or value <= 0:
+        err = f"{name} must be a positive integer, got {value!r}"
+        raise ValueError(err)
+
+
+def _check_fields(spec: object) -> None:
+    if not isinstance(spec, dict):
+        err = "A job must be a JSON object"
+        raise TypeError(err)
+    if unknown := set(spec) - {field.name for field in fields(BacktestJob)}:
+        err = f"Unknown fields {sorted(unknown)}"
+        raise ValueError(err)
+    if missing := {"strategy", "fast_period", "slow_period"} - set(spec):
+        err = f"Missing fields {sorted(missing)}"
+        raise ValueError(err)
+
+
+def _check_timeframe(spec: dict[str, Any]) -> None:
+    if spec["timeframe"] not in TIMEFRAME_INTERVALS:
+        err = (
+            f"timeframe must be one of {list(TIMEFRAME_INTERVALS)}, "
+            f"got {spec['timeframe']!r}"
+        )
+        raise ValueError(err)
+    if spec.get("source", "dbn") != "dbn":
+        err = "timeframe requires source dbn, resampled bars are built from .dbn files"
+        raise ValueError(err)
+
+
+def parse_job(spec: object) -> BacktestJob:
+    """Validate a job spec of a jobs file, with the fields of `BacktestJob`."""
+    _check_fields(spec)
+    if spec["strategy"] not in STRATEGIES:
+        err = (
+            f"Unknown strategy {spec['strategy']!r}, expected one of {sorted(STRATEGIES)}"
+        )
+        raise ValueError(err)
+    for name in ("fast_period", "slow_period", "trade_size", "chunk_size"):
+        if spec.get(name) is not None:
+            _positive_int(spec, name)
+    if spec["fast_period"] >= spec["slow_period"]:
+        err = "fast_period must be below slow_period"
+        raise ValueError(err)
+    for name in ("start", "end"):
+        if spec.get(name) is not None:
+            date_to_ns(spec[name])
+    if spec.get("source", "dbn") not in SOURCES:
+        err = f"source must be one of {list(SOURCES)}, got {spec['source']!r}"
+        raise ValueError(err)
+    if spec.get("timeframe") is not None:
+        _check_timeframe(spec)
+
+    return BacktestJob(**spec)
+
+
+def load_jobs(path: Path) -> list[BacktestJob]:
+    """Jobs of a JSON Lines file, one spec per line. Blank lines are skipped."""
+    jobs = []
+    with path.open() as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                jobs.append(parse_job(json.loads(line)))
+            except (TypeError, ValueError) as e:
+                err = f"{path}:{line_number}: {e}"
+                raise ValueError(err) from e
+    return jobs
+
+
+def job_key(job: BacktestJob) -> str:
+    """Short hash of the job spec, the same spec always gets the same key."""
+    spec = json.dumps(asdict(job), sort_keys=True)
+    return hashlib.sha256(spec.encode()).hexdigest()[:16]
+
+
+class BatchState:
+    """
+    Status of every job of a batch, written to a JSON file on every change.
+
+    Only the parent process writes it, atomically, so a batch that crashed or was
+    interrupted resumes from the file without running its finished jobs again.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.jobs: dict[str, dict[str, Any]] = {}
+        if path.exists():
+            with path.open() as f:
+                self.jobs = json.load(f)["jobs"]
+
+    def status(self, key: str) -> str:
+        return self.jobs.get(key, {}).get("status", PENDING)
+
+    def add(self, job: BacktestJob) -> None:
+        self.jobs.setdefault(job_key(job), {"job": asdict(job), "status": PENDING})
+
+    def update(self, key: str, status: str, **values: Any) -> None:  # noqa: ANN401
+        self.jobs[key].update(
+            status=status,
+            finished=datetime.now(UTC).isoformat(),
+            **values,
+        )
+        self.save()
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with tmp_path.open(mode="w") as f:
+            json.dump({"jobs": self.jobs}, f, indent=3, sort_keys=True)
+        tmp_path.replace(self.path)
+
+
+def _init_worker() -> None:
+    # Ctrl-C is handled by the parent, which lets the running jobs finish
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _run_batch_job(
+    job: BacktestJob,
+    cache: ResultCache,
+    report: str,
+    export: bool,  # noqa: FBT001
+    log_level: str,
+) -> dict[str, Any] | None:
+    job_result = run_job(job, cache, log_level=log_level, report=report, export=export)
+    if job_result is None:
+        return None
+    return {
+        "summary": replace_nan_to_none(result_summary(job_result.result)),
+        "result": job_result.key,
+        "cached": job_result.cached,
+    }
+
+
+def run_batch(  # noqa: PLR0913
+    jobs: list[BacktestJob],
+    state: BatchState,
+    cache: ResultCache,
+    max_workers: int | None = None,
+    on_finish: Callable[[str, dict[str, Any]], None] | None = None,
+    report: str = REPORT_INLINE,
+    export: bool = False,  # noqa: FBT001, FBT002
+    log_level: str = BATCH_LOG_LEVEL,
+) -> bool:
+    """
+    Run the jobs not done yet on a process pool of `max_workers` processes, saving
+    each result to `cache` and its status and result cache key to `state`. Jobs
+    whose backtest is in the cache already are not run again. The PDF reports are
+    rendered, deferred or skipped as `report` says, and with `export` the fills,
+    positions and account balances of every job are exported (see `run_job`). The
+    engines log at `log_level`, THROUGHPUT_LOG_LEVEL bypasses their logging.
+
+    On Ctrl-C the queued jobs are cancelled and the running ones finish. Returns
+    False when the batch was interrupted. `on_finish` is called with the key and
+    state of every job as it finishes.
+    """
+    for job in jobs:
+        state.add(job)
+    state.save()
+
+    todo = {job_key(job): job for job in jobs if state.status(job_key(job)) != DONE}
+    interrupted = False
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_worker
+    ) as executor:
+        futures = {
+            executor.submit(_run_batch_job, job, cache, report, export, log_level): key
+            for key, job in todo.items()
+        }
+        remaining = set(futures)
+        while remaining:
+            try:
+                finished, remaining = wait(remaining, return_when=FIRST_COMPLETED)
+            except KeyboardInterrupt:
+                interrupted = True
+                for future in remaining:
+                    future.cancel()
+                remaining = {future for future in remaining if not future.cancelled()}
+                continue
+
+            for future in finished:
+                key = futures[future]
+                if (error := future.exception()) is not None:
+                    lines = traceback.format_exception(error)
+                    state.update(key, FAILED, summary=None, error="".join(lines))
+                elif (values := future.result()) is None:
+                    state.update(key, NO_DATA, summary=None, error=None)
+                else:
+                    state.update(key, DONE, error=None, **values)
+                if on_finish is not None:
+                    on_finish(key, state.jobs[key])
+    return not interrupted
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import nautilus_trader
+
+from config import config
+from src.backtest import (
+    STRATEGIES,
+    THROUGHPUT_LOG_LEVEL,
+    BacktestData,
+    BacktestJob,
+    run_backtest,
+    run_job,
+    select_data,
+)
+from src.result_cache import REPORT_INLINE, ResultCache
+from src.synthetic_data import DAY_NS, write_es_dbn
+from src.utils import date_to_ns, replace_nan_to_none
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from nautilus_trader.backtest.results import BacktestResult
+
+    from src.backtest_report_generator import BacktestReportGenerator
+
+# Days of synthetic ES bars of each benchmark size
+SIZES = {"1d": 1, "1m": 30, "1y": 365, "5y": 5 * 365}
+BENCHMARK_START = "2024-01-02"
+BENCHMARK_PERIODS = (10, 30)
+# Result cache key of the results saved by the benchmarks
+BENCHMARK_KEY = "benchmark"
+
+# Modules whose import time is tracked: `cli.main` is paid by every `bt` call,
+# `src.backtest` by every backtesting command
+IMPORT_MODULES = ("cli.main", "src.backtest")
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# A benchmark regresses when it is slower than its baseline by more than the
+# threshold and by more than MIN_REGRESSION_S, so jitter of fast ones is ignored
+DEFAULT_THRESHOLD = 0.2
+MIN_REGRESSION_S = 0.05
+
+
+def _best_time(function: Callable[[], object], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+@contextmanager
+def _data_paths(directory: Path) -> Iterator[None]:
+    """
+    Point the price data and bar cache paths of `config` to `directory`
+    meanwhile, so the benchmarks read the synthetic data the way `bt` reads the
+    saved data.
+    """
+    paths = {
+        "price_data_path": directory / "price_data",
+        "bar_cache_path": directory / "bar_cache",
+    }
+    for name, path in paths.items():
+        setattr(config, name, lambda path=path: str(path))
+    try:
+        yield
+    finally:
+        for name in paths:
+            delattr(config, name)
+
+
+def _load() -> BacktestData:
+    return select_data().load()
+
+
+def _save(result: BacktestResult, cache: ResultCache) -> None:
+    cache.put(BENCHMARK_KEY, result)
+
+
+def _report_generator() -> BacktestReportGenerator:
+    # reportlab is slow to import and only needed by the benchmarks rendering
+    from src.backtest_report_generator import (  # noqa: PLC0415
+        BacktestReportGenerator,
+    )
+
+    return BacktestReportGenerator()
+
+
+def _pipeline(strategy_name: str, directory: Path) -> None:
+    """Run a backtest as `bt indicator` does, in a new result cache so it runs."""
+    cache = ResultCache(Path(tempfile.mkdtemp(dir=directory)))
+    run_job(
+        BacktestJob(strategy_name, *BENCHMARK_PERIODS),
+        cache,
+        log_level=THROUGHPUT_LOG_LEVEL,
+        report=REPORT_INLINE,
+    )
+
+
+def import_time(module: str) -> float:
+    """
+    Cumulative import time of `module` in a new interpreter, in seconds, as
+    measured by `python -X importtime`.
+    """
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=PROJECT_ROOT,
+    )
+    # "import time: self [us] | cumulative | imported package", the module last
+    for line in reversed(output.stderr.splitlines()):
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative) / 1_000_000
+    err = f"No import time of {module} in the output of -X importtime"
+    raise ValueError(err)
+
+
+def benchmark_imports(repeat: int = 3) -> dict[str, float]:
+    """Best of `repeat` import times of each of `IMPORT_MODULES`, in seconds."""
+    return {
+        f"import[{module}]": min(import_time(module) for _ in range(repeat))
+        for module in IMPORT_MODULES
+    }
+
+
+def benchmark_size(size: str, directory: Path, repeat: int = 3) -> dict[str, float]:
+    """
+    Best of `repeat` times, in seconds, of each stage on `size` of synthetic bars
+    written to `directory`: loading the bars of the range, saving and rendering the
+    result of `ma_cross`, and the whole `run_job` pipeline of `ma_cross` and
+    `ema_cross`. The bars are read through the catalog and the bar cache, as every
+    backtesting command reads them.
+    """
+    start_ns = date_to_ns(BENCHMARK_START)
+    size_dir = directory / size
+    (size_dir / "price_data").mkdir(parents=True, exist_ok=True)
+    write_es_dbn(
+        size_dir / "price_data" / "data.dbn", start_ns, start_ns + SIZES[size] * DAY_NS
+    )
+
+    with _data_paths(size_dir):
+        # Also fills the bar cache, as an earlier backtest of the data would
+        data = _load()
+        result = run_backtest(
+            data,
+            STRATEGIES["ma_cross"],
+            *BENCHMARK_PERIODS,
+            log_level=THROUGHPUT_LOG_LEVEL,
+        )
+        output_data = replace_nan_to_none(vars(result))
+        output = size_dir / "output.pdf"
+        cache = ResultCache(size_dir / "cache")
+        # Imported before the timings start
+        generator = _report_generator()
+        return {
+            f"load[{size}]": _best_time(_load, repeat),
+            f"save[{size}]": _best_time(lambda: _save(result, cache), repeat),
+            f"report[{size}]": _best_time(
+                lambda: generator.generate(output_data, output), repeat
+            ),
+            **{
+                f"{name}[{size}]": _best_time(
+                    lambda name=name: _pipeline(name, size_dir), repeat
+                )
+                for name in ("ma_cross", "ema_cross")
+            },
+        }
+
+
+def run_benchmarks(sizes: list[str], repeat: int = 3) -> dict[str, Any]:
+    """
+    Import times and benchmarks of every size, on synthetic data in a temporary
+    directory.
+    """
+    benchmarks = benchmark_imports(repeat)
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            benchmarks.update(benchmark_size(size, Path(directory), repeat))
+    return {
+        "created": datetime.now(UTC).isoformat(),
+        "machine": platform.machine(),
+        "python": platform.python_version(),
+        "nautilus_trader": nautilus_trader.__version__,
+        "repeat": repeat,
+        "benchmarks": benchmarks,
+    }
+
+
+def find_regressions(
+    run: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[dict[str, Any]]:
+    """Benchmarks of `run` slower than in `baseline` by more than `threshold`."""
+    regressions = []
+    for name, seconds in run["benchmarks"].items():
+        base = baseline["benchmarks"].get(name)
+        if base is None:
+            continue
+        if seconds > base * (1 + threshold) and seconds - base > MIN_REGRESSION_S:
+            regressions.append(
+                {
+                    "name": name,
+                    "baseline_s": base,
+                    "seconds": seconds,
+                    "ratio": seconds / base,
+                }
+            )
+    return regressions
+
+
+def load_baseline(path: Path) -> dict[str, Any] | None:
+    if not path.exists():
+        return None
+    with path.open() as f:
+        return json.load(f)
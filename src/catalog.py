@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import json
+import os
+from bisect import bisect_left
+from dataclasses import asdict, dataclass
+from itertools import accumulate
+from typing import TYPE_CHECKING
+
+from src.summary import load_summary
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    path: str
+    dataset: str
+    schema: str
+    symbol: str
+    start: int
+    end: int
+    count: int
+    size: int
+    mtime_ns: int
+
+    def overlaps(self, start: int | None, end: int | None) -> bool:
+        return (start is None or self.end >= start) and (end is None or self.start < end)
+
+
+def scan_dbn_file(path: Path, root: Path) -> CatalogEntry | None:
+    summary = load_summary(path)
+    if not summary["count"]:
+        return None
+
+    metadata = summary["metadata"]
+    return CatalogEntry(
+        path=path.relative_to(root).as_posix(),
+        dataset=metadata["dataset"],
+        schema=metadata["schema"],
+        symbol=metadata["symbols"][0] if metadata["symbols"] else "",
+        start=summary["first_ts"],
+        end=summary["last_ts"],
+        count=summary["count"],
+        size=summary["size"],
+        mtime_ns=summary["mtime_ns"],
+    )
+
+
+class PriceDataCatalog:
+    """
+    Index of the `.dbn` files under a price data folder, sorted by first timestamp.
+
+    Range queries bisect the sorted start timestamps and the running maximum of the
+    end timestamps, so only the files overlapping the range are touched.
+    """
+
+    INDEX_FILENAME = "catalog.json"
+
+    def __init__(self, root: Path, entries: list[CatalogEntry] | None = None):
+        self.root = root
+        self._set_entries(entries or [])
+
+    @classmethod
+    def load(cls, root: Path) -> PriceDataCatalog:
+        index_path = root / cls.INDEX_FILENAME
+        if not index_path.exists():
+            catalog = cls(root)
+            catalog.refresh()
+            return catalog
+
+        with index_path.open() as f:
+            entries = [CatalogEntry(**entry) for entry in json.load(f)["entries"]]
+        return cls(root, entries)
+
+    @property
+    def entries(self) -> list[CatalogEntry]:
+        return list(self._entries)
+
+    def _set_entries(self, entries: list[CatalogEntry]) -> None:
+        self._entries = sorted(entries, key=lambda e: (e.start, e.end, e.path))
+        self._starts = [entry.start for entry in self._entries]
+        self._max_ends = list(accumulate((entry.end for entry in self._entries), max))
+
+    def save(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        index_path = self.root / self.INDEX_FILENAME
+        tmp_path = index_path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp_path.open(mode="w") as f:
+            json.dump({"entries": [asdict(e) for e in self._entries]}, f, indent=3)
+        tmp_path.replace(index_path)
+
+    def add(self, path: Path) -> CatalogEntry | None:
+        entry = scan_dbn_file(path, self.root)
+        relative_path = path.relative_to(self.root).as_posix()
+        entries = [e for e in self._entries if e.path != relative_path]
+        if entry is not None:
+            entries.append(entry)
+        self._set_entries(entries)
+        return entry
+
+    def refresh(self) -> list[CatalogEntry]:
+        """
+        Re-index the folder: new and modified files are scanned, removed files are
+        dropped and unchanged files keep their entry.
+        """
+        known = {entry.path: entry for entry in self._entries}
+        entries = []
+        for path in sorted(self.root.glob("**/*.dbn")):
+            stat = path.stat()
+            entry = known.get(path.relative_to(self.root).as_posix())
+            if entry is None or (entry.size, entry.mtime_ns) != (
+                stat.st_size,
+                stat.st_mtime_ns,
+            ):
+                entry = scan_dbn_file(path, self.root)
+            if entry is not None:
+                entries.append(entry)
+
+        self._set_entries(entries)
+        self.save()
+        return self.entries
+
+    def query(
+        self,
+        start: int | None = None,
+        end: int | None = None,
+        dataset: str | None = None,
+        schema: str | None = None,
+        symbol: str | None = None,
+    ) -> list[CatalogEntry]:
+        """Entries with records in [start, end), timestamps in UNIX nanoseconds."""
+        lo = 0 if start is None else bisect_left(self._max_ends, start)
+        hi = len(self._entries) if end is None else bisect_left(self._starts, end)
+
+        return [
+            entry
+            for entry in self._entries[lo:hi]
+            if entry.overlaps(start, end)
+            and (dataset is None or entry.dataset == dataset)
+            and (schema is None or entry.schema == schema)
+            and (symbol is None or entry.symbol == symbol)
+        ]
+
+    def latest(self) -> CatalogEntry | None:
+        return max(self._entries, key=lambda e: e.mtime_ns, default=None)
+
+    def entry(self, path: Path) -> CatalogEntry | None:
+        relative_path = path.relative_to(self.root).as_posix()
+        return next((e for e in self._entries if e.path == relative_path), None)
+
+    def path(self, entry: CatalogEntry) -> Path:
+        return self.root / entry.path
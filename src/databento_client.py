@@ -1,12 +1,30 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 import databento
 from databento.common.dbnstore import DBNStore
 
+from src.utils import date_to_ns
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from src.download_cache import DownloadCache
+
 
 class DatabentoClient:
-    def __init__(self, api_key: str):
+    DATASET = "GLBX.MDP3"
+    SCHEMA = "ohlcv-1m"
+    SYMBOL = "ES.v.0"
+    STYPE_IN = "continuous"
+
+    def __init__(self, api_key: str, cache: DownloadCache | None = None):
         self.api_key = api_key
         self._validate_api_key_exists()
         self.client = databento.Historical(self.api_key)
+        self.cache = cache
 
     def _validate_api_key_exists(self):
         if not self.api_key:
@@ -17,14 +35,79 @@ class DatabentoClient:
         self,
         start_date: str,
         end_date: str,
-        limit: int = 1,
+        limit: int | None = 1,
+        path: Path | None = None,
+    ) -> DBNStore:
+        """
+        With a `path`, the response is streamed straight to that file and the
+        returned store reads it lazily.
+        """
+        if self.cache is None:
+            return self._request(
+                start=f"{start_date}T00:00:00",
+                end=f"{end_date}T00:00:00",
+                limit=limit,
+                path=path,
+            )
+
+        store = self.cache.get_range(
+            dataset=self.DATASET,
+            schema=self.SCHEMA,
+            symbol=self.SYMBOL,
+            start=date_to_ns(start_date),
+            end=date_to_ns(end_date),
+            fetch=self._fetch(limit),
+            limit=limit,
+        )
+        if path is None:
+            return store
+
+        store.to_file(path)
+        return DBNStore.from_file(path)
+
+    def download_missing(
+        self,
+        start_date: str,
+        end_date: str,
+        limit: int | None = 1,
+    ) -> list[Path]:
+        """Stream the ranges missing from the cache to disk, without merging them."""
+        if self.cache is None:
+            err = "download_missing requires a download cache"
+            raise ValueError(err)
+
+        return self.cache.fetch_missing(
+            dataset=self.DATASET,
+            schema=self.SCHEMA,
+            symbol=self.SYMBOL,
+            start=date_to_ns(start_date),
+            end=date_to_ns(end_date),
+            fetch=self._fetch(limit),
+            limit=limit,
+        )
+
+    def _fetch(self, limit: int | None) -> Callable[[int, int, Path], DBNStore]:
+        return lambda start, end, path: self._request(
+            start=start,
+            end=end,
+            limit=limit,
+            path=path,
+        )
+
+    def _request(
+        self,
+        start: str | int,
+        end: str | int,
+        limit: int | None,
+        path: Path | None = None,
     ) -> DBNStore:
         return self.client.timeseries.get_range(
-            dataset="GLBX.MDP3",
-            schema="ohlcv-1m",
-            symbols="ES.v.0",
-            stype_in="continuous",
-            start=f"{start_date}T00:00:00",
-            end=f"{end_date}T00:00:00",
+            dataset=self.DATASET,
+            schema=self.SCHEMA,
+            symbols=self.SYMBOL,
+            stype_in=self.STYPE_IN,
+            start=start,
+            end=end,
             limit=limit,
+            path=path,
         )
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
+
+import databento_dbn
+import numpy as np
+import portion
+import zstandard
+from databento.common.dbnstore import DBNStore
+
+from src.quality import SCHEMA_INTERVALS
+from src.summary import summarize_records
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from src.catalog import PriceDataCatalog
+
+
+def merge_mappings(stores: list[DBNStore]) -> list[SimpleNamespace]:
+    intervals: dict[str, dict[tuple, dict[str, Any]]] = {}
+    for store in stores:
+        for raw_symbol, symbol_intervals in store.metadata.mappings.items():
+            for interval in symbol_intervals:
+                key = (interval["start_date"], interval["end_date"], interval["symbol"])
+                intervals.setdefault(raw_symbol, {})[key] = interval
+
+    return [
+        SimpleNamespace(
+            raw_symbol=raw_symbol,
+            intervals=[SimpleNamespace(**i) for _, i in sorted(by_key.items())],
+        )
+        for raw_symbol, by_key in intervals.items()
+    ]
+
+
+def merge_dbn_stores(
+    stores: list[DBNStore],
+    start: int,
+    end: int,
+    limit: int | None = None,
+) -> DBNStore:
+    """
+    Merge the records of DBN stores of the same dataset and schema into a single
+    store for [start, end), sorted by time and without duplicated records.
+    """
+    arrays = [store.to_ndarray() for store in stores]
+    records = np.concatenate(arrays)
+    ts_event = records["ts_event"]
+    records = records[(ts_event >= start) & (ts_event < end)]
+
+    order = np.lexsort((records["instrument_id"], records["ts_event"]))
+    records = records[order]
+    if len(records):
+        keys = records[["ts_event", "instrument_id"]]
+        records = records[np.concatenate(([True], keys[1:] != keys[:-1]))]
+    if limit:
+        records = records[:limit]
+
+    first = stores[0].metadata
+    metadata = databento_dbn.Metadata(
+        dataset=first.dataset,
+        start=start,
+        stype_in=first.stype_in,
+        stype_out=first.stype_out,
+        schema=first.schema,
+        symbols=first.symbols,
+        partial=[],
+        not_found=[],
+        mappings=merge_mappings(stores),
+        end=end,
+        limit=limit,
+        version=first.version,
+    )
+    data = metadata.encode() + records.tobytes()
+    return DBNStore.from_bytes(zstandard.ZstdCompressor().compress(data))
+
+
+class DownloadCache:
+    """
+    Local cache of downloaded ranges per (dataset, schema, symbol).
+
+    `coverage.json` records the range each cached file covers, so a request only
+    fetches the sub-ranges that are not covered yet and is answered by merging the
+    cached files with the new ones.
+    """
+
+    COVERAGE_FILENAME = "coverage.json"
+
+    def __init__(self, directory: Path, catalog: PriceDataCatalog | None = None):
+        self.directory = directory
+        self.catalog = catalog
+
+    def _key_directory(self, dataset: str, schema: str, symbol: str) -> Path:
+        return self.directory / dataset / schema / symbol
+
+    def _load_coverage(self, directory: Path) -> list[dict[str, Any]]:
+        coverage_path = directory / self.COVERAGE_FILENAME
+        if not coverage_path.exists():
+            return []
+
+        with coverage_path.open() as f:
+            coverage = json.load(f)["files"]
+        return [c for c in coverage if (directory / c["file"]).exists()]
+
+    def _save_coverage(self, directory: Path, coverage: list[dict[str, Any]]) -> None:
+        coverage_path = directory / self.COVERAGE_FILENAME
+        tmp_path = coverage_path.with_suffix(".tmp")
+        with tmp_path.open(mode="w") as f:
+            json.dump({"files": coverage}, f, indent=3)
+        tmp_path.replace(coverage_path)
+
+    def missing(
+        self,
+        dataset: str,
+        schema: str,
+        symbol: str,
+        start: int,
+        end: int,
+    ) -> list[tuple[int, int]]:
+        """Sub-ranges of [start, end) not covered by cached files."""
+        coverage = self._load_coverage(self._key_directory(dataset, schema, symbol))
+        return self._missing(coverage, start, end)
+
+    @staticmethod
+    def _missing(
+        coverage: list[dict[str, Any]],
+        start: int,
+        end: int,
+    ) -> list[tuple[int, int]]:
+        covered = portion.empty()
+        for c in coverage:
+            covered |= portion.closedopen(c["start"], c["covered_end"])
+
+        missing = portion.closedopen(start, end) - covered
+        return [(i.lower, i.upper) for i in missing if not i.empty]
+
+    def fetch_missing(  # noqa: PLR0913
+        self,
+        dataset: str,
+        schema: str,
+        symbol: str,
+        start: int,
+        end: int,
+        fetch: Callable[[int, int, Path], DBNStore],
+        limit: int | None = None,
+    ) -> list[Path]:
+        """
+        Stream every missing sub-range of [start, end) to its own file and return
+        the new files.
+        """
+        directory = self._key_directory(dataset, schema, symbol)
+        directory.mkdir(parents=True, exist_ok=True)
+        coverage = self._load_coverage(directory)
+
+        paths = []
+        for gap_start, gap_end in self._missing(coverage, start, end):
+            path = directory / f"{gap_start}_{gap_end}.dbn"
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.unlink(missing_ok=True)
+            data = fetch(gap_start, gap_end, tmp_path)
+            tmp_path.replace(path)
+
+            # A response cut by the limit only covers the range up to its last
+            # record, that record included: up to the next bar of a bar schema,
+            # where the last bar is the only record of its interval
+            covered_end = gap_end
+            count, _, last_ts = summarize_records(data)
+            if limit and count >= limit:
+                covered_end = min(last_ts + SCHEMA_INTERVALS.get(schema, 1), gap_end)
+            if covered_end <= gap_start:
+                path.unlink()
+                err = (
+                    f"The response for [{gap_start}, {gap_end}) has no records past "
+                    f"its start, the range cannot be cached"
+                )
+                raise ValueError(err)
+
+            coverage = [c for c in coverage if c["file"] != path.name]
+            coverage.append(
+                {
+                    "file": path.name,
+                    "start": gap_start,
+                    "end": gap_end,
+                    "covered_end": covered_end,
+                }
+            )
+            self._save_coverage(directory, coverage)
+            if self.catalog is not None:
+                self.catalog.add(path)
+            paths.append(path)
+
+        if self.catalog is not None:
+            self.catalog.save()
+
+        return paths
+
+    def get_range(  # noqa: PLR0913
+        self,
+        dataset: str,
+        schema: str,
+        symbol: str,
+        start: int,
+        end: int,
+        fetch: Callable[[int, int, Path], DBNStore],
+        limit: int | None = None,
+    ) -> DBNStore:
+        self.fetch_missing(dataset, schema, symbol, start, end, fetch, limit)
+
+        directory = self._key_directory(dataset, schema, symbol)
+        stores = [
+            DBNStore.from_file(directory / c["file"])
+            for c in sorted(self._load_coverage(directory), key=lambda c: c["start"])
+            if c["start"] < end and c["end"] > start
+        ]
+        return merge_dbn_stores(stores, start, end, limit)
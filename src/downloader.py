@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Any
+
+import databento
+import requests
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from src.databento_client import DatabentoClient
+
+PARTITION_FREQUENCIES = ("day", "week")
+
+
+@dataclass(frozen=True)
+class Partition:
+    start_date: date
+    end_date: date
+
+    @property
+    def key(self) -> str:
+        return f"{self.start_date.isoformat()}_{self.end_date.isoformat()}"
+
+    @property
+    def filename(self) -> str:
+        return f"{self.key}.dbn"
+
+
+def split_date_range(start_date: str, end_date: str, frequency: str) -> list[Partition]:
+    """
+    Split [start_date, end_date) into day partitions, or into week partitions
+    aligned to Mondays so that partition keys stay stable across runs.
+    """
+    if frequency not in PARTITION_FREQUENCIES:
+        err = f"Invalid partition frequency: {frequency}"
+        raise ValueError(err)
+
+    start = date.fromisoformat(start_date)
+    end = date.fromisoformat(end_date)
+    if start >= end:
+        err = f"start_date must be before end_date: {start_date} >= {end_date}"
+        raise ValueError(err)
+
+    partitions = []
+    current = start
+    while current < end:
+        if frequency == "day":
+            boundary = current + timedelta(days=1)
+        else:
+            boundary = current + timedelta(days=7 - current.weekday())
+        partitions.append(Partition(current, min(boundary, end)))
+        current = boundary
+    return partitions
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, databento.BentoClientError):
+        return False
+    return isinstance(error, databento.BentoError | requests.RequestException)
+
+
+class PartitionManifest:
+    FILENAME = "manifest.json"
+
+    def __init__(self, directory: Path):
+        self.path = directory / self.FILENAME
+        self.partitions: dict[str, dict[str, Any]] = {}
+        if self.path.exists():
+            with self.path.open() as f:
+                self.partitions = json.load(f)["partitions"]
+
+    def is_done(self, partition: Partition, limit: int | None = None) -> bool:
+        """
+        Return whether `partition` was downloaded with at least `limit` records, a
+        partition downloaded with a lower limit may be missing records.
+        """
+        entry = self.partitions.get(partition.key)
+        if entry is None or not (self.path.parent / entry["file"]).exists():
+            return False
+        # Entries written before the limit was recorded count as limited
+        done_limit = entry.get("limit", 0)
+        return done_limit is None or (limit is not None and done_limit >= limit)
+
+    def mark_done(self, partition: Partition, limit: int | None = None) -> None:
+        self.partitions[partition.key] = {
+            "start_date": partition.start_date.isoformat(),
+            "end_date": partition.end_date.isoformat(),
+            "file": partition.filename,
+            "limit": limit,
+        }
+        self.save()
+
+    def save(self) -> None:
+        tmp_path = self.path.with_suffix(".tmp")
+        with tmp_path.open(mode="w") as f:
+            json.dump({"partitions": self.partitions}, f, indent=3, sort_keys=True)
+        tmp_path.replace(self.path)
+
+
+class PartitionedDownloader:
+    """
+    Download a date range as independent partitions on a bounded thread pool.
+
+    Every finished partition is written to its own `.dbn` file and recorded in the
+    manifest, so an interrupted download resumes from the missing partitions.
+    """
+
+    def __init__(
+        self,
+        client: DatabentoClient,
+        directory: Path,
+        max_workers: int = 4,
+        retries: int = 3,
+        backoff: float = 1.0,
+    ):
+        self.client = client
+        self.directory = directory
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+
+    def download(
+        self,
+        start_date: str,
+        end_date: str,
+        frequency: str = "day",
+        limit: int | None = None,
+        on_partition: Callable[[Partition, Path], None] | None = None,
+    ) -> list[Path]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        manifest = PartitionManifest(self.directory)
+        pending = [
+            partition
+            for partition in split_date_range(start_date, end_date, frequency)
+            if not manifest.is_done(partition, limit)
+        ]
+
+        written = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._download_partition, partition, limit): partition
+                for partition in pending
+            }
+            try:
+                for future in as_completed(futures):
+                    partition = futures[future]
+                    path = future.result()
+                    manifest.mark_done(partition, limit)
+                    written.append(path)
+                    if on_partition is not None:
+                        on_partition(partition, path)
+            except BaseException:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+
+        return sorted(written)
+
+    def _download_partition(
+        self,
+        partition: Partition,
+        limit: int | None,
+    ) -> Path:
+        path = self.directory / partition.filename
+        tmp_path = path.with_suffix(".tmp")
+
+        def request() -> None:
+            tmp_path.unlink(missing_ok=True)
+            self.client.get_range(
+                start_date=partition.start_date.isoformat(),
+                end_date=partition.end_date.isoformat(),
+                limit=limit,
+                path=tmp_path,
+            )
+
+        self._with_retries(request)
+        tmp_path.replace(path)
+        return path
+
+    def _with_retries(self, func: Callable[[], Any]) -> Any:  # noqa: ANN401
+        for attempt in range(self.retries + 1):
+            try:
+                return func()
+            except Exception as e:  # noqa: PERF203
+                if attempt == self.retries or not is_retryable(e):
+                    raise
+                time.sleep(self.backoff * 2**attempt)
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from nautilus_trader.model import Bar
+
+INDICATOR_KINDS = ("sma", "ema")
+
+
+def bar_closes(bars: list[Bar]) -> np.ndarray:
+    """Read the closes of `bars` as the indicators of Nautilus do."""
+    return np.fromiter(
+        (bar.close.as_double() for bar in bars), dtype=np.float64, count=len(bars)
+    )
+
+
+def sma(closes: np.ndarray, period: int) -> np.ndarray:
+    """
+    Compute the simple moving average of each close, equal to the value of the
+    Nautilus `SimpleMovingAverage` after that close: the closes of the window are
+    summed from the oldest, and divided by the number of closes seen while warming up.
+    """
+    padded = np.concatenate((np.zeros(period - 1), closes))
+    windows = np.lib.stride_tricks.sliding_window_view(padded, period)
+    # Summing column by column keeps the order of the additions of the indicator.
+    # That is `period` vectorised passes, about 0.15s for a million closes and a
+    # period of 200, where a cumulative sum would round differently and could flip
+    # a crossover
+    totals = np.zeros(len(closes))
+    for column in range(period):
+        totals += windows[:, column]
+    return totals / np.minimum(np.arange(1, len(closes) + 1), period)
+
+
+def ema(closes: np.ndarray, period: int) -> np.ndarray:
+    """
+    Compute the exponential moving average of each close, equal to the value of the
+    Nautilus `ExponentialMovingAverage` after that close.
+    """
+    alpha = 2.0 / (period + 1.0)
+    decay = 1.0 - alpha
+    values = np.empty(len(closes))
+    # A recursion, which numpy cannot vectorize without changing the rounding
+    value = closes[0] if len(closes) else 0.0
+    for i, close in enumerate(closes.tolist()):
+        value = alpha * close + decay * value
+        values[i] = value
+    return values
+
+
+AVERAGES = {"sma": sma, "ema": ema}
+
+
+def closes_hash(closes: np.ndarray) -> str:
+    return hashlib.sha256(np.ascontiguousarray(closes, dtype=np.float64)).hexdigest()
+
+
+def series_path(directory: Path, data_hash: str, kind: str, period: int) -> Path:
+    return directory / f"{data_hash}_{kind}_{period}.npy"
+
+
+def load_series(directory: str, data_hash: str, kind: str, period: int) -> np.ndarray:
+    """Series of an `IndicatorCache`, memory-mapped."""
+    return np.load(series_path(Path(directory), data_hash, kind, period), mmap_mode="r")
+
+
+class IndicatorCache:
+    """
+    Disk cache of the moving averages of the closes of a bar series, one `.npy` file
+    per (closes hash, kind, period), read back memory-mapped.
+
+    Each series is computed once and shared by every backtest of the same bars,
+    in any process. Using an entry refreshes its modification time, and the least
+    recently used entries are evicted once the cache is larger than `max_bytes`.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def has_series(self, data_hash: str, kind: str, periods: list[int]) -> bool:
+        """Whether the series of every period of `periods` is cached."""
+        return all(
+            series_path(self.directory, data_hash, kind, period).exists()
+            for period in periods
+        )
+
+    def precompute(
+        self,
+        closes: np.ndarray,
+        kind: str,
+        periods: list[int],
+        data_hash: str | None = None,
+    ) -> str:
+        """
+        Compute the series of `periods` not cached yet, return the closes hash.
+        `data_hash` is the hash of `closes` when the caller knows it already.
+        """
+        if data_hash is None:
+            data_hash = closes_hash(closes)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        paths = set()
+        for period in sorted(set(periods)):
+            path = series_path(self.directory, data_hash, kind, period)
+            paths.add(path)
+            if path.exists():
+                os.utime(path)
+                continue
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            with tmp_path.open(mode="wb") as f:
+                np.save(f, AVERAGES[kind](closes, period))
+            tmp_path.replace(path)
+        self.evict(keep=paths)
+        return data_hash
+
+    def evict(self, keep: set[Path] | None = None) -> None:
+        """
+        Delete the least recently used entries until the cache fits `max_bytes`,
+        except the entries of `keep`.
+        """
+        entries = sorted(
+            (p.stat().st_mtime_ns, p.stat().st_size, p)
+            for p in self.directory.glob("*.npy")
+        )
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if keep is not None and path in keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from nautilus_trader.core.nautilus_pyo3 import DataBackendSession
+from nautilus_trader.model import Bar
+from nautilus_trader.model.data import capsule_to_list
+from nautilus_trader.persistence.catalog import ParquetDataCatalog
+
+from src.bars import STREAM_CHUNK_SIZE
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from nautilus_trader.model import BarType
+
+    from src.catalog import CatalogEntry
+
+
+class ParquetBarStore:
+    """
+    Bars decoded once from the `.dbn` files into a Nautilus `ParquetDataCatalog`.
+
+    Reads push the time range down to the Parquet scan, so a backtest only decodes
+    the row groups of its range. `converted.json` records the `.dbn` files already
+    written, which makes conversions incremental.
+    """
+
+    CONVERTED_FILENAME = "converted.json"
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.catalog = ParquetDataCatalog(str(path))
+
+    def _load_converted(self) -> dict[str, dict[str, Any]]:
+        converted_path = self.path / self.CONVERTED_FILENAME
+        if not converted_path.exists():
+            return {}
+
+        with converted_path.open() as f:
+            return json.load(f)["files"]
+
+    @staticmethod
+    def _is_current(converted: dict[str, dict[str, Any]], entry: CatalogEntry) -> bool:
+        return converted.get(entry.path) == {
+            "size": entry.size,
+            "mtime_ns": entry.mtime_ns,
+        }
+
+    def is_converted(self, entry: CatalogEntry) -> bool:
+        return self._is_current(self._load_converted(), entry)
+
+    def is_changed(self, entry: CatalogEntry) -> bool:
+        """Whether `entry` was converted before and has changed since."""
+        converted = self._load_converted()
+        return entry.path in converted and not self._is_current(converted, entry)
+
+    def pending(self, entries: list[CatalogEntry]) -> list[CatalogEntry]:
+        """Entries of `entries` not converted yet, or changed since."""
+        converted = self._load_converted()
+        return [entry for entry in entries if not self._is_current(converted, entry)]
+
+    def mark_converted(self, entry: CatalogEntry) -> None:
+        converted = self._load_converted()
+        converted[entry.path] = {"size": entry.size, "mtime_ns": entry.mtime_ns}
+
+        converted_path = self.path / self.CONVERTED_FILENAME
+        tmp_path = converted_path.with_suffix(".tmp")
+        with tmp_path.open(mode="w") as f:
+            json.dump({"files": converted}, f, indent=3, sort_keys=True)
+        tmp_path.replace(converted_path)
+
+    def intervals(self, bar_type: BarType) -> list[tuple[int, int]]:
+        return sorted(self.catalog.get_intervals(Bar, str(bar_type)))
+
+    def write(self, bars: list[Bar], replace: bool = False) -> int:  # noqa: FBT001, FBT002
+        """
+        Write the bars that are not stored yet and return how many were written.
+
+        The catalog requires disjoint files, so bars inside stored intervals are
+        dropped and the rest is written as one file per gap between intervals.
+        With `replace`, the stored bars from the first to the last of `bars` are
+        deleted first, so the bars of a changed file replace those written from it
+        before.
+        """
+        if not bars:
+            return 0
+
+        if replace:
+            self.catalog.delete_data_range(
+                Bar, str(bars[0].bar_type), bars[0].ts_init, bars[-1].ts_init
+            )
+        intervals = self.intervals(bars[0].bar_type)
+        ts = np.fromiter((bar.ts_init for bar in bars), dtype=np.uint64, count=len(bars))
+        starts = np.array([i[0] for i in intervals], dtype=np.uint64)
+        ends = np.array([i[1] for i in intervals], dtype=np.uint64)
+
+        # Index of the last interval starting at or before each bar
+        gap = np.searchsorted(starts, ts, side="right")
+        stored = np.zeros(len(bars), dtype=bool)
+        has_interval = gap > 0
+        stored[has_interval] = ts[has_interval] <= ends[gap[has_interval] - 1]
+
+        written = 0
+        for gap_index in np.unique(gap[~stored]):
+            indexes = np.flatnonzero((gap == gap_index) & ~stored)
+            self.catalog.write_data([bars[i] for i in indexes])
+            written += len(indexes)
+        return written
+
+    def bars(
+        self,
+        bar_type: BarType,
+        start: int | None = None,
+        end: int | None = None,
+    ) -> list[Bar]:
+        """Bars opening in [start, end), timestamps in UNIX nanoseconds."""
+        # Bars are timestamped on close, so a bar opening in [start, end) closes in
+        # (start, end]
+        return self.catalog.bars(
+            bar_types=[str(bar_type)],
+            start=start + 1 if start is not None else None,
+            end=end,
+        )
+
+    def stream(
+        self,
+        bar_type: BarType,
+        start: int | None = None,
+        end: int | None = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> Iterator[list[Bar]]:
+        """
+        Stream the bars `bars` returns, in time-ordered lists of at most `chunk_size`
+        bars decoded as they are consumed.
+        """
+        session = self.catalog.backend_session(
+            data_cls=Bar,
+            identifiers=[str(bar_type)],
+            start=start + 1 if start is not None else None,
+            end=end,
+            session=DataBackendSession(chunk_size=chunk_size),
+        )
+        for chunk in session.to_query_result():
+            yield capsule_to_list(chunk)
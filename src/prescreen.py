@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import os
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from src.backtest import STRATEGIES
+from src.indicators import ema
+from src.shared_bars import bars_to_records
+
+if TYPE_CHECKING:
+    from nautilus_trader.model import Bar
+
+
+def _averages(
+    kind: str, closes: np.ndarray, period: int, indexes: np.ndarray
+) -> np.ndarray:
+    """Average of the `period` closes up to each bar of `indexes`."""
+    if kind == "sma":
+        sums = np.concatenate(([0.0], np.cumsum(closes)))
+        # Past the start, where the strategy is still warming up anyway
+        starts = np.maximum(indexes + 1 - period, 0)
+        return (sums[indexes + 1] - sums[starts]) / period
+    return ema(closes, period)[indexes]
+
+
+def _prescreen_slow_periods(  # noqa: PLR0913
+    kind: str,
+    closes: np.ndarray,
+    single_price: np.ndarray,
+    fast_periods: list[int],
+    slow_periods: list[int],
+    trade_size: float,
+) -> dict[tuple[int, int], dict[str, Any]]:
+    # Bars where the position can change, the rest only carry it
+    indexes = np.flatnonzero(~single_price)
+    fast_averages = np.stack(
+        [_averages(kind, closes, fast, indexes) for fast in fast_periods]
+    )
+
+    results = {}
+    for slow in slow_periods:
+        # The fast periods below `slow` are the first rows of `fast_averages`
+        rows = bisect_left(fast_periods, slow)
+        start = np.searchsorted(indexes, slow - 1)
+        slow_indexes = indexes[start:]
+        if not rows or not len(slow_indexes):
+            continue
+
+        signals = fast_averages[:rows, start:] >= _averages(
+            kind, closes, slow, slow_indexes
+        )
+
+        # Each position is held until the next bar where it can change, the last one
+        # until the last close
+        moves = np.diff(closes[np.append(slow_indexes, len(closes) - 1)])
+        pnl = trade_size * (2.0 * (signals @ moves) - moves.sum())
+        trades = 1 + np.count_nonzero(signals[:, 1:] != signals[:, :-1], axis=1)
+
+        # Equity in units of `trade_size`, in float32 to halve the memory traffic
+        moves = moves.astype(np.float32)
+        equity = np.multiply(signals, 2.0 * moves, dtype=np.float32)
+        np.subtract(equity, moves, out=equity)
+        np.cumsum(equity, axis=1, out=equity)
+        peaks = np.maximum.accumulate(equity, axis=1)
+        np.maximum(peaks, 0.0, out=peaks)
+        drawdown = trade_size * np.subtract(peaks, equity, out=peaks).max(axis=1)
+
+        for row in range(rows):
+            results[fast_periods[row], slow] = {
+                "approx_pnl": float(pnl[row]),
+                "max_drawdown": float(drawdown[row]),
+                "trades": int(trades[row]),
+            }
+    return results
+
+
+def prescreen(  # noqa: PLR0913
+    kind: str,
+    closes: np.ndarray,
+    single_price: np.ndarray,
+    grid: list[tuple[int, int]],
+    trade_size: float = 100.0,
+    max_workers: int | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Approximate PnL, max drawdown and trade count of a crossover strategy for every
+    (fast, slow) combination of the grid.
+
+    It mirrors `MACross`/`EMACross`: once the slow average is warm (`slow` bars), a
+    bar that is not single price sets the position to `trade_size` long when the
+    fast average is at or above the slow one, short otherwise, filled at the close.
+    Open positions are marked at the last close, and the drawdown is sampled on the
+    bars where the position can change.
+
+    Each slow period is computed for all its fast periods at once, and the slow
+    periods are split across a process pool.
+    """
+    fast_periods = sorted({fast for fast, _ in grid})
+    slow_periods = sorted({slow for _, slow in grid})
+    max_workers = min(max_workers or os.cpu_count() or 1, len(slow_periods))
+
+    # Interleaved, so that every chunk gets a share of the longer slow periods
+    chunks = [slow_periods[i::max_workers] for i in range(max_workers)]
+    args = (kind, closes, single_price, fast_periods)
+    results = {}
+    if max_workers == 1:
+        results = _prescreen_slow_periods(*args, slow_periods, trade_size)
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_prescreen_slow_periods, *args, chunk, trade_size)
+                for chunk in chunks
+            ]
+            for future in futures:
+                results.update(future.result())
+
+    empty = {"approx_pnl": 0.0, "max_drawdown": 0.0, "trades": 0}
+    return [
+        {"fast_period": fast, "slow_period": slow, **results.get((fast, slow), empty)}
+        for fast, slow in grid
+    ]
+
+
+def prescreen_bars(
+    strategy_name: str,
+    bars: list[Bar],
+    grid: list[tuple[int, int]],
+    max_workers: int | None = None,
+) -> list[dict[str, Any]]:
+    records = bars_to_records(bars)
+    single_price = (
+        (records["open"] == records["high"])
+        & (records["high"] == records["low"])
+        & (records["low"] == records["close"])
+    )
+    return prescreen(
+        STRATEGIES[strategy_name].average_kind,
+        records["close"],
+        single_price,
+        grid,
+        max_workers=max_workers,
+    )
+
+
+def top_combinations(rows: list[dict[str, Any]], k: int) -> list[tuple[int, int]]:
+    """Pick the `k` combinations with the highest approximate PnL."""
+    ranked = sorted(rows, key=lambda row: row["approx_pnl"], reverse=True)
+    return [(row["fast_period"], row["slow_period"]) for row in ranked[:k]]
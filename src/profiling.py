@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import cProfile
+import resource
+import time
+from contextlib import contextmanager, nullcontext
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from contextlib import AbstractContextManager
+    from pathlib import Path
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of the process so far, in MiB."""
+    # KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Profiler:
+    """
+    Wall time, CPU time and peak RSS of the named phases of a run.
+
+    The peak RSS of a phase is the peak of the process at its end, so it only grows
+    from one phase to the next. With a `cprofile_dir`, each phase is also profiled
+    with cProfile and dumped to `<phase>.prof` there. A phase run more than once
+    adds up its times and its profiles.
+    """
+
+    def __init__(self, cprofile_dir: Path | None = None):
+        self.cprofile_dir = cprofile_dir
+        self.phases: dict[str, dict[str, Any]] = {}
+        self._profiles: dict[str, cProfile.Profile] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        profile = None
+        if self.cprofile_dir is not None:
+            profile = self._profiles.setdefault(name, cProfile.Profile())
+            profile.enable()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            stats = self.phases.setdefault(name, {"wall_s": 0.0, "cpu_s": 0.0})
+            stats["wall_s"] += wall
+            stats["cpu_s"] += cpu
+            stats["peak_rss_mb"] = peak_rss_mb()
+            if profile is not None:
+                profile.disable()
+                self.cprofile_dir.mkdir(parents=True, exist_ok=True)
+                path = self.cprofile_dir / f"{name}.prof"
+                profile.dump_stats(path)
+                stats["cprofile"] = str(path)
+
+
+def phase(profiler: Profiler | None, name: str) -> AbstractContextManager[None]:
+    """Phase `name` of `profiler`, or a context doing nothing without one."""
+    return nullcontext() if profiler is None else profiler.phase(name)
+
+
+def profile_table(phases: dict[str, dict[str, Any]]) -> str:
+    """Phases of a profile, one row per phase."""
+    rows = [
+        f"{name:<14}{stats['wall_s']:>9.3f}{stats['cpu_s']:>9.3f}"
+        f"{stats['peak_rss_mb']:>14.1f}"
+        for name, stats in phases.items()
+    ]
+    return "\n".join(
+        [f"{'phase':<14}{'wall_s':>9}{'cpu_s':>9}{'peak_rss_mb':>14}", *rows]
+    )
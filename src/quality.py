@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+SCHEMA_INTERVALS = {
+    "ohlcv-1s": 1_000_000_000,
+    "ohlcv-1m": 60_000_000_000,
+    "ohlcv-1h": 3_600_000_000_000,
+    "ohlcv-1d": 86_400_000_000_000,
+}
+
+# Gaps of an hour or more are session breaks (daily maintenance, weekends and
+# holidays), not missing bars
+SESSION_BREAK = 3_600_000_000_000
+
+# Close to close move, relative to the previous close
+SPIKE_THRESHOLD = 0.01
+
+
+@dataclass(frozen=True)
+class QualityReport:
+    count: int
+    missing: int
+    session_breaks: int
+    duplicates: int
+    out_of_order: int
+    single_price: int
+    spikes: int
+
+
+def scan_records(
+    records: np.ndarray,
+    interval: int,
+    session_break: int = SESSION_BREAK,
+    spike_threshold: float = SPIKE_THRESHOLD,
+) -> QualityReport:
+    """
+    Measure the data quality of OHLCV records in one vectorised pass over their
+    columns.
+
+    Missing bars are the intervals skipped inside gaps shorter than a session
+    break. Spikes are close to close moves larger than `spike_threshold`, measured
+    in time order.
+    """
+    ts_event = records["ts_event"].astype(np.int64)
+    out_of_order = int(np.count_nonzero(ts_event[1:] < ts_event[:-1]))
+
+    order = np.argsort(ts_event, kind="stable")
+    ts_sorted = ts_event[order]
+    steps = np.diff(ts_sorted)
+    duplicates = int(np.count_nonzero(steps == 0))
+
+    gaps = steps[steps > interval]
+    session_breaks = gaps >= session_break
+    missing = int((gaps[~session_breaks] // interval - 1).sum())
+
+    single_price = int(
+        np.count_nonzero(
+            (records["open"] == records["high"])
+            & (records["high"] == records["low"])
+            & (records["low"] == records["close"])
+        )
+    )
+
+    close = records["close"][order].astype(np.float64)
+    moves = np.abs(np.diff(close)) / close[:-1]
+    spikes = int(np.count_nonzero(moves > spike_threshold))
+
+    return QualityReport(
+        count=len(records),
+        missing=missing,
+        session_breaks=int(np.count_nonzero(session_breaks)),
+        duplicates=duplicates,
+        out_of_order=out_of_order,
+        single_price=single_price,
+        spikes=spikes,
+    )
+
+
+def scan_file(path: Path) -> QualityReport:
+    # databento is slow to import and only needed to scan
+    from databento.common.dbnstore import DBNStore  # noqa: PLC0415
+
+    store = DBNStore.from_file(path)
+    interval = SCHEMA_INTERVALS[str(store.metadata.schema)]
+    return scan_records(store.to_ndarray(), interval)
+
+
+def scan_files(paths: list[Path], max_workers: int | None = None) -> list[QualityReport]:
+    """Scan the files on a process pool, reports in the order of `paths`."""
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(scan_file, paths))
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import TYPE_CHECKING
+
+import numpy as np
+from databento.common.dbnstore import DBNStore
+from nautilus_trader.model import BarType
+
+from src.bars import (
+    DBN_PRICE_PRECISION,
+    DBN_PRICE_SCALE,
+    DBN_SIZE_PRECISION,
+    STREAM_CHUNK_SIZE,
+)
+from src.quality import SCHEMA_INTERVALS
+from src.shared_bars import BAR_DTYPE, records_to_bars
+from src.summary import load_summary
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from nautilus_trader.model import Bar, InstrumentId
+
+    from src.catalog import CatalogEntry, PriceDataCatalog
+
+# Schema of the bars the timeframes are resampled from
+SOURCE_SCHEMA = "ohlcv-1m"
+
+# Interval and bar spec of each timeframe. Buckets are aligned on UTC midnight,
+# like the Databento daily bars
+TIMEFRAME_INTERVALS = {
+    "5m": 5 * 60_000_000_000,
+    "15m": 15 * 60_000_000_000,
+    "1h": 60 * 60_000_000_000,
+    "1d": 24 * 60 * 60_000_000_000,
+}
+TIMEFRAME_SPECS = {
+    "5m": "5-MINUTE-LAST",
+    "15m": "15-MINUTE-LAST",
+    "1h": "1-HOUR-LAST",
+    "1d": "1-DAY-LAST",
+}
+
+# Bumped whenever the resampling or the stored record layout changes
+RESAMPLE_VERSION = 1
+
+
+def timeframe_bar_type(instrument_id: InstrumentId, timeframe: str) -> BarType:
+    """Bar type of the resampled bars of a timeframe, aggregated outside the engine."""
+    return BarType.from_str(f"{instrument_id}-{TIMEFRAME_SPECS[timeframe]}-EXTERNAL")
+
+
+def read_source_records(
+    catalog: PriceDataCatalog, entries: list[CatalogEntry]
+) -> np.ndarray:
+    """
+    Decode the 1-minute bars of the entries into `BAR_DTYPE` records timestamped on
+    close, without creating `Bar` objects. Duplicates of overlapping downloads are
+    dropped, the first entry winning like in `load_bars`.
+    """
+    interval = SCHEMA_INTERVALS[SOURCE_SCHEMA]
+    chunks = []
+    for entry in entries:
+        dbn_records = DBNStore.from_file(catalog.path(entry)).to_ndarray()
+        records = np.empty(len(dbn_records), dtype=BAR_DTYPE)
+        records["ts_event"] = dbn_records["ts_event"] + interval
+        records["ts_init"] = records["ts_event"]
+        for column in ("open", "high", "low", "close"):
+            records[column] = dbn_records[column] / DBN_PRICE_SCALE
+        records["volume"] = dbn_records["volume"]
+        chunks.append(records)
+    if not chunks:
+        return np.empty(0, dtype=BAR_DTYPE)
+
+    records = np.concatenate(chunks)
+    # Sorted unique timestamps, each from its first occurrence
+    _, first = np.unique(records["ts_event"], return_index=True)
+    return records[first]
+
+
+def resample_records(
+    records: np.ndarray, source_interval: int, interval: int
+) -> np.ndarray:
+    """
+    Aggregate bars timestamped on close into bars of `interval`: the open of the
+    first bar, the highest high, the lowest low, the close of the last bar and the
+    total volume of each bucket, timestamped on the close of the bucket.
+    """
+    if not len(records):
+        return np.empty(0, dtype=BAR_DTYPE)
+
+    buckets = (records["ts_event"] - source_interval) // interval
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+    ends = np.append(starts[1:], len(records))
+
+    resampled = np.empty(len(starts), dtype=BAR_DTYPE)
+    resampled["ts_event"] = (buckets[starts] + 1) * interval
+    resampled["ts_init"] = resampled["ts_event"]
+    resampled["open"] = records["open"][starts]
+    resampled["high"] = np.maximum.reduceat(records["high"], starts)
+    resampled["low"] = np.minimum.reduceat(records["low"], starts)
+    resampled["close"] = records["close"][ends - 1]
+    resampled["volume"] = np.add.reduceat(records["volume"], starts)
+    return resampled
+
+
+class ResampledBarStore:
+    """
+    Bars of the 5m/15m/1h/1d timeframes resampled from the 1-minute `.dbn` files,
+    one `.npy` file of columnar records per (instrument, timeframe) covering the
+    whole catalog.
+
+    The `.json` file next to it records a hash of the source files, so a new,
+    changed or removed file invalidates the stored bars, which are resampled again
+    on their next read.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    def _paths(self, instrument_id: InstrumentId, timeframe: str) -> tuple[Path, Path]:
+        name = f"{instrument_id}_{timeframe}"
+        return self.directory / f"{name}.npy", self.directory / f"{name}.json"
+
+    @staticmethod
+    def source_hash(catalog: PriceDataCatalog, entries: list[CatalogEntry]) -> str:
+        files = sorted(load_summary(catalog.path(entry))["sha256"] for entry in entries)
+        return hashlib.sha256(
+            json.dumps({"files": files, "version": RESAMPLE_VERSION}).encode()
+        ).hexdigest()
+
+    def is_current(
+        self,
+        catalog: PriceDataCatalog,
+        entries: list[CatalogEntry],
+        instrument_id: InstrumentId,
+        timeframe: str,
+    ) -> bool:
+        records_path, meta_path = self._paths(instrument_id, timeframe)
+        try:
+            with meta_path.open() as f:
+                meta = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return False
+        return records_path.exists() and meta["sources"] == self.source_hash(
+            catalog, entries
+        )
+
+    def build(
+        self,
+        catalog: PriceDataCatalog,
+        entries: list[CatalogEntry],
+        instrument_id: InstrumentId,
+        timeframes: list[str],
+    ) -> dict[str, int]:
+        """
+        Resample the 1-minute bars of `entries` into each timeframe, decoding them
+        once, and return the number of bars of each.
+        """
+        if any(entry.schema != SOURCE_SCHEMA for entry in entries):
+            err = f"Bars can only be resampled from {SOURCE_SCHEMA} data"
+            raise ValueError(err)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        sources = self.source_hash(catalog, entries)
+        records = read_source_records(catalog, entries)
+        counts = {}
+        for timeframe in timeframes:
+            resampled = resample_records(
+                records,
+                SCHEMA_INTERVALS[SOURCE_SCHEMA],
+                TIMEFRAME_INTERVALS[timeframe],
+            )
+            records_path, meta_path = self._paths(instrument_id, timeframe)
+            tmp_path = records_path.with_suffix(f".{os.getpid()}.tmp")
+            with tmp_path.open(mode="wb") as f:
+                np.save(f, resampled)
+            tmp_path.replace(records_path)
+
+            tmp_path = meta_path.with_suffix(f".{os.getpid()}.tmp")
+            with tmp_path.open(mode="w") as f:
+                json.dump(
+                    {
+                        "bar_type": str(timeframe_bar_type(instrument_id, timeframe)),
+                        "sources": sources,
+                    },
+                    f,
+                    indent=3,
+                )
+            tmp_path.replace(meta_path)
+            counts[timeframe] = len(resampled)
+        return counts
+
+    def records(
+        self,
+        catalog: PriceDataCatalog,
+        entries: list[CatalogEntry],
+        instrument_id: InstrumentId,
+        timeframe: str,
+    ) -> np.ndarray:
+        """Read the records of a timeframe, resampling them first when stale."""
+        if not self.is_current(catalog, entries, instrument_id, timeframe):
+            self.build(catalog, entries, instrument_id, [timeframe])
+        records_path, _ = self._paths(instrument_id, timeframe)
+        return np.load(records_path, mmap_mode="r")
+
+    def _range(  # noqa: PLR0913
+        self,
+        catalog: PriceDataCatalog,
+        entries: list[CatalogEntry],
+        instrument_id: InstrumentId,
+        timeframe: str,
+        start: int | None,
+        end: int | None,
+    ) -> np.ndarray:
+        records = self.records(catalog, entries, instrument_id, timeframe)
+        # Bars are timestamped on close, so a bar opening in [start, end) closes in
+        # (start, end]
+        ts = records["ts_event"]
+        first = 0 if start is None else np.searchsorted(ts, start, side="right")
+        last = len(ts) if end is None else np.searchsorted(ts, end, side="right")
+        return records[first:last]
+
+    def bars(  # noqa: PLR0913
+        self,
+        catalog: PriceDataCatalog,
+        entries: list[CatalogEntry],
+        instrument_id: InstrumentId,
+        timeframe: str,
+        start: int | None = None,
+        end: int | None = None,
+    ) -> list[Bar]:
+        """Bars of a timeframe opening in [start, end), timestamped on close."""
+        return records_to_bars(
+            self._range(catalog, entries, instrument_id, timeframe, start, end),
+            str(timeframe_bar_type(instrument_id, timeframe)),
+            DBN_PRICE_PRECISION,
+            DBN_SIZE_PRECISION,
+        )
+
+    def stream(  # noqa: PLR0913
+        self,
+        catalog: PriceDataCatalog,
+        entries: list[CatalogEntry],
+        instrument_id: InstrumentId,
+        timeframe: str,
+        start: int | None = None,
+        end: int | None = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> Iterator[list[Bar]]:
+        """Stream the bars `bars` returns, in lists of at most `chunk_size` bars."""
+        records = self._range(catalog, entries, instrument_id, timeframe, start, end)
+        bar_type = str(timeframe_bar_type(instrument_id, timeframe))
+        for i in range(0, len(records), chunk_size):
+            yield records_to_bars(
+                records[i : i + chunk_size],
+                bar_type,
+                DBN_PRICE_PRECISION,
+                DBN_SIZE_PRECISION,
+            )
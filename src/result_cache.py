@@ -0,0 +1,372 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import closing, contextmanager
+from dataclasses import fields
+from typing import TYPE_CHECKING, Any
+
+from src.utils import replace_nan_to_none
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from pathlib import Path
+
+    from nautilus_trader.backtest.results import BacktestResult
+
+# When the PDF report of a new result is rendered: right away, later by
+# `bt report`, or not at all
+REPORT_INLINE = "inline"
+REPORT_DEFERRED = "deferred"
+REPORT_NONE = "none"
+REPORT_MODES = (REPORT_NONE, REPORT_DEFERRED, REPORT_INLINE)
+
+# Inputs of a run stored next to its result, as `result_params` of `src.backtest`
+# returns them
+PARAM_COLUMNS = {
+    "strategy": "TEXT",
+    "fast_period": "INTEGER",
+    "slow_period": "INTEGER",
+    "trade_size": "INTEGER",
+    "instrument_id": "TEXT",
+    "bar_type": "TEXT",
+    "data_hash": "TEXT",
+}
+RESULT_COLUMNS = {
+    "backtest_start": "INTEGER",
+    "backtest_end": "INTEGER",
+    "total_orders": "INTEGER",
+    "total_positions": "INTEGER",
+}
+INDEXES = {
+    "ix_strategy_periods": ("strategy", "fast_period", "slow_period"),
+    "ix_data_hash": ("data_hash",),
+    "ix_report_pending": ("report_pending",),
+}
+
+# Names of `result_summary` for the columns of its statistics
+SORT_ALIASES = {
+    "pnl": "pnls_usd_pnl_total",
+    "pnl_pct": "pnls_usd_pnl_pct_total",
+    "win_rate": "pnls_usd_win_rate",
+    "expectancy": "pnls_usd_expectancy",
+    "sharpe": "returns_sharpe_ratio_252_days",
+    "sortino": "returns_sortino_ratio_252_days",
+    "profit_factor": "returns_profit_factor",
+    "total_orders": "total_orders",
+    "total_positions": "total_positions",
+}
+
+
+def stat_column(*names: str) -> str:
+    """
+    Column of a statistic, from its group and name: "PnL% (total)" of the USD
+    `stats_pnls` is `pnls_usd_pnl_pct_total`.
+    """
+    name = "_".join(names).lower().replace("%", " pct")
+    return re.sub(r"[^a-z0-9]+", "_", name).strip("_")
+
+
+def flatten_stats(result: BacktestResult) -> dict[str, float]:
+    """Numeric `stats_pnls` of every currency and `stats_returns`, by column."""
+    stats = {
+        stat_column("pnls", currency, name): value
+        for currency, pnls in result.stats_pnls.items()
+        for name, value in pnls.items()
+    }
+    stats.update(
+        {
+            stat_column("returns", name): value
+            for name, value in result.stats_returns.items()
+        }
+    )
+    return {
+        column: value
+        for column, value in stats.items()
+        if isinstance(value, int | float) and not isinstance(value, bool)
+    }
+
+
+class ResultCache:
+    """
+    Cache of backtest results in a SQLite database, one row per key, and the `.pdf`
+    report of each, generated the first time it is asked for. The key hashes
+    everything a result depends on (see `result_key` of `src.backtest`), so an
+    entry is never stale.
+
+    Next to the result as JSON, a row holds the inputs of the run and one indexed
+    column per statistic of `stats_pnls` and `stats_returns`, so the best runs are
+    found with `query` without reading the results.
+
+    Reports can be deferred: the row of the result is flagged `report_pending`
+    until its report is rendered, so an interrupted render leaves the flag set.
+    """
+
+    DB_FILENAME = "results.sqlite"
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    @property
+    def db_path(self) -> Path:
+        return self.directory / self.DB_FILENAME
+
+    def pdf_path(self, key: str) -> Path:
+        return self.directory / f"{key}.pdf"
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Sweep and batch workers write concurrently, each with its own connection
+        with closing(
+            sqlite3.connect(self.db_path, timeout=60, isolation_level=None)
+        ) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            columns = ", ".join(
+                f"{name} {kind}"
+                for name, kind in {**PARAM_COLUMNS, **RESULT_COLUMNS}.items()
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, "
+                f"{columns}, result TEXT NOT NULL, profile TEXT, "
+                "report_pending INTEGER NOT NULL DEFAULT 0)"
+            )
+            for index, indexed in INDEXES.items():
+                connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS {index} ON results "
+                    f"({', '.join(indexed)})"
+                )
+            yield connection
+
+    @staticmethod
+    def _columns(connection: sqlite3.Connection) -> set[str]:
+        return {row[1] for row in connection.execute("PRAGMA table_info(results)")}
+
+    def data(self, key: str) -> dict[str, Any] | None:
+        """Read the result of `key` as a dict, with the profile of its run if any."""
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT result, profile FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        data = json.loads(row[0])
+        if row[1] is not None:
+            data["profile"] = json.loads(row[1])
+        return data
+
+    def exists(self, key: str) -> bool:
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT 1 FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        return row is not None
+
+    def get(self, key: str) -> BacktestResult | None:
+        # Nautilus is slow to import and not needed to query the results
+        from nautilus_trader.backtest.results import BacktestResult  # noqa: PLC0415
+
+        try:
+            data = self.data(key)
+            return BacktestResult(
+                **{field.name: data[field.name] for field in fields(BacktestResult)}
+            )
+        except (KeyError, ValueError, TypeError):
+            return None
+
+    def put(
+        self, key: str, result: BacktestResult, params: dict[str, Any] | None = None
+    ) -> None:
+        """
+        Save a result with the inputs of its run, adding a column and its index
+        for each statistic not seen before.
+        """
+        row = {
+            **{name: (params or {}).get(name) for name in PARAM_COLUMNS},
+            **{name: getattr(result, name) for name in RESULT_COLUMNS},
+            # NaN statistics are kept as NaN in the JSON, and are NULL in the columns
+            "result": json.dumps(vars(result)),
+            "profile": None,
+            **flatten_stats(result),
+        }
+        with self._connect() as connection:
+            # Taking the write lock first, the columns cannot change meanwhile
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                for column in sorted(row.keys() - self._columns(connection)):
+                    connection.execute(f"ALTER TABLE results ADD COLUMN {column} REAL")
+                    connection.execute(
+                        f"CREATE INDEX IF NOT EXISTS ix_{column} ON results ({column})"
+                    )
+                # Column names are `stat_column` slugs, safe to put in the statement
+                connection.execute(
+                    f"INSERT OR REPLACE INTO results (key, {', '.join(row)}) "  # noqa: S608
+                    f"VALUES (?{', ?' * len(row)})",
+                    (key, *row.values()),
+                )
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        # The report of an earlier run of the same backtest
+        self.pdf_path(key).unlink(missing_ok=True)
+
+    def add_profile(self, key: str, profile: dict[str, Any]) -> None:
+        """Add the profile of the run of a result to its row."""
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE results SET profile = ? WHERE key = ?",
+                (json.dumps(profile), key),
+            )
+
+    def query(
+        self,
+        sort: str = "sharpe",
+        top: int = 20,
+        strategy: str | None = None,
+        ascending: bool = False,  # noqa: FBT001, FBT002
+    ) -> list[dict[str, Any]]:
+        """
+        Find the `top` results with the highest (or lowest) value of `sort`, a
+        column or a name of `SORT_ALIASES`, and return their inputs and headline
+        statistics. Results without a value of `sort` are left out.
+        """
+        column = SORT_ALIASES.get(sort, sort)
+        with self._connect() as connection:
+            columns = self._columns(connection)
+            # The statistics, flattened or counted by the result
+            sortable = columns - {
+                "key",
+                "result",
+                "profile",
+                "report_pending",
+                *PARAM_COLUMNS,
+            }
+            if column not in sortable:
+                if sort in SORT_ALIASES:
+                    # No result has this statistic yet
+                    return []
+                err = (
+                    f"Unknown sort column {sort}, use one of "
+                    f"{', '.join(dict.fromkeys([*SORT_ALIASES, *sorted(sortable)]))}"
+                )
+                raise ValueError(err)
+
+            selected = {
+                "key": "key",
+                **{name: name for name in PARAM_COLUMNS},
+                **{
+                    alias: alias_column
+                    for alias, alias_column in SORT_ALIASES.items()
+                    if alias_column in columns
+                },
+            }
+            if column not in selected.values():
+                selected[sort] = column
+            where = f"{column} IS NOT NULL"
+            args: list[Any] = []
+            if strategy is not None:
+                where += " AND strategy = ?"
+                args.append(strategy)
+            # `column` is a column of the table, checked above
+            cursor = connection.execute(
+                f"SELECT {', '.join(selected.values())} FROM results WHERE {where} "  # noqa: S608
+                f"ORDER BY {column} {'ASC' if ascending else 'DESC'} LIMIT ?",
+                (*args, top),
+            )
+            return [dict(zip(selected, row, strict=True)) for row in cursor]
+
+    def report(self, key: str) -> Path:
+        """
+        Generate the PDF report of a cached result unless it exists already, and
+        clear its deferral.
+        """
+        pdf_path = self.pdf_path(key)
+        if not pdf_path.exists():
+            # reportlab is slow to import and only needed to render
+            from src.backtest_report_generator import (  # noqa: PLC0415
+                BacktestReportGenerator,
+            )
+
+            data = self.data(key)
+            if data is None:
+                err = f"No result {key} in the cache"
+                raise KeyError(err)
+            tmp_path = pdf_path.with_suffix(f".{os.getpid()}.tmp")
+            BacktestReportGenerator().generate(replace_nan_to_none(data), tmp_path)
+            tmp_path.replace(pdf_path)
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE results SET report_pending = 0 "
+                "WHERE key = ? AND report_pending = 1",
+                (key,),
+            )
+        return pdf_path
+
+    def handle_report(self, key: str, mode: str) -> None:
+        """Render, defer or skip the PDF report of a result, as `mode` says."""
+        if mode == REPORT_INLINE:
+            self.report(key)
+        elif mode == REPORT_DEFERRED and not self.pdf_path(key).exists():
+            self.defer_report(key)
+
+    def defer_report(self, key: str) -> None:
+        """Flag the report of a cached result to be rendered by `bt report`."""
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE results SET report_pending = 1 WHERE key = ?", (key,)
+            )
+
+    def deferred_reports(self) -> list[str]:
+        """
+        Sorted keys of the deferred reports. They stay deferred until `report`
+        renders them, so reports not rendered by an interrupted or failed run are
+        found again by the next.
+        """
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "SELECT key FROM results WHERE report_pending = 1 ORDER BY key"
+            )
+            return [row[0] for row in cursor]
+
+    def keys(self, prefix: str = "") -> list[str]:
+        """Sorted keys of the results, only those starting with `prefix` if given."""
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "SELECT key FROM results WHERE substr(key, 1, ?) = ? ORDER BY key",
+                (len(prefix), prefix),
+            )
+            return [row[0] for row in cursor]
+
+    def missing_reports(self) -> list[str]:
+        """Keys of the results without a PDF report."""
+        return [key for key in self.keys() if not self.pdf_path(key).exists()]
+
+
+def render_reports(
+    cache: ResultCache,
+    keys: list[str],
+    max_workers: int | None = None,
+    on_finish: Callable[[str, Path | None, str | None], None] | None = None,
+) -> list[str]:
+    """
+    Render the PDF reports of `keys` on a process pool and return the keys that
+    failed. `on_finish` is called with the key and its PDF path, or its error, as
+    each report finishes.
+    """
+    failed = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(cache.report, key): key for key in keys}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                path, error = future.result(), None
+            except Exception as e:  # noqa: BLE001
+                path, error = None, f"{type(e).__name__}: {e}"
+                failed.append(key)
+            if on_finish is not None:
+                on_finish(key, path, error)
+    return failed
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Self
+
+import numpy as np
+from nautilus_trader.model import Bar, BarType
+
+from src.bars import STREAM_CHUNK_SIZE
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from types import TracebackType
+
+BAR_DTYPE = np.dtype(
+    [
+        ("ts_event", "<u8"),
+        ("ts_init", "<u8"),
+        ("open", "<f8"),
+        ("high", "<f8"),
+        ("low", "<f8"),
+        ("close", "<f8"),
+        ("volume", "<f8"),
+    ]
+)
+
+
+def bars_to_records(bars: list[Bar]) -> np.ndarray:
+    records = np.empty(len(bars), dtype=BAR_DTYPE)
+    for column, getter in (
+        ("ts_event", lambda bar: bar.ts_event),
+        ("ts_init", lambda bar: bar.ts_init),
+        ("open", lambda bar: bar.open.as_double()),
+        ("high", lambda bar: bar.high.as_double()),
+        ("low", lambda bar: bar.low.as_double()),
+        ("close", lambda bar: bar.close.as_double()),
+        ("volume", lambda bar: bar.volume.as_double()),
+    ):
+        records[column] = np.fromiter(
+            (getter(bar) for bar in bars),
+            dtype=BAR_DTYPE[column],
+            count=len(bars),
+        )
+    return records
+
+
+def records_to_bars(
+    records: np.ndarray,
+    bar_type: str,
+    price_precision: int,
+    size_precision: int,
+) -> list[Bar]:
+    return Bar.from_raw_arrays_to_list(
+        BarType.from_str(bar_type),
+        price_precision,
+        size_precision,
+        np.ascontiguousarray(records["open"]),
+        np.ascontiguousarray(records["high"]),
+        np.ascontiguousarray(records["low"]),
+        np.ascontiguousarray(records["close"]),
+        np.ascontiguousarray(records["volume"]),
+        np.ascontiguousarray(records["ts_event"]),
+        np.ascontiguousarray(records["ts_init"]),
+    )
+
+
+@dataclass(frozen=True)
+class SharedBarsHandle:
+    """What a worker process needs to attach to published bars, cheap to pickle."""
+
+    path: str
+    bar_type: str
+    price_precision: int
+    size_precision: int
+
+
+class SharedBars:
+    """
+    Bars stored once as columnar arrays in a memory-mapped file.
+
+    The publishing process writes the bars to a `.npy` file and passes the `handle`
+    to the workers. Workers map the file without copying it, all of them sharing
+    the same pages of the OS page cache, and `stream` the Nautilus `Bar` objects of
+    the range they backtest into the engine a chunk at a time. Memory does not grow
+    with every worker holding its own decoded copy.
+    """
+
+    def __init__(self, records: np.ndarray, handle: SharedBarsHandle, owner: bool):  # noqa: FBT001
+        self.records = records
+        self.handle = handle
+        self.owner = owner
+
+    @classmethod
+    def publish(cls, bars: list[Bar], directory: Path | None = None) -> SharedBars:
+        if not bars:
+            err = "Cannot publish an empty list of bars"
+            raise ValueError(err)
+
+        fd, path = tempfile.mkstemp(suffix=".npy", dir=directory)
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, bars_to_records(bars))
+
+        handle = SharedBarsHandle(
+            path=path,
+            bar_type=str(bars[0].bar_type),
+            price_precision=bars[0].open.precision,
+            size_precision=bars[0].volume.precision,
+        )
+        return cls(np.load(path, mmap_mode="r"), handle, owner=True)
+
+    @classmethod
+    def attach(cls, handle: SharedBarsHandle) -> SharedBars:
+        return cls(np.load(handle.path, mmap_mode="r"), handle, owner=False)
+
+    @property
+    def bar_type(self) -> BarType:
+        return BarType.from_str(self.handle.bar_type)
+
+    def select(self, start: int | None = None, end: int | None = None) -> np.ndarray:
+        """
+        Select the records of the bars opening in [start, end), timestamps in UNIX
+        nanoseconds, as a view of the mapped file.
+        """
+        ts_event = self.records["ts_event"]
+        # Bars are timestamped on close, so a bar opening in [start, end) closes in
+        # (start, end]
+        lo = 0 if start is None else np.searchsorted(ts_event, start, side="right")
+        hi = (
+            len(ts_event) if end is None else np.searchsorted(ts_event, end, side="right")
+        )
+        return self.records[lo:hi]
+
+    def _to_bars(self, records: np.ndarray) -> list[Bar]:
+        return records_to_bars(
+            records,
+            self.handle.bar_type,
+            self.handle.price_precision,
+            self.handle.size_precision,
+        )
+
+    def bars(self, start: int | None = None, end: int | None = None) -> list[Bar]:
+        """Build all the bars opening in [start, end) at once."""
+        return self._to_bars(self.select(start, end))
+
+    def stream(
+        self,
+        start: int | None = None,
+        end: int | None = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> Iterator[list[Bar]]:
+        """Build the bars `bars` returns in lists of at most `chunk_size` bars."""
+        records = self.select(start, end)
+        for i in range(0, len(records), chunk_size):
+            yield self._to_bars(records[i : i + chunk_size])
+
+    def close(self) -> None:
+        """Unmap the file, and delete it when closing the publishing instance."""
+        self.records = None
+        if self.owner:
+            Path(self.handle.path).unlink(missing_ok=True)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pandas as pd
+from nautilus_trader.common.enums import LogColor
+from nautilus_trader.config import PositiveInt, StrategyConfig
+from nautilus_trader.core.correctness import PyCondition
+from nautilus_trader.indicators import ExponentialMovingAverage
+from nautilus_trader.model import (
+    Bar,
+    BarType,
+    InstrumentId,
+    OrderBook,
+    OrderBookDeltas,
+    Quantity,
+    QuoteTick,
+    TradeTick,
+)
+from nautilus_trader.model.enums import OrderSide, TimeInForce
+from nautilus_trader.trading import Strategy
+
+from src.indicators import load_series
+
+if TYPE_CHECKING:
+    from decimal import Decimal
+
+    import numpy as np
+    from nautilus_trader.core.data import Data
+    from nautilus_trader.core.message import Event
+    from nautilus_trader.model.instruments import Instrument
+    from nautilus_trader.model.orders import MarketOrder
+
+
+class EMACrossConfig(StrategyConfig, frozen=True):
+    instrument_id: InstrumentId
+    bar_type: BarType
+    trade_size: Decimal
+    fast_ema_period: PositiveInt = 10
+    slow_ema_period: PositiveInt = 20
+    subscribe_quote_ticks: bool = False
+    subscribe_trade_ticks: bool = True
+    request_bars: bool = True
+    unsubscribe_data_on_stop: bool = True
+    order_quantity_precision: int | None = None
+    order_time_in_force: TimeInForce | None = None
+    close_positions_on_stop: bool = True
+    reduce_only_on_stop: bool = True
+    # Log every bar and the indicator warm-up at info level
+    log_bars: bool = True
+    # Directory and closes hash of an `IndicatorCache` holding the averages of the
+    # bars, read by bar index instead of updating the indicators on every bar
+    indicator_cache: str | None = None
+    indicator_data: str | None = None
+
+
+class EMACross(Strategy):
+    def __init__(self, config: EMACrossConfig) -> None:
+        PyCondition.is_true(
+            config.fast_ema_period < config.slow_ema_period,
+            "{config.fast_ema_period=} must be less than {config.slow_ema_period=}",
+        )
+        super().__init__(config)
+
+        self.instrument: Instrument = None
+
+        self.fast_ema = ExponentialMovingAverage(config.fast_ema_period)
+        self.slow_ema = ExponentialMovingAverage(config.slow_ema_period)
+        self.fast_series: np.ndarray | None = None
+        self.slow_series: np.ndarray | None = None
+        self.bars_seen = 0
+
+    def on_start(self) -> None:
+        self.instrument = self.cache.instrument(self.config.instrument_id)
+        if self.instrument is None:
+            self.log.error(f"Could not find instrument for {self.config.instrument_id}")  # noqa: G004
+            self.stop()
+            return
+
+        if self.config.indicator_cache is None:
+            self.register_indicator_for_bars(self.config.bar_type, self.fast_ema)
+            self.register_indicator_for_bars(self.config.bar_type, self.slow_ema)
+        else:
+            self.fast_series, self.slow_series = (
+                load_series(
+                    self.config.indicator_cache, self.config.indicator_data, "ema", period
+                )
+                for period in (self.config.fast_ema_period, self.config.slow_ema_period)
+            )
+
+        if self.config.request_bars:
+            self.request_bars(
+                self.config.bar_type,
+                start=self._clock.utc_now() - pd.Timedelta(days=1),
+            )
+
+        self.subscribe_bars(self.config.bar_type)
+        if self.config.subscribe_quote_ticks:
+            self.subscribe_quote_ticks(self.config.instrument_id)
+        if self.config.subscribe_trade_ticks:
+            self.subscribe_trade_ticks(self.config.instrument_id)
+
+    def on_instrument(self, instrument: Instrument) -> None:
+        pass
+
+    def on_order_book_deltas(self, deltas: OrderBookDeltas) -> None:
+        pass
+
+    def on_order_book(self, order_book: OrderBook) -> None:
+        pass
+
+    def on_quote_tick(self, tick: QuoteTick) -> None:
+        self.log.info(repr(tick), LogColor.CYAN)
+
+    def on_trade_tick(self, tick: TradeTick) -> None:
+        self.log.info(repr(tick), LogColor.CYAN)
+
+    def on_bar(self, bar: Bar) -> None:
+        self.bars_seen += 1
+        # Checked before formatting, the logs of every bar dominate long backtests
+        if self.config.log_bars:
+            self.log_bar(bar)
+
+        averages = self.averages()
+        if averages is None:
+            return
+        fast, slow = averages
+
+        if bar.is_single_price():
+            self._log.warning("Bar OHLC is single price; implies no market information")
+            return
+
+        # BUY LOGIC
+        if fast >= slow:
+            if self.portfolio.is_flat(self.config.instrument_id):
+                self.buy()
+            elif self.portfolio.is_net_short(self.config.instrument_id):
+                self.close_all_positions(self.config.instrument_id)
+                self.buy()
+        # SELL LOGIC
+        elif fast < slow:
+            if self.portfolio.is_flat(self.config.instrument_id):
+                self.sell()
+            elif self.portfolio.is_net_long(self.config.instrument_id):
+                self.close_all_positions(self.config.instrument_id)
+                self.sell()
+
+    def averages(self) -> tuple[float, float] | None:
+        """Fast and slow averages after the last bar, None while warming up."""
+        if self.fast_series is None:
+            if not self.indicators_initialized():
+                return None
+            return self.fast_ema.value, self.slow_ema.value
+        if self.bars_seen < self.config.slow_ema_period:
+            return None
+        index = self.bars_seen - 1
+        return float(self.fast_series[index]), float(self.slow_series[index])
+
+    def log_bar(self, bar: Bar) -> None:
+        self.log.info(repr(bar), LogColor.CYAN)
+        if self.averages() is None:
+            self.log.info(
+                "Waiting for indicators to warm up "  # noqa: G004
+                f"[{self.cache.bar_count(self.config.bar_type)}]",
+                color=LogColor.BLUE,
+            )
+
+    def buy(self) -> None:
+        order: MarketOrder = self.order_factory.market(
+            instrument_id=self.config.instrument_id,
+            order_side=OrderSide.BUY,
+            quantity=self.create_order_qty(),
+            time_in_force=self.config.order_time_in_force or TimeInForce.GTC,
+        )
+
+        self.submit_order(order)
+
+    def sell(self) -> None:
+        order: MarketOrder = self.order_factory.market(
+            instrument_id=self.config.instrument_id,
+            order_side=OrderSide.SELL,
+            quantity=self.create_order_qty(),
+            time_in_force=self.config.order_time_in_force or TimeInForce.GTC,
+        )
+
+        self.submit_order(order)
+
+    def create_order_qty(self) -> Quantity:
+        if self.config.order_quantity_precision is not None:
+            return Quantity(self.config.trade_size, self.config.order_quantity_precision)
+
+        return self.instrument.make_qty(self.config.trade_size)
+
+    def on_data(self, data: Data) -> None:
+        pass
+
+    def on_event(self, event: Event) -> None:
+        pass
+
+    def on_stop(self) -> None:
+        self.cancel_all_orders(self.config.instrument_id)
+        if self.config.close_positions_on_stop:
+            self.close_all_positions(
+                instrument_id=self.config.instrument_id,
+                reduce_only=self.config.reduce_only_on_stop,
+            )
+        if self.config.unsubscribe_data_on_stop:
+            self.unsubscribe_bars(self.config.bar_type)
+            if self.config.subscribe_quote_ticks:
+                self.unsubscribe_quote_ticks(self.config.instrument_id)
+            if self.config.subscribe_trade_ticks:
+                self.unsubscribe_trade_ticks(self.config.instrument_id)
+
+    def on_reset(self) -> None:
+        self.fast_ema.reset()
+        self.slow_ema.reset()
+        self.bars_seen = 0
+
+    def on_save(self) -> dict[str, bytes]:
+        return {}
+
+    def on_load(self, state: dict[str, bytes]) -> None:
+        pass
+
+    def on_dispose(self) -> None:
+        pass
@@ -20,9 +20,12 @@ from nautilus_trader.model import (
 from nautilus_trader.model.enums import OrderSide, TimeInForce
 from nautilus_trader.trading import Strategy
 
+from src.indicators import load_series
+
 if TYPE_CHECKING:
     from decimal import Decimal
 
+    import numpy as np
     from nautilus_trader.core.data import Data
     from nautilus_trader.core.message import Event
     from nautilus_trader.model.instruments import Instrument
@@ -40,6 +43,12 @@ class MACrossConfig(StrategyConfig, frozen=True):
     order_time_in_force: TimeInForce | None = None
     close_positions_on_stop: bool = True
     reduce_only_on_stop: bool = True
+    # Log every bar and the indicator warm-up at info level
+    log_bars: bool = True
+    # Directory and closes hash of an `IndicatorCache` holding the averages of the
+    # bars, read by bar index instead of updating the indicators on every bar
+    indicator_cache: str | None = None
+    indicator_data: str | None = None
 
 
 class MACross(Strategy):
@@ -54,6 +63,9 @@ class MACross(Strategy):
 
         self.fast_ma = SimpleMovingAverage(config.fast_ma_period)
         self.slow_ma = SimpleMovingAverage(config.slow_ma_period)
+        self.fast_series: np.ndarray | None = None
+        self.slow_series: np.ndarray | None = None
+        self.bars_seen = 0
 
     def on_start(self) -> None:
         self.instrument = self.cache.instrument(self.config.instrument_id)
@@ -62,8 +74,16 @@ class MACross(Strategy):
             self.stop()
             return
 
-        self.register_indicator_for_bars(self.config.bar_type, self.fast_ma)
-        self.register_indicator_for_bars(self.config.bar_type, self.slow_ma)
+        if self.config.indicator_cache is None:
+            self.register_indicator_for_bars(self.config.bar_type, self.fast_ma)
+            self.register_indicator_for_bars(self.config.bar_type, self.slow_ma)
+        else:
+            self.fast_series, self.slow_series = (
+                load_series(
+                    self.config.indicator_cache, self.config.indicator_data, "sma", period
+                )
+                for period in (self.config.fast_ma_period, self.config.slow_ma_period)
+            )
 
         if self.config.request_bars:
             self.request_bars(
@@ -89,35 +109,55 @@ class MACross(Strategy):
         self.log.info(repr(tick), LogColor.CYAN)
 
     def on_bar(self, bar: Bar) -> None:
-        self.log.info(repr(bar), LogColor.CYAN)
+        self.bars_seen += 1
+        # Checked before formatting, the logs of every bar dominate long backtests
+        if self.config.log_bars:
+            self.log_bar(bar)
 
-        if not self.indicators_initialized():
-            self.log.info(
-                "Waiting for indicators to warm up "  # noqa: G004
-                f"[{self.cache.bar_count(self.config.bar_type)}]",
-                color=LogColor.BLUE,
-            )
+        averages = self.averages()
+        if averages is None:
             return
+        fast, slow = averages
 
         if bar.is_single_price():
             self._log.warning("Bar OHLC is single price; implies no market information")
             return
 
         # BUY LOGIC
-        if self.fast_ma.value >= self.slow_ma.value:
+        if fast >= slow:
             if self.portfolio.is_flat(self.config.instrument_id):
                 self.buy()
             elif self.portfolio.is_net_short(self.config.instrument_id):
                 self.close_all_positions(self.config.instrument_id)
                 self.buy()
         # SELL LOGIC
-        elif self.fast_ma.value < self.slow_ma.value:
+        elif fast < slow:
             if self.portfolio.is_flat(self.config.instrument_id):
                 self.sell()
             elif self.portfolio.is_net_long(self.config.instrument_id):
                 self.close_all_positions(self.config.instrument_id)
                 self.sell()
 
+    def averages(self) -> tuple[float, float] | None:
+        """Fast and slow averages after the last bar, None while warming up."""
+        if self.fast_series is None:
+            if not self.indicators_initialized():
+                return None
+            return self.fast_ma.value, self.slow_ma.value
+        if self.bars_seen < self.config.slow_ma_period:
+            return None
+        index = self.bars_seen - 1
+        return float(self.fast_series[index]), float(self.slow_series[index])
+
+    def log_bar(self, bar: Bar) -> None:
+        self.log.info(repr(bar), LogColor.CYAN)
+        if self.averages() is None:
+            self.log.info(
+                "Waiting for indicators to warm up "  # noqa: G004
+                f"[{self.cache.bar_count(self.config.bar_type)}]",
+                color=LogColor.BLUE,
+            )
+
     def buy(self) -> None:
         order: MarketOrder = self.order_factory.market(
             instrument_id=self.config.instrument_id,
@@ -161,6 +201,7 @@ class MACross(Strategy):
     def on_reset(self) -> None:
         self.fast_ma.reset()
         self.slow_ma.reset()
+        self.bars_seen = 0
 
     def on_save(self) -> dict[str, bytes]:
         return {}
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from databento.common.dbnstore import DBNStore
+
+READ_CHUNK_SIZE = 1_000_000
+HASH_CHUNK_SIZE = 1 << 20
+SUMMARY_SUFFIX = ".summary.json"
+
+
+def summarize_records(store: DBNStore) -> tuple[int, int | None, int | None]:
+    """
+    Record count and first/last `ts_event` of a store, decoded in fixed size NumPy
+    chunks so memory stays flat whatever the file size.
+    """
+    start = end = None
+    count = 0
+    for records in store.to_ndarray(count=READ_CHUNK_SIZE):
+        if not len(records):
+            continue
+        ts_event = records["ts_event"]
+        start = int(ts_event.min()) if start is None else min(start, int(ts_event.min()))
+        end = int(ts_event.max()) if end is None else max(end, int(ts_event.max()))
+        count += len(records)
+    return count, start, end
+
+
+def file_hash(path: Path) -> str:
+    sha256 = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def summary_path(path: Path) -> Path:
+    return path.with_name(path.name + SUMMARY_SUFFIX)
+
+
+def build_summary(path: Path) -> dict[str, Any]:
+    # databento is slow to import, and summaries are mostly read from their sidecar
+    from databento.common.dbnstore import DBNStore  # noqa: PLC0415
+
+    store = DBNStore.from_file(path)
+    metadata = store.metadata
+    count, first_ts, last_ts = summarize_records(store)
+    stat = path.stat()
+
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": file_hash(path),
+        "count": count,
+        "first_ts": first_ts,
+        "last_ts": last_ts,
+        "metadata": {
+            "version": metadata.version,
+            "dataset": metadata.dataset,
+            "schema": str(metadata.schema),
+            "start": metadata.start,
+            "end": metadata.end,
+            "limit": metadata.limit,
+            "stype_in": str(metadata.stype_in),
+            "stype_out": str(metadata.stype_out),
+            "symbols": list(metadata.symbols),
+            "mappings": {
+                raw_symbol: [
+                    {
+                        "start_date": interval["start_date"].isoformat(),
+                        "end_date": interval["end_date"].isoformat(),
+                        "symbol": interval["symbol"],
+                    }
+                    for interval in intervals
+                ]
+                for raw_symbol, intervals in metadata.mappings.items()
+            },
+        },
+    }
+
+
+def load_summary(path: Path, recount: bool = False) -> dict[str, Any]:  # noqa: FBT001, FBT002
+    """
+    Summary of a `.dbn` file from its sidecar file. The sidecar is written on first
+    use, and rebuilt when the file changed or when `recount` is set.
+    """
+    sidecar_path = summary_path(path)
+    if not recount and sidecar_path.exists():
+        with sidecar_path.open() as f:
+            summary = json.load(f)
+        stat = path.stat()
+        if (summary["size"], summary["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+            return summary
+
+    summary = build_summary(path)
+    tmp_path = sidecar_path.with_suffix(f".{os.getpid()}.tmp")
+    with tmp_path.open(mode="w") as f:
+        json.dump(summary, f, indent=3, sort_keys=True)
+    tmp_path.replace(sidecar_path)
+    return summary
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from src.backtest import (
+    STRATEGIES,
+    BacktestData,
+    BacktestRunner,
+    BacktestStream,
+    result_key,
+    result_params,
+    result_summary,
+)
+from src.indicators import bar_closes
+from src.result_cache import REPORT_NONE
+from src.shared_bars import SharedBars
+
+if TYPE_CHECKING:
+    from nautilus_trader.model.instruments import FuturesContract
+
+    from src.indicators import IndicatorCache
+    from src.result_cache import ResultCache
+    from src.shared_bars import SharedBarsHandle
+
+SWEEP_LOG_LEVEL = "ERROR"
+
+# Engine of the worker process, set up once by the pool initializer
+_runner: BacktestRunner | None = None
+_cache: ResultCache | None = None
+
+
+def parse_range(value: str) -> list[int]:
+    """
+    Periods of a `start:stop:step` range, `stop` included. `start:stop` steps by
+    one and a single number is a range of one period.
+    """
+    try:
+        parts = [int(part) for part in value.split(":")]
+    except ValueError:
+        err = f"Invalid range: {value!r}, expected start:stop:step"
+        raise ValueError(err) from None
+
+    if len(parts) == 1:
+        parts = [parts[0], parts[0], 1]
+    elif len(parts) == 2:  # noqa: PLR2004
+        parts.append(1)
+
+    if len(parts) != 3:  # noqa: PLR2004
+        err = f"Invalid range: {value!r}, expected start:stop:step"
+        raise ValueError(err)
+
+    start, stop, step = parts
+    if start <= 0 or start > stop or step <= 0:
+        err = f"Invalid range: {value!r}, expected 0 < start <= stop and step > 0"
+        raise ValueError(err)
+
+    return list(range(start, stop + 1, step))
+
+
+def parameter_grid(
+    fast_periods: list[int], slow_periods: list[int]
+) -> list[tuple[int, int]]:
+    """Pair the fast and slow periods, skipping pairs with fast >= slow."""
+    return [(fast, slow) for fast in fast_periods for slow in slow_periods if fast < slow]
+
+
+def _init_worker(  # noqa: PLR0913
+    handle: SharedBarsHandle,
+    instrument: FuturesContract,
+    cache: ResultCache | None,
+    indicators: IndicatorCache | None,
+    indicator_data: str | None,
+    log_level: str,
+) -> None:
+    global _runner, _cache  # noqa: PLW0603
+    # Mapped for the life of the worker, every run streams the bars from it
+    shared_bars = SharedBars.attach(handle)
+    data = BacktestStream(
+        bar_type=shared_bars.bar_type, instrument=instrument, chunks=shared_bars.stream
+    )
+    _runner = BacktestRunner(
+        data,
+        log_level=log_level,
+        indicators=indicators,
+        indicator_data=indicator_data,
+    )
+    _cache = cache
+
+
+def _run_combination(  # noqa: PLR0913
+    strategy_name: str,
+    fast_period: int,
+    slow_period: int,
+    key: str | None,
+    params: dict[str, Any] | None,
+    report: str,
+) -> dict[str, Any]:
+    result = _runner.run(STRATEGIES[strategy_name], fast_period, slow_period)
+    if key is not None:
+        _cache.put(key, result, params)
+        _cache.handle_report(key, report)
+    return {
+        "fast_period": fast_period,
+        "slow_period": slow_period,
+        **result_summary(result),
+        "overhead_s": _runner.overhead,
+        "run_s": _runner.run_time,
+        "cached": False,
+    }
+
+
+def run_sweep(  # noqa: PLR0913
+    data: BacktestData,
+    strategy_name: str,
+    grid: list[tuple[int, int]],
+    max_workers: int | None = None,
+    cache: ResultCache | None = None,
+    indicators: IndicatorCache | None = None,
+    report: str = REPORT_NONE,
+    log_level: str = SWEEP_LOG_LEVEL,
+) -> list[dict[str, Any]]:
+    """
+    Backtest every (fast, slow) combination of the grid on a process pool and
+    return one row of statistics per combination, in the order of the grid.
+
+    The bars are published once in a memory-mapped file that every worker maps,
+    instead of being pickled to each of them, and each worker sets up one engine
+    that is reset between combinations and streams the bars from the file on every
+    run, so no worker holds all of them. `overhead_s` is the time each run spent
+    before the engine started, `run_s` the time of the run itself.
+
+    With a `cache` and data with a fingerprint, combinations found in the cache are
+    not run again (their row is `cached` and has no times) and the others are
+    saved to it, their PDF report rendered, deferred or skipped as `report` says.
+
+    With `indicators`, the moving average of each distinct period of the grid is
+    computed once, before the workers start, and shared by every combination
+    using that period. The workers get the hash of the closes from the parent, and
+    do not read the closes again.
+
+    The engines log at `log_level`, THROUGHPUT_LOG_LEVEL bypasses their logging.
+    """
+    strategy = STRATEGIES[strategy_name]
+    keys: list[str | None] = [None] * len(grid)
+    params: list[dict[str, Any] | None] = [None] * len(grid)
+    if cache is not None and data.fingerprint is not None:
+        bar_type = data.bars[0].bar_type
+        inputs = [
+            (data.fingerprint, strategy, data.instrument.id, bar_type, fast, slow)
+            for fast, slow in grid
+        ]
+        keys = [result_key(*combination) for combination in inputs]
+        params = [result_params(*combination) for combination in inputs]
+
+    rows: list[dict[str, Any] | None] = [None] * len(grid)
+    for i, ((fast, slow), key) in enumerate(zip(grid, keys, strict=True)):
+        if key is not None and (result := cache.get(key)) is not None:
+            rows[i] = {
+                "fast_period": fast,
+                "slow_period": slow,
+                **result_summary(result),
+                "overhead_s": None,
+                "run_s": None,
+                "cached": True,
+            }
+    todo = [i for i, row in enumerate(rows) if row is None]
+    if not todo:
+        return rows
+
+    indicator_data = None
+    if indicators is not None:
+        periods = {period for i in todo for period in grid[i]}
+        indicator_data = indicators.precompute(
+            bar_closes(data.bars), strategy.average_kind, sorted(periods)
+        )
+
+    with (
+        SharedBars.publish(data.bars) as shared_bars,
+        ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(
+                shared_bars.handle,
+                data.instrument,
+                cache,
+                indicators,
+                indicator_data,
+                log_level,
+            ),
+        ) as executor,
+    ):
+        computed = executor.map(
+            _run_combination,
+            [strategy_name] * len(todo),
+            [grid[i][0] for i in todo],
+            [grid[i][1] for i in todo],
+            [keys[i] for i in todo],
+            [params[i] for i in todo],
+            [report] * len(todo),
+        )
+        for i, row in zip(todo, computed, strict=True):
+            rows[i] = row
+    return rows
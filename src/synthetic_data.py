@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+import databento_dbn
+import numpy as np
+import zstandard
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+MINUTE_NS = 60_000_000_000
+HOUR_NS = 60 * MINUTE_NS
+DAY_NS = 24 * HOUR_NS
+PRICE_SCALE = 1_000_000_000
+TICK_SIZE = 0.25
+
+OHLCV_DTYPE = np.dtype(
+    [
+        ("length", "u1"),
+        ("rtype", "u1"),
+        ("publisher_id", "<u2"),
+        ("instrument_id", "<u4"),
+        ("ts_event", "<u8"),
+        ("open", "<i8"),
+        ("high", "<i8"),
+        ("low", "<i8"),
+        ("close", "<i8"),
+        ("volume", "<u8"),
+    ]
+)
+
+
+def to_ns(value: int | str | datetime) -> int:
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return int(value.timestamp()) * 1_000_000_000
+
+
+def ohlcv_records(  # noqa: PLR0913
+    start_ns: int,
+    count: int,
+    interval_ns: int = MINUTE_NS,
+    instrument_id: int = 118,
+    start_price: float = 4700.0,
+    seed: int = 0,
+) -> np.ndarray:
+    """`count` OHLCV records of a random walk, one every `interval_ns`."""
+    timestamps = start_ns + np.arange(count, dtype=np.uint64) * interval_ns
+    return records_at(timestamps, instrument_id, start_price, seed)
+
+
+def records_at(
+    timestamps: np.ndarray,
+    instrument_id: int = 118,
+    start_price: float = 4700.0,
+    seed: int = 0,
+) -> np.ndarray:
+    """OHLCV records of a random walk in ticks of 0.25, one per timestamp."""
+    count = len(timestamps)
+    rng = np.random.default_rng(seed)
+    steps = np.round(rng.normal(0, 1, count) / TICK_SIZE) * TICK_SIZE
+    close = start_price + np.cumsum(steps)
+    open_ = np.concatenate(([start_price], close[:-1]))
+    wick = rng.integers(0, 4, size=(2, count)) * TICK_SIZE
+    high = np.maximum(open_, close) + wick[0]
+    low = np.minimum(open_, close) - wick[1]
+
+    records = np.zeros(count, dtype=OHLCV_DTYPE)
+    records["length"] = OHLCV_DTYPE.itemsize // 4
+    records["rtype"] = int(databento_dbn.RType.OHLCV_1M)
+    records["publisher_id"] = 1
+    records["instrument_id"] = instrument_id
+    records["ts_event"] = timestamps
+    records["open"] = np.round(open_ * PRICE_SCALE)
+    records["high"] = np.round(high * PRICE_SCALE)
+    records["low"] = np.round(low * PRICE_SCALE)
+    records["close"] = np.round(close * PRICE_SCALE)
+    records["volume"] = rng.integers(1, 500, size=count)
+    return records
+
+
+def es_session_minutes(start_ns: int, end_ns: int) -> np.ndarray:
+    """
+    Minutes of [start_ns, end_ns) the ES future trades on Globex: Sunday 23:00 to
+    Friday 22:00 UTC, with a daily break from 22:00 to 23:00. Holidays are ignored.
+    """
+    minutes = np.arange(start_ns, end_ns, MINUTE_NS, dtype=np.int64)
+    hour = minutes // HOUR_NS % 24
+    # 1970-01-01 was a Thursday, Monday is 0
+    weekday = (minutes // DAY_NS + 3) % 7
+    trading = (hour != 22) & (weekday != 5)  # noqa: PLR2004
+    trading &= ~((weekday == 4) & (hour > 22))  # noqa: PLR2004
+    trading &= ~((weekday == 6) & (hour < 23))  # noqa: PLR2004
+    return minutes[trading].astype(np.uint64)
+
+
+def build_metadata(  # noqa: PLR0913
+    start_ns: int,
+    end_ns: int,
+    dataset: str = "GLBX.MDP3",
+    symbol: str = "ES.v.0",
+    instrument_id: int = 118,
+    limit: int | None = None,
+) -> databento_dbn.Metadata:
+    start_date = datetime.fromtimestamp(start_ns / 1e9, UTC).date()
+    end_date = datetime.fromtimestamp(end_ns / 1e9, UTC).date()
+    interval = SimpleNamespace(
+        start_date=start_date,
+        end_date=end_date,
+        symbol=str(instrument_id),
+    )
+    return databento_dbn.Metadata(
+        dataset=dataset,
+        start=start_ns,
+        stype_in=databento_dbn.SType.CONTINUOUS,
+        stype_out=databento_dbn.SType.INSTRUMENT_ID,
+        schema=databento_dbn.Schema.OHLCV_1M,
+        symbols=[symbol],
+        partial=[],
+        not_found=[],
+        mappings=[SimpleNamespace(raw_symbol=symbol, intervals=[interval])],
+        end=end_ns,
+        limit=limit,
+    )
+
+
+def ohlcv_dbn_bytes(
+    start: str | datetime,
+    count: int,
+    end: str | datetime | None = None,
+    seed: int = 0,
+    **kwargs: object,
+) -> bytes:
+    """
+    Zstd compressed DBN bytes, as returned by Databento, with `count` OHLCV-1m
+    records starting at `start`.
+    """
+    start_ns = to_ns(start)
+    end_ns = to_ns(end) if end is not None else start_ns + count * MINUTE_NS
+    metadata = build_metadata(start_ns, end_ns, **kwargs)
+    records = ohlcv_records(start_ns, count, seed=seed)
+    return zstandard.ZstdCompressor().compress(metadata.encode() + records.tobytes())
+
+
+def write_ohlcv_dbn(
+    path: Path, start: str | datetime, count: int, **kwargs: object
+) -> Path:
+    path.write_bytes(ohlcv_dbn_bytes(start, count, **kwargs))
+    return path
+
+
+def write_es_dbn(path: Path, start_ns: int, end_ns: int, seed: int = 0) -> Path:
+    """Write an ES-like OHLCV-1m `.dbn` file with a bar on every trading minute."""
+    metadata = build_metadata(start_ns, end_ns)
+    records = records_at(es_session_minutes(start_ns, end_ns), seed=seed)
+    compressed = zstandard.ZstdCompressor().compress(
+        metadata.encode() + records.tobytes()
+    )
+    path.write_bytes(compressed)
+    return path
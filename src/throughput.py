@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+from src.backtest import (
+    STRATEGIES,
+    THROUGHPUT_LOG_LEVEL,
+    BacktestData,
+    BacktestRunner,
+    BacktestStream,
+)
+from src.shared_bars import SharedBars
+
+if TYPE_CHECKING:
+    from nautilus_trader.model.instruments import FuturesContract
+
+    from src.shared_bars import SharedBarsHandle
+
+# Default logging of `bt indicator` compared with the throughput mode
+LOGGING_ON = "INFO"
+LOGGING_OFF = THROUGHPUT_LOG_LEVEL
+
+# Bars of the worker process streamed from the shared bars, and their number, set
+# up by the pool initializer
+_data: BacktestStream | None = None
+_bar_count = 0
+
+
+def _init_worker(handle: SharedBarsHandle, instrument: FuturesContract) -> None:
+    global _data, _bar_count  # noqa: PLW0603
+    shared_bars = SharedBars.attach(handle)
+    _data = BacktestStream(
+        bar_type=shared_bars.bar_type, instrument=instrument, chunks=shared_bars.stream
+    )
+    _bar_count = len(shared_bars.records)
+    # The logs are formatted and written as usual, but not shown in the terminal
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+
+
+def _bars_per_second(
+    strategy_name: str, fast_period: int, slow_period: int, log_level: str
+) -> float:
+    with BacktestRunner(_data, log_level=log_level) as runner:
+        runner.run(STRATEGIES[strategy_name], fast_period, slow_period)
+        return _bar_count / runner.run_time
+
+
+def measure_throughput(
+    data: BacktestData,
+    strategy_name: str,
+    fast_period: int,
+    slow_period: int,
+    log_levels: tuple[str, ...] = (LOGGING_ON, LOGGING_OFF),
+) -> dict[str, float]:
+    """
+    Bars per second of a backtest of `data` at each of `log_levels`.
+
+    Nautilus sets up its logging once per process, so each level is measured in a
+    new process. Their standard output is discarded.
+    """
+    throughput = {}
+    with SharedBars.publish(data.bars) as shared_bars:
+        for log_level in log_levels:
+            with ProcessPoolExecutor(
+                max_workers=1,
+                initializer=_init_worker,
+                initargs=(shared_bars.handle, data.instrument),
+            ) as executor:
+                throughput[log_level] = executor.submit(
+                    _bars_per_second, strategy_name, fast_period, slow_period, log_level
+                ).result()
+    return throughput
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+import pandas as pd
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from nautilus_trader.backtest.engine import BacktestEngine
+
+# Columns and types of each exported table. The trader reports hold quantities,
+# prices and money as strings, they are stored as numbers
+TRADE_TABLES = {
+    # One row per fill
+    "fills": {
+        "client_order_id": "string",
+        "venue_order_id": "string",
+        "trade_id": "string",
+        "position_id": "string",
+        "strategy_id": "string",
+        "instrument_id": "string",
+        "order_side": "string",
+        "order_type": "string",
+        "liquidity_side": "string",
+        "last_qty": "float64",
+        "last_px": "float64",
+        "commission": "float64",
+        "currency": "string",
+        "ts_event": "datetime64[ns, UTC]",
+        "ts_init": "datetime64[ns, UTC]",
+    },
+    # One row per position, closed positions of a netting account as snapshots
+    "positions": {
+        "position_id": "string",
+        "strategy_id": "string",
+        "instrument_id": "string",
+        "opening_order_id": "string",
+        "closing_order_id": "string",
+        "entry": "string",
+        "side": "string",
+        "quantity": "float64",
+        "peak_qty": "float64",
+        "ts_opened": "datetime64[ns, UTC]",
+        "ts_closed": "datetime64[ns, UTC]",
+        # Missing while the position is open
+        "duration_ns": "Int64",
+        "avg_px_open": "float64",
+        "avg_px_close": "float64",
+        "realized_return": "float64",
+        "realized_pnl": "float64",
+        "is_snapshot": "bool",
+    },
+    # One row per account state: the balance after every fill, commission and
+    # realized PnL included
+    "account": {
+        "ts_event": "datetime64[ns, UTC]",
+        "total": "float64",
+        "locked": "float64",
+        "free": "float64",
+        "currency": "string",
+    },
+}
+# zstd reads about as fast as snappy and compresses the repeated ids better
+COMPRESSION = "zstd"
+
+
+def _typed(report: pd.DataFrame, columns: dict[str, str]) -> pd.DataFrame:
+    """Convert the columns of a trader report to the types of `columns`."""
+    if report.empty:
+        return pd.DataFrame(
+            {name: pd.Series(dtype=dtype) for name, dtype in columns.items()}
+        )
+
+    report = report[list(columns)].copy()
+    for name, dtype in columns.items():
+        if dtype == "float64" and report[name].dtype == object:
+            # Money is formatted as "<amount> <currency>"
+            report[name] = pd.to_numeric(
+                report[name].astype(str).str.split(" ").str[0].str.replace("_", "")
+            )
+    return report.astype(columns)
+
+
+def trade_reports(engine: BacktestEngine) -> dict[str, pd.DataFrame]:
+    """Build the fills, positions and account balances of the last run of `engine`."""
+    trader = engine.trader
+    fills = trader.generate_fills_report().rename_axis("client_order_id")
+    positions = trader.generate_positions_report().rename_axis("position_id")
+    accounts = [
+        trader.generate_account_report(venue).rename_axis("ts_event")
+        for venue in engine.list_venues()
+    ]
+    account = pd.concat(accounts) if accounts else pd.DataFrame()
+    return {
+        "fills": _typed(fills.reset_index(), TRADE_TABLES["fills"]),
+        "positions": _typed(positions.reset_index(), TRADE_TABLES["positions"]),
+        "account": _typed(account.reset_index(), TRADE_TABLES["account"]),
+    }
+
+
+def trades_path(directory: Path, table: str) -> Path:
+    return directory / f"{table}.parquet"
+
+
+def has_trades(directory: Path) -> bool:
+    return all(trades_path(directory, table).exists() for table in TRADE_TABLES)
+
+
+def export_trades(engine: BacktestEngine, directory: Path) -> None:
+    """
+    Write the fills, positions and account balances of the last run of `engine`
+    to compressed Parquet files in `directory`, each table in a single write.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    for table, data in trade_reports(engine).items():
+        path = trades_path(directory, table)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        data.to_parquet(tmp_path, compression=COMPRESSION, index=False)
+        tmp_path.replace(path)
+
+
+def read_trades(
+    directory: Path, table: str, columns: list[str] | None = None
+) -> pd.DataFrame:
+    """Read an exported table, only `columns` if given."""
+    return pd.read_parquet(trades_path(directory, table), columns=columns)
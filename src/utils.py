@@ -1,5 +1,6 @@
 import json
 import math
+from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
@@ -17,3 +18,9 @@ def replace_nan_to_none(obj: object) -> object:
     if isinstance(obj, float) and math.isnan(obj):
         return None
     return obj
+
+
+def date_to_ns(value: str) -> int:
+    return (
+        int(datetime.fromisoformat(value).replace(tzinfo=UTC).timestamp()) * 1_000_000_000
+    )
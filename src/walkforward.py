@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import math
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+from src.backtest import (
+    STARTING_BALANCE,
+    STRATEGIES,
+    BacktestData,
+    BacktestRunner,
+    BacktestStream,
+    result_summary,
+)
+from src.shared_bars import SharedBars
+from src.utils import replace_nan_to_none
+
+if TYPE_CHECKING:
+    from nautilus_trader.model.instruments import FuturesContract
+
+    from src.shared_bars import SharedBarsHandle
+
+WALKFORWARD_LOG_LEVEL = "ERROR"
+
+# Bars and instrument of the walk-forward, set once per worker process by the pool
+# initializer
+_shared_bars: SharedBars | None = None
+_instrument: FuturesContract | None = None
+
+
+@dataclass(frozen=True)
+class Fold:
+    """
+    In-sample range to optimise on, followed by the out-of-sample range the best
+    periods are evaluated on. Bars opening in [start, end), UNIX nanoseconds.
+    """
+
+    index: int
+    in_sample_start: int
+    in_sample_end: int
+    out_of_sample_start: int
+    out_of_sample_end: int
+
+
+def split_folds(
+    start: int,
+    end: int,
+    in_sample: int,
+    out_of_sample: int,
+) -> list[Fold]:
+    """
+    Split [start, end) in rolling folds. Every fold moves forward by
+    `out_of_sample`, so the out-of-sample ranges are contiguous, and the last one is
+    cut at `end`.
+    """
+    if in_sample <= 0 or out_of_sample <= 0:
+        err = "In-sample and out-of-sample lengths must be positive"
+        raise ValueError(err)
+
+    folds = []
+    fold_start = start
+    while fold_start + in_sample < end:
+        folds.append(
+            Fold(
+                index=len(folds),
+                in_sample_start=fold_start,
+                in_sample_end=fold_start + in_sample,
+                out_of_sample_start=fold_start + in_sample,
+                out_of_sample_end=min(fold_start + in_sample + out_of_sample, end),
+            )
+        )
+        fold_start += out_of_sample
+
+    if not folds:
+        err = "The range is shorter than the in-sample length, no folds to run"
+        raise ValueError(err)
+    return folds
+
+
+def _init_worker(handle: SharedBarsHandle, instrument: FuturesContract) -> None:
+    global _shared_bars, _instrument  # noqa: PLW0603
+    _shared_bars = SharedBars.attach(handle)
+    _instrument = instrument
+
+
+def _fold_stream(start: int, end: int) -> BacktestStream | None:
+    """Stream of the shared bars opening in [start, end), None when there are none."""
+    if not len(_shared_bars.select(start, end)):
+        return None
+    return BacktestStream(
+        bar_type=_shared_bars.bar_type,
+        instrument=_instrument,
+        chunks=partial(_shared_bars.stream, start, end),
+    )
+
+
+def _score(summary: dict[str, Any]) -> float:
+    pnl = summary["pnl"]
+    return -math.inf if pnl is None or math.isnan(pnl) else pnl
+
+
+def run_fold(
+    strategy_name: str,
+    grid: list[tuple[int, int]],
+    fold: Fold,
+    log_level: str = WALKFORWARD_LOG_LEVEL,
+) -> dict[str, Any]:
+    """
+    Backtest every combination of the grid in-sample and the one with the highest
+    PnL out-of-sample. The bars of the fold are streamed from the shared bars.
+    """
+    strategy = STRATEGIES[strategy_name]
+
+    in_sample = _fold_stream(fold.in_sample_start, fold.in_sample_end)
+    in_sample_results = []
+    if in_sample is not None:
+        with BacktestRunner(in_sample, log_level=log_level) as runner:
+            for fast, slow in grid:
+                summary = result_summary(runner.run(strategy, fast, slow))
+                in_sample_results.append(
+                    {"fast_period": fast, "slow_period": slow, **summary}
+                )
+
+    fold_result = {
+        **asdict(fold),
+        "in_sample": in_sample_results,
+        "best": None,
+        "out_of_sample": None,
+        "equity": [],
+    }
+    out_of_sample = _fold_stream(fold.out_of_sample_start, fold.out_of_sample_end)
+    if not in_sample_results or out_of_sample is None:
+        return replace_nan_to_none(fold_result)
+
+    best = max(in_sample_results, key=_score)
+    fold_result["best"] = {
+        "fast_period": best["fast_period"],
+        "slow_period": best["slow_period"],
+    }
+    with BacktestRunner(out_of_sample, log_level=log_level) as runner:
+        result = runner.run(strategy, best["fast_period"], best["slow_period"])
+        account = runner.engine.trader.generate_account_report(out_of_sample.venue)
+
+    fold_result["out_of_sample"] = vars(result)
+    # Balance after every account event, as PnL since the start of the fold
+    pnl = pd.to_numeric(account["total"]) - STARTING_BALANCE
+    fold_result["equity"] = [[int(ts.value), float(value)] for ts, value in pnl.items()]
+    return replace_nan_to_none(fold_result)
+
+
+def run_walkforward(  # noqa: PLR0913
+    data: BacktestData,
+    strategy_name: str,
+    grid: list[tuple[int, int]],
+    folds: list[Fold],
+    max_workers: int | None = None,
+    log_level: str = WALKFORWARD_LOG_LEVEL,
+) -> list[dict[str, Any]]:
+    """
+    Run the folds concurrently on a process pool, results in the order of `folds`.
+
+    The bars are published once in a memory-mapped file, and every fold streams the
+    bars of its own ranges from it. The engines log at `log_level`,
+    THROUGHPUT_LOG_LEVEL bypasses their logging.
+    """
+    with (
+        SharedBars.publish(data.bars) as shared_bars,
+        ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(shared_bars.handle, data.instrument),
+        ) as executor,
+    ):
+        return list(
+            executor.map(
+                run_fold,
+                [strategy_name] * len(folds),
+                [grid] * len(folds),
+                folds,
+                [log_level] * len(folds),
+            )
+        )
+
+
+def stitch_out_of_sample(fold_results: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Out-of-sample equity of the folds chained one after another, summarised in the
+    shape of a backtest result so `BacktestReportGenerator` can render it.
+    """
+    evaluated = [f for f in fold_results if f["out_of_sample"] is not None]
+
+    equity = []
+    offset = 0.0
+    for fold in evaluated:
+        equity.extend([ts, offset + pnl] for ts, pnl in fold["equity"])
+        if fold["equity"]:
+            offset += fold["equity"][-1][1]
+
+    balance = pd.Series(
+        [STARTING_BALANCE + pnl for _, pnl in equity],
+        index=pd.to_datetime([ts for ts, _ in equity], unit="ns", utc=True),
+        dtype=float,
+    )
+    returns = balance.resample("1D").last().dropna().pct_change().dropna()
+    volatility = returns.std() * np.sqrt(252) if len(returns) > 1 else math.nan
+    sharpe = (
+        returns.mean() / returns.std() * np.sqrt(252)
+        if len(returns) > 1 and returns.std()
+        else math.nan
+    )
+    drawdown = (balance.cummax() - balance).max() if len(balance) else 0.0
+    fold_pnls = [fold["equity"][-1][1] for fold in evaluated if fold["equity"]]
+
+    runs = [fold["out_of_sample"] for fold in evaluated]
+    summary = {
+        "run_id": str(uuid.uuid4()),
+        "trader_id": runs[0]["trader_id"] if runs else None,
+        "instance_id": None,
+        "machine_id": runs[0]["machine_id"] if runs else None,
+        "run_config_id": None,
+        "run_started": min((run["run_started"] for run in runs), default=None),
+        "run_finished": max((run["run_finished"] for run in runs), default=None),
+        "backtest_start": evaluated[0]["out_of_sample_start"] if evaluated else None,
+        "backtest_end": evaluated[-1]["out_of_sample_end"] if evaluated else None,
+        "elapsed_time": sum(run["elapsed_time"] for run in runs),
+        "iterations": sum(run["iterations"] for run in runs),
+        "total_events": sum(run["total_events"] for run in runs),
+        "total_orders": sum(run["total_orders"] for run in runs),
+        "total_positions": sum(run["total_positions"] for run in runs),
+        "stats_pnls": {
+            "USD": {
+                "PnL (total)": offset,
+                "PnL% (total)": offset / STARTING_BALANCE * 100,
+                "Max Drawdown": float(drawdown),
+                "Folds": len(evaluated),
+                "Winning Folds": sum(pnl > 0 for pnl in fold_pnls),
+            }
+        },
+        "stats_returns": {
+            "Average (Return)": returns.mean() if len(returns) else math.nan,
+            "Returns Volatility (252 days)": volatility,
+            "Sharpe Ratio (252 days)": sharpe,
+        },
+        "folds": [
+            {
+                "index": fold["index"],
+                "out_of_sample_start": fold["out_of_sample_start"],
+                "out_of_sample_end": fold["out_of_sample_end"],
+                "best": fold["best"],
+                "pnl": fold["equity"][-1][1] if fold["equity"] else 0.0,
+            }
+            for fold in evaluated
+        ],
+        "equity": equity,
+    }
+    return replace_nan_to_none(summary)
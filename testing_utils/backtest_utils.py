@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from nautilus_trader.model import InstrumentId
+
+from src.backtest import BacktestData, create_instrument
+from src.bars import load_bars
+from src.utils import date_to_ns
+
+if TYPE_CHECKING:
+    from src.catalog import PriceDataCatalog
+
+# Instrument of the bars written by `write_ohlcv_dbn`
+INSTRUMENT_ID = InstrumentId.from_str("ES.v.0.GLBX")
+DATA_START = "2024-01-02"
+
+
+def catalog_backtest_data(catalog: PriceDataCatalog) -> BacktestData:
+    """Every bar of `catalog`, traded on an instrument active from DATA_START."""
+    bars = load_bars(catalog, catalog.entries, INSTRUMENT_ID)
+    instrument = create_instrument(
+        symbol_str=INSTRUMENT_ID.symbol.value,
+        venue_str=INSTRUMENT_ID.venue.value,
+        activation_ns=date_to_ns(DATA_START),
+        expiration_ns=bars[-1].ts_event,
+    )
+    return BacktestData(bars=bars, instrument=instrument)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+from databento import BentoServerError
+from databento.common.dbnstore import DBNStore
+
+from testing_utils.dbn_utils import MINUTE_NS, ohlcv_dbn_bytes, to_ns
+
+if TYPE_CHECKING:
+    from os import PathLike
+
+
+class FakeTimeseries:
+    """
+    Offline stand-in for `databento.Historical().timeseries` serving one synthetic
+    OHLCV-1m record per minute of the requested range.
+    """
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.calls: list[dict] = []
+        self._lock = threading.Lock()
+
+    def get_range(  # noqa: PLR0913
+        self,
+        dataset: str,
+        start: str,
+        end: str | None = None,
+        symbols: str | None = None,
+        schema: str = "trades",
+        stype_in: str = "raw_symbol",
+        stype_out: str = "instrument_id",
+        limit: int | None = None,
+        path: PathLike[str] | str | None = None,
+    ) -> DBNStore:
+        with self._lock:
+            self.calls.append(
+                {
+                    "dataset": dataset,
+                    "start": start,
+                    "end": end,
+                    "symbols": symbols,
+                    "schema": schema,
+                    "stype_in": stype_in,
+                    "stype_out": stype_out,
+                    "limit": limit,
+                }
+            )
+            if self.failures:
+                self.failures -= 1
+                raise BentoServerError(http_status=503, message="Service unavailable")
+
+        start_ns = to_ns(start)
+        end_ns = to_ns(end)
+        count = (end_ns - start_ns) // MINUTE_NS
+        if limit:
+            count = min(count, limit)
+
+        data = ohlcv_dbn_bytes(
+            start,
+            count,
+            end=end,
+            seed=start_ns // MINUTE_NS,
+            dataset=dataset,
+            symbol=symbols,
+        )
+        if path is None:
+            return DBNStore.from_bytes(data)
+
+        with open(path, "xb") as f:  # noqa: PTH123
+            f.write(data)
+        return DBNStore.from_file(path)
+
+
+class FakeHistorical:
+    def __init__(self, key: str | None = None, failures: int = 0):
+        self.key = key
+        self.timeseries = FakeTimeseries(failures=failures)
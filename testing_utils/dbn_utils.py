@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from databento.common.dbnstore import DBNStore
+
+from src.synthetic_data import (
+    MINUTE_NS,
+    PRICE_SCALE,
+    ohlcv_dbn_bytes,
+    ohlcv_records,
+    to_ns,
+    write_ohlcv_dbn,
+)
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+__all__ = [
+    "MINUTE_NS",
+    "PRICE_SCALE",
+    "ohlcv_dbn_bytes",
+    "ohlcv_dbn_store",
+    "ohlcv_records",
+    "to_ns",
+    "write_ohlcv_dbn",
+]
+
+
+def ohlcv_dbn_store(start: str | datetime, count: int, **kwargs: object) -> DBNStore:
+    return DBNStore.from_bytes(ohlcv_dbn_bytes(start, count, **kwargs))
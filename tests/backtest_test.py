@@ -0,0 +1,287 @@
+import json
+from functools import partial
+
+import pytest
+
+from config import config
+from src.backtest import (
+    STRATEGIES,
+    THROUGHPUT_LOG_LEVEL,
+    BacktestJob,
+    BacktestRunner,
+    BacktestStream,
+    logs_bars,
+    result_key,
+    run_backtest,
+    run_job,
+    run_streaming_backtest,
+    select_data,
+)
+from src.bars import bar_type_for, load_bars, stream_bars
+from src.indicators import IndicatorCache, bar_closes, series_path
+from src.parquet_store import ParquetBarStore
+from src.profiling import Profiler
+from src.result_cache import REPORT_NONE, ResultCache
+from src.trade_export import has_trades, read_trades
+from testing_utils.backtest_utils import DATA_START, INSTRUMENT_ID
+from testing_utils.dbn_utils import write_ohlcv_dbn
+
+
+@pytest.mark.parametrize("strategy_name", ["ma_cross", "ema_cross"])
+def test_runner_reset_matches_new_engines(data, strategy_name):
+    strategy = STRATEGIES[strategy_name]
+    grid = [(5, 20), (10, 30), (5, 20)]
+
+    with BacktestRunner(data, log_level="ERROR") as runner:
+        results = []
+        for fast, slow in grid:
+            results.append(runner.run(strategy, fast, slow))
+            assert runner.overhead > 0
+            assert runner.run_time > 0
+
+    for result, (fast, slow) in zip(results, grid, strict=True):
+        expected = run_backtest(data, strategy, fast, slow, log_level="ERROR")
+        assert result.stats_pnls == expected.stats_pnls
+        assert result.total_orders == expected.total_orders
+        assert result.iterations == expected.iterations
+
+
+@pytest.mark.parametrize("strategy_name", ["ma_cross", "ema_cross"])
+def test_streaming_matches_in_memory(catalog, data, strategy_name):
+    stream = BacktestStream(
+        bar_type=bar_type_for(INSTRUMENT_ID, "ohlcv-1m"),
+        instrument=data.instrument,
+        chunks=partial(
+            stream_bars, catalog, catalog.entries, INSTRUMENT_ID, chunk_size=64
+        ),
+    )
+    strategy = STRATEGIES[strategy_name]
+
+    result = run_streaming_backtest(stream, strategy, 10, 30, log_level="ERROR")
+
+    expected = run_backtest(data, strategy, 10, 30, log_level="ERROR")
+    assert result.stats_pnls == expected.stats_pnls
+    assert result.stats_returns == pytest.approx(expected.stats_returns, nan_ok=True)
+    assert result.total_orders == expected.total_orders
+    assert result.iterations == expected.iterations
+    assert result.backtest_start == expected.backtest_start
+    assert result.backtest_end == expected.backtest_end
+
+
+def test_runner_streams_again_after_reset(catalog, data):
+    stream = BacktestStream(
+        bar_type=bar_type_for(INSTRUMENT_ID, "ohlcv-1m"),
+        instrument=data.instrument,
+        chunks=partial(
+            stream_bars, catalog, catalog.entries, INSTRUMENT_ID, chunk_size=64
+        ),
+    )
+    strategy = STRATEGIES["ma_cross"]
+    grid = [(5, 20), (10, 30)]
+
+    with BacktestRunner(stream, log_level="ERROR") as runner:
+        results = [runner.run(strategy, fast, slow) for fast, slow in grid]
+
+    for result, (fast, slow) in zip(results, grid, strict=True):
+        expected = run_backtest(data, strategy, fast, slow, log_level="ERROR")
+        assert result.stats_pnls == expected.stats_pnls
+        assert result.iterations == expected.iterations
+
+
+def test_streaming_rejects_empty_stream(data):
+    stream = BacktestStream(
+        bar_type=bar_type_for(INSTRUMENT_ID, "ohlcv-1m"),
+        instrument=data.instrument,
+        chunks=lambda: iter([]),
+    )
+
+    with pytest.raises(ValueError):
+        run_streaming_backtest(stream, STRATEGIES["ma_cross"], 10, 30, "ERROR")
+
+
+def test_result_key_depends_on_every_input():
+    strategy = STRATEGIES["ma_cross"]
+    bar_type = bar_type_for(INSTRUMENT_ID, "ohlcv-1m")
+    key = result_key("data", strategy, INSTRUMENT_ID, bar_type, 10, 30)
+
+    assert key == result_key("data", strategy, INSTRUMENT_ID, bar_type, 10, 30)
+    assert (
+        len(
+            {
+                key,
+                result_key("other", strategy, INSTRUMENT_ID, bar_type, 10, 30),
+                result_key(
+                    "data", STRATEGIES["ema_cross"], INSTRUMENT_ID, bar_type, 10, 30
+                ),
+                result_key("data", strategy, INSTRUMENT_ID, bar_type, 5, 30),
+                result_key(
+                    "data", strategy, INSTRUMENT_ID, bar_type, 10, 30, trade_size=50
+                ),
+            }
+        )
+        == 5
+    )
+
+
+@pytest.mark.parametrize(
+    ("log_level", "expected"),
+    [(None, True), ("DEBUG", True), ("INFO", True), ("ERROR", False), ("OFF", False)],
+)
+def test_logs_bars(log_level, expected):
+    assert logs_bars(log_level) is expected
+
+
+@pytest.mark.parametrize("strategy_name", ["ma_cross", "ema_cross"])
+def test_throughput_mode_matches_logged_run(data, strategy_name):
+    strategy = STRATEGIES[strategy_name]
+
+    result = run_backtest(data, strategy, 10, 30, log_level=THROUGHPUT_LOG_LEVEL)
+
+    expected = run_backtest(data, strategy, 10, 30, log_level="INFO")
+    assert result.stats_pnls == expected.stats_pnls
+    assert result.total_orders == expected.total_orders
+
+
+@pytest.mark.parametrize("strategy_name", ["ma_cross", "ema_cross"])
+def test_precomputed_indicators_match_indicators(data, tmp_path, strategy_name):
+    strategy = STRATEGIES[strategy_name]
+    indicators = IndicatorCache(tmp_path / "indicator_cache", max_bytes=1024**2)
+
+    with BacktestRunner(data, log_level="ERROR", indicators=indicators) as runner:
+        results = [runner.run(strategy, fast, slow) for fast, slow in [(5, 20), (10, 30)]]
+
+    for result, (fast, slow) in zip(results, [(5, 20), (10, 30)], strict=True):
+        expected = run_backtest(data, strategy, fast, slow, log_level="ERROR")
+        assert result.stats_pnls == expected.stats_pnls
+        assert result.total_orders == expected.total_orders
+    assert len(list(indicators.directory.glob("*.npy"))) == 4
+
+
+def test_runner_skips_precompute_of_cached_indicators(data, tmp_path, monkeypatch):
+    strategy = STRATEGIES["ma_cross"]
+    indicators = IndicatorCache(tmp_path / "indicator_cache", max_bytes=1024**2)
+    data_hash = indicators.precompute(bar_closes(data.bars), "sma", [5, 20, 30])
+    # Evicted by another process since it was computed
+    series_path(indicators.directory, data_hash, "sma", 30).unlink()
+    precompute = indicators.precompute
+    precomputed = []
+
+    def tracked_precompute(closes, kind, periods, data_hash=None):
+        precomputed.append(periods)
+        return precompute(closes, kind, periods, data_hash=data_hash)
+
+    monkeypatch.setattr(indicators, "precompute", tracked_precompute)
+
+    with BacktestRunner(
+        data, log_level="ERROR", indicators=indicators, indicator_data=data_hash
+    ) as runner:
+        runner.run(strategy, 5, 20)
+        runner.run(strategy, 5, 30)
+
+    assert precomputed == [[5, 30]]
+    assert indicators.has_series(data_hash, "sma", [5, 20, 30])
+
+
+@pytest.mark.parametrize("chunk_size", [None, 64])
+def test_run_job_profile(catalog, tmp_path, monkeypatch, chunk_size):
+    monkeypatch.setattr(config, "price_data_path", lambda: str(catalog.root))
+    monkeypatch.setattr(config, "bar_cache_path", lambda: str(tmp_path / "bar_cache"))
+    cache = ResultCache(tmp_path / "cache")
+    job = BacktestJob("ma_cross", 10, 30, chunk_size=chunk_size)
+    cached = run_job(job, cache, log_level="ERROR")
+    profiler = Profiler(tmp_path / "profile")
+
+    job_result = run_job(job, cache, log_level="ERROR", profiler=profiler)
+
+    # Profiled backtests run even when they are in the cache
+    assert not job_result.cached
+    assert job_result.key == cached.key
+    phases = ["metadata", "decode", "engine_setup", "engine_run", "save", "report"]
+    assert list(profiler.phases) == phases
+    assert all((tmp_path / "profile" / f"{name}.prof").exists() for name in phases)
+    assert cache.data(job_result.key)["profile"] == json.loads(
+        json.dumps(profiler.phases)
+    )
+    assert cache.pdf_path(job_result.key).exists()
+
+
+@pytest.mark.parametrize("chunk_size", [None, 64])
+def test_run_job_exports_trades(catalog, tmp_path, monkeypatch, chunk_size):
+    monkeypatch.setattr(config, "price_data_path", lambda: str(catalog.root))
+    monkeypatch.setattr(config, "bar_cache_path", lambda: str(tmp_path / "bar_cache"))
+    monkeypatch.setattr(config, "trades_path", lambda: str(tmp_path / "trades"))
+    cache = ResultCache(tmp_path / "cache")
+    job = BacktestJob("ma_cross", 10, 30, chunk_size=chunk_size)
+    cached = run_job(job, cache, log_level="ERROR", report=REPORT_NONE)
+
+    exported = run_job(job, cache, log_level="ERROR", report=REPORT_NONE, export=True)
+    again = run_job(job, cache, log_level="ERROR", report=REPORT_NONE, export=True)
+
+    assert cached.trades_dir is None
+    # A cached result without an export runs again to export its trades
+    assert not exported.cached
+    assert exported.trades_dir == tmp_path / "trades" / cached.key
+    assert has_trades(exported.trades_dir)
+    assert again.cached
+    assert again.trades_dir == exported.trades_dir
+    fills = read_trades(exported.trades_dir, "fills")
+    assert fills["client_order_id"].nunique() <= exported.result.total_orders
+
+
+def test_run_job_on_resampled_timeframe(catalog, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "price_data_path", lambda: str(catalog.root))
+    monkeypatch.setattr(config, "bar_cache_path", lambda: str(tmp_path / "bar_cache"))
+    monkeypatch.setattr(config, "resampled_path", lambda: str(tmp_path / "resampled"))
+    cache = ResultCache(tmp_path / "cache")
+    minute = run_job(BacktestJob("ma_cross", 3, 5), cache, log_level="ERROR")
+
+    job_result = run_job(
+        BacktestJob("ma_cross", 3, 5, timeframe="15m"), cache, log_level="ERROR"
+    )
+
+    assert job_result.key != minute.key
+    assert not job_result.cached
+    # 600 1-minute bars in 40 15-minute bars
+    assert job_result.result.iterations == 40
+    assert minute.result.iterations == 600
+
+
+def test_parquet_selection_requires_converted_files(catalog, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "price_data_path", lambda: str(catalog.root))
+    monkeypatch.setattr(config, "parquet_path", lambda: str(tmp_path / "parquet"))
+    selection = select_data(source="parquet")
+    store = ParquetBarStore(tmp_path / "parquet")
+    bars = load_bars(catalog, catalog.entries, INSTRUMENT_ID)
+    store.write(bars[:300])
+
+    with pytest.raises(ValueError, match="bt convert"):
+        selection.fingerprint()
+    with pytest.raises(ValueError, match="bt convert"):
+        selection.load()
+
+    # A store missing bars of its converted files gets another key
+    store.mark_converted(catalog.entries[0])
+    partial_fingerprint = selection.fingerprint()
+    store.write(bars)
+    assert selection.fingerprint() != partial_fingerprint
+
+    data = selection.load()
+    stream = selection.stream(chunk_size=64)
+    assert data.bars == bars
+    assert stream.instrument.expiration_ns == data.instrument.expiration_ns
+    assert stream.fingerprint == data.fingerprint
+
+
+def test_select_data_reads_one_symbol(tmp_path, monkeypatch):
+    write_ohlcv_dbn(tmp_path / "es.dbn", DATA_START, 60)
+    write_ohlcv_dbn(tmp_path / "nq.dbn", DATA_START, 60, symbol="NQ.v.0")
+    monkeypatch.setattr(config, "price_data_path", lambda: str(tmp_path))
+    monkeypatch.setattr(config, "bar_cache_path", lambda: str(tmp_path / "bar_cache"))
+
+    selection = select_data()
+    assert [entry.path for entry in selection.entries] == ["es.dbn"]
+    assert len(selection.load().bars) == 60
+
+    selection = select_data(symbol="NQ.v.0")
+    assert [entry.path for entry in selection.entries] == ["nq.dbn"]
+    assert select_data(symbol="CL.v.0") is None
@@ -0,0 +1,72 @@
+import os
+
+import pytest
+from nautilus_trader.adapters.databento import DatabentoDataLoader
+from nautilus_trader.model import InstrumentId
+
+from src.bar_cache import BarCache
+from testing_utils.backtest_utils import INSTRUMENT_ID
+from testing_utils.dbn_utils import write_ohlcv_dbn
+
+
+class FailingLoader:
+    def from_dbn_file(self, **_kwargs):
+        err = "Cached bars must not be decoded"
+        raise AssertionError(err)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return write_ohlcv_dbn(tmp_path / "data.dbn", "2024-01-02", 120)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return BarCache(tmp_path / "bar_cache", max_bytes=1024**2)
+
+
+def test_load_decodes_once(cache, path, monkeypatch):
+    bars = cache.load(path, INSTRUMENT_ID)
+    monkeypatch.setattr("src.bar_cache.DatabentoDataLoader", FailingLoader)
+
+    assert cache.load(path, INSTRUMENT_ID) == bars
+    assert bars == DatabentoDataLoader().from_dbn_file(path, instrument_id=INSTRUMENT_ID)
+
+
+def test_changed_file_is_decoded_again(cache, path):
+    cache.load(path, INSTRUMENT_ID)
+    write_ohlcv_dbn(path, "2024-01-03", 30)
+
+    bars = cache.load(path, INSTRUMENT_ID)
+
+    assert len(bars) == 30
+
+
+def test_key_depends_on_instrument_id(cache, path):
+    nq_id = InstrumentId.from_str("NQ.v.0.GLBX")
+
+    assert cache.key(path, INSTRUMENT_ID) != cache.key(path, nq_id)
+    cache.load(path, INSTRUMENT_ID)
+    assert cache.get(path, nq_id) is None
+
+
+def test_evicts_least_recently_used(tmp_path):
+    paths = [
+        write_ohlcv_dbn(tmp_path / f"{day}.dbn", f"2024-01-0{day}", 100)
+        for day in (2, 3, 4)
+    ]
+    cache = BarCache(tmp_path / "bar_cache", max_bytes=1024**2)
+    for i, path in enumerate(paths[:2]):
+        cache.load(path, INSTRUMENT_ID)
+        records_path = cache.directory / f"{cache.key(path, INSTRUMENT_ID)}.npy"
+        os.utime(records_path, ns=(i, i))
+    entry_size = cache.size() // 2
+
+    cache.get(paths[0], INSTRUMENT_ID)
+    cache.max_bytes = 2 * entry_size
+    cache.load(paths[2], INSTRUMENT_ID)
+
+    assert cache.get(paths[0], INSTRUMENT_ID) is not None
+    assert cache.get(paths[1], INSTRUMENT_ID) is None
+    assert cache.get(paths[2], INSTRUMENT_ID) is not None
+    assert cache.size() == 2 * entry_size
@@ -0,0 +1,96 @@
+import pytest
+from databento.common.dbnstore import DBNStore
+
+from src.bar_cache import BarCache
+from src.bars import load_bars, stream_bars
+from src.catalog import PriceDataCatalog
+from src.utils import date_to_ns
+from testing_utils.backtest_utils import INSTRUMENT_ID
+from testing_utils.dbn_utils import MINUTE_NS, write_ohlcv_dbn
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    write_ohlcv_dbn(tmp_path / "first.dbn", "2024-01-02T00:00:00", 120)
+    write_ohlcv_dbn(tmp_path / "second.dbn", "2024-01-02T01:00:00", 120, seed=1)
+    return PriceDataCatalog.load(tmp_path)
+
+
+def test_load_bars_merges_overlapping_files(catalog):
+    bars = load_bars(catalog, catalog.entries, INSTRUMENT_ID)
+
+    timestamps = [bar.ts_event for bar in bars]
+    assert len(bars) == 180
+    assert timestamps == sorted(set(timestamps))
+    assert timestamps[0] == date_to_ns("2024-01-02") + MINUTE_NS
+
+
+def test_load_bars_keeps_bars_opening_in_range(catalog):
+    start = date_to_ns("2024-01-02") + 30 * MINUTE_NS
+    end = date_to_ns("2024-01-02") + 90 * MINUTE_NS
+
+    bars = load_bars(catalog, catalog.entries, INSTRUMENT_ID, start=start, end=end)
+
+    assert len(bars) == 60
+    assert bars[0].ts_event == start + MINUTE_NS
+    assert bars[-1].ts_event == end
+
+
+def test_load_bars_rejects_mixed_symbols(catalog, tmp_path):
+    write_ohlcv_dbn(tmp_path / "nq.dbn", "2024-01-02", 10, symbol="NQ.v.0")
+    catalog.refresh()
+
+    with pytest.raises(ValueError):
+        load_bars(catalog, catalog.entries, INSTRUMENT_ID)
+
+
+def test_load_bars_reads_cached_files(catalog, tmp_path):
+    cache = BarCache(tmp_path / "bar_cache", max_bytes=1024**2)
+
+    bars = load_bars(catalog, catalog.entries, INSTRUMENT_ID, cache=cache)
+
+    assert bars == load_bars(catalog, catalog.entries, INSTRUMENT_ID)
+    assert load_bars(catalog, catalog.entries, INSTRUMENT_ID, cache=cache) == bars
+    assert len(list(cache.directory.glob("*.npy"))) == 2
+
+
+def bar_fields(bars):
+    return [
+        (str(bar), bar.open.precision, bar.volume.precision, bar.ts_init) for bar in bars
+    ]
+
+
+@pytest.mark.parametrize(
+    ("start", "end"),
+    [
+        (None, None),
+        (date_to_ns("2024-01-02") + 30 * MINUTE_NS, None),
+        (None, date_to_ns("2024-01-02") + 90 * MINUTE_NS),
+    ],
+)
+def test_stream_bars_matches_load_bars(catalog, start, end):
+    bars = load_bars(catalog, catalog.entries, INSTRUMENT_ID, start=start, end=end)
+
+    chunks = list(
+        stream_bars(
+            catalog, catalog.entries, INSTRUMENT_ID, start=start, end=end, chunk_size=25
+        )
+    )
+
+    assert all(0 < len(chunk) <= 25 for chunk in chunks)
+    assert bar_fields([bar for chunk in chunks for bar in chunk]) == bar_fields(bars)
+
+
+def test_stream_bars_opens_files_when_reached(catalog, monkeypatch):
+    opened = []
+    from_file = DBNStore.from_file
+    monkeypatch.setattr(
+        "src.bars.DBNStore.from_file",
+        lambda path: opened.append(path.name) or from_file(path),
+    )
+    chunks = stream_bars(catalog, catalog.entries, INSTRUMENT_ID, chunk_size=30)
+
+    next(chunks)
+    assert opened == ["first.dbn"]
+    list(chunks)
+    assert opened == ["first.dbn", "second.dbn"]
@@ -0,0 +1,119 @@
+import pytest
+
+from config import config
+from src.backtest import BacktestJob
+from src.batch import (
+    DONE,
+    NO_DATA,
+    PENDING,
+    BatchState,
+    job_key,
+    load_jobs,
+    parse_job,
+    run_batch,
+)
+from src.result_cache import ResultCache
+from testing_utils.dbn_utils import write_ohlcv_dbn
+
+
+@pytest.fixture
+def price_data(tmp_path, monkeypatch):
+    root = tmp_path / "price_data"
+    root.mkdir()
+    write_ohlcv_dbn(root / "data.dbn", "2024-01-02", 600)
+    monkeypatch.setattr(config, "price_data_path", lambda: str(root))
+    monkeypatch.setattr(config, "bar_cache_path", lambda: str(root / "bar_cache"))
+    monkeypatch.setattr(config, "parquet_path", lambda: str(root / "parquet"))
+    return root
+
+
+def test_parse_job_defaults():
+    job = parse_job({"strategy": "ma_cross", "fast_period": 10, "slow_period": 30})
+
+    assert job == BacktestJob(strategy="ma_cross", fast_period=10, slow_period=30)
+    assert job.trade_size == 100
+    assert job.source == "dbn"
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        [],
+        {"strategy": "ma_cross", "fast_period": 10},
+        {"strategy": "rsi", "fast_period": 10, "slow_period": 30},
+        {"strategy": "ma_cross", "fast_period": 30, "slow_period": 10},
+        {"strategy": "ma_cross", "fast_period": "10", "slow_period": 30},
+        {"strategy": "ma_cross", "fast_period": 10, "slow_period": 30, "trade_size": 0},
+        {"strategy": "ma_cross", "fast_period": 10, "slow_period": 30, "start": "x"},
+        {"strategy": "ma_cross", "fast_period": 10, "slow_period": 30, "source": "csv"},
+        {"strategy": "ma_cross", "fast_period": 10, "slow_period": 30, "size": 1},
+        {"strategy": "ma_cross", "fast_period": 10, "slow_period": 30, "timeframe": "2m"},
+        {
+            "strategy": "ma_cross",
+            "fast_period": 10,
+            "slow_period": 30,
+            "timeframe": "1h",
+            "source": "parquet",
+        },
+    ],
+)
+def test_parse_job_rejects_invalid_specs(spec):
+    with pytest.raises((TypeError, ValueError)):
+        parse_job(spec)
+
+
+def test_load_jobs_reports_line_number(tmp_path):
+    path = tmp_path / "jobs.jsonl"
+    path.write_text(
+        '{"strategy": "ma_cross", "fast_period": 10, "slow_period": 30}\n'
+        "\n"
+        '{"strategy": "ma_cross", "fast_period": 10}\n'
+    )
+
+    with pytest.raises(ValueError, match=r"jobs.jsonl:3: Missing fields"):
+        load_jobs(path)
+
+
+def test_job_key_depends_on_spec():
+    job = BacktestJob(strategy="ma_cross", fast_period=10, slow_period=30)
+
+    assert job_key(job) == job_key(BacktestJob("ma_cross", 10, 30))
+    assert job_key(job) != job_key(BacktestJob("ma_cross", 10, 30, trade_size=50))
+
+
+def test_run_batch_resumes_unfinished_jobs(price_data, tmp_path):
+    jobs = [
+        BacktestJob(strategy="ma_cross", fast_period=10, slow_period=30),
+        BacktestJob(strategy="ema_cross", fast_period=5, slow_period=20, trade_size=50),
+        BacktestJob(
+            strategy="ma_cross", fast_period=5, slow_period=20, start="2025-01-01"
+        ),
+    ]
+    output_dir = tmp_path / "results"
+    state = BatchState(output_dir / "state.json")
+    cache = ResultCache(tmp_path / "cache")
+
+    assert run_batch(jobs, state, cache, max_workers=2)
+
+    keys = [job_key(job) for job in jobs]
+    assert [state.status(key) for key in keys] == [DONE, DONE, NO_DATA]
+    result_key = state.jobs[keys[0]]["result"]
+    assert not state.jobs[keys[0]]["cached"]
+    assert cache.pdf_path(result_key).exists()
+    pnl = cache.data(result_key)["stats_pnls"]["USD"]["PnL (total)"]
+    assert state.jobs[keys[0]]["summary"]["pnl"] == pnl
+
+    # A crash while the first job was running
+    state.jobs[keys[0]]["status"] = PENDING
+    state.save()
+    finished = []
+
+    resumed = BatchState(output_dir / "state.json")
+    run_batch(jobs, resumed, cache, on_finish=lambda key, _: finished.append(key))
+
+    assert sorted(finished) == sorted([keys[0], keys[2]])
+    assert resumed.status(keys[0]) == DONE
+    # Its result was saved before the crash, so it is read from the cache
+    assert resumed.jobs[keys[0]]["cached"]
+    assert resumed.jobs[keys[0]]["result"] == result_key
+    assert resumed.jobs[keys[0]]["summary"]["pnl"] == pnl
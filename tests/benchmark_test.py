@@ -0,0 +1,35 @@
+from src.benchmark import benchmark_imports, benchmark_size, find_regressions
+
+
+def test_benchmark_size(tmp_path):
+    benchmarks = benchmark_size("1d", tmp_path, repeat=1)
+
+    assert set(benchmarks) == {
+        "load[1d]",
+        "save[1d]",
+        "report[1d]",
+        "ma_cross[1d]",
+        "ema_cross[1d]",
+    }
+    assert all(seconds > 0 for seconds in benchmarks.values())
+    assert benchmarks["ma_cross[1d]"] > benchmarks["load[1d]"]
+
+
+def test_benchmark_imports():
+    benchmarks = benchmark_imports(repeat=1)
+
+    assert set(benchmarks) == {"import[cli.main]", "import[src.backtest]"}
+    # The subcommands are imported when they run
+    assert benchmarks["import[cli.main]"] < benchmarks["import[src.backtest]"]
+
+
+def test_find_regressions():
+    baseline = {"benchmarks": {"slower": 1.0, "jitter": 0.01, "faster": 1.0}}
+    run = {"benchmarks": {"slower": 1.5, "jitter": 0.02, "faster": 0.5, "new": 1.0}}
+
+    regressions = find_regressions(run, baseline, threshold=0.2)
+
+    assert regressions == [
+        {"name": "slower", "baseline_s": 1.0, "seconds": 1.5, "ratio": 1.5}
+    ]
+    assert find_regressions(run, baseline, threshold=0.6) == []
@@ -0,0 +1,109 @@
+import os
+
+import pytest
+
+from src.catalog import PriceDataCatalog, scan_dbn_file
+from src.utils import date_to_ns
+from testing_utils.dbn_utils import MINUTE_NS, write_ohlcv_dbn
+
+
+@pytest.fixture
+def root(tmp_path):
+    partitions = tmp_path / "partitions"
+    partitions.mkdir()
+    for day in ("2024-01-02", "2024-01-03", "2024-01-04"):
+        write_ohlcv_dbn(partitions / f"{day}.dbn", day, 60)
+    write_ohlcv_dbn(tmp_path / "overlap.dbn", "2024-01-03T12:00:00", 1440)
+    return tmp_path
+
+
+@pytest.fixture
+def catalog(root):
+    return PriceDataCatalog.load(root)
+
+
+def test_load_indexes_every_file(catalog, root):
+    entries = catalog.entries
+
+    assert [e.path for e in entries] == [
+        "partitions/2024-01-02.dbn",
+        "partitions/2024-01-03.dbn",
+        "overlap.dbn",
+        "partitions/2024-01-04.dbn",
+    ]
+    assert entries[0].start == date_to_ns("2024-01-02")
+    assert entries[0].end == date_to_ns("2024-01-02") + 59 * MINUTE_NS
+    assert entries[0].count == 60
+    assert entries[0].dataset == "GLBX.MDP3"
+    assert entries[0].schema == "ohlcv-1m"
+    assert entries[0].symbol == "ES.v.0"
+    assert (root / PriceDataCatalog.INDEX_FILENAME).exists()
+
+
+def test_load_reads_existing_index(catalog, root):
+    (root / "partitions" / "2024-01-02.dbn").unlink()
+
+    assert PriceDataCatalog.load(root).entries == catalog.entries
+
+
+@pytest.mark.parametrize(
+    ("start", "end", "expected"),
+    [
+        (
+            None,
+            None,
+            ["2024-01-02.dbn", "2024-01-03.dbn", "overlap.dbn", "2024-01-04.dbn"],
+        ),
+        ("2024-01-02", "2024-01-03", ["2024-01-02.dbn"]),
+        ("2024-01-03", None, ["2024-01-03.dbn", "overlap.dbn", "2024-01-04.dbn"]),
+        (None, "2024-01-03", ["2024-01-02.dbn"]),
+        ("2024-01-04", "2024-01-05", ["overlap.dbn", "2024-01-04.dbn"]),
+        ("2024-01-05", None, []),
+        ("2024-01-01", "2024-01-02", []),
+    ],
+)
+def test_query_returns_overlapping_entries(catalog, start, end, expected):
+    entries = catalog.query(
+        start=date_to_ns(start) if start else None,
+        end=date_to_ns(end) if end else None,
+    )
+
+    assert [e.path.split("/")[-1] for e in entries] == expected
+
+
+def test_query_filters_by_symbol(catalog, root):
+    write_ohlcv_dbn(root / "nq.dbn", "2024-01-02", 60, symbol="NQ.v.0")
+    catalog.refresh()
+
+    assert [e.path for e in catalog.query(symbol="NQ.v.0")] == ["nq.dbn"]
+    assert len(catalog.query(symbol="ES.v.0")) == 4
+
+
+def test_refresh_rescans_only_changed_files(catalog, root, monkeypatch):
+    scanned = []
+
+    def scan(path, root):
+        scanned.append(path.name)
+        return scan_dbn_file(path, root)
+
+    monkeypatch.setattr("src.catalog.scan_dbn_file", scan)
+    path = write_ohlcv_dbn(root / "overlap.dbn", "2024-01-05", 10)
+    os.utime(path, ns=(1, 1))
+    (root / "partitions" / "2024-01-02.dbn").unlink()
+
+    entries = catalog.refresh()
+
+    assert scanned == ["overlap.dbn"]
+    assert [e.path for e in entries][-1] == "overlap.dbn"
+    assert "partitions/2024-01-02.dbn" not in [e.path for e in entries]
+
+
+def test_add_replaces_entry_and_latest(catalog, root):
+    path = write_ohlcv_dbn(root / "partitions" / "2024-01-02.dbn", "2024-01-02", 10)
+    os.utime(path, ns=(10**19, 10**19))
+
+    entry = catalog.add(path)
+
+    assert entry.count == 10
+    assert [e.path for e in catalog.entries].count("partitions/2024-01-02.dbn") == 1
+    assert catalog.latest() == entry
@@ -78,6 +78,70 @@ def test_price_data_path(environment, expected_string):
         assert config.price_data_path() == expected_string
 
 
+@pytest.mark.parametrize(
+    ("environment", "expected_string"),
+    [
+        ("production", "price_data/production/parquet"),
+        ("development", "price_data/development/parquet"),
+        ("testing", "price_data/testing/parquet"),
+    ],
+)
+def test_parquet_path(environment, expected_string):
+    with temporary_disable_os_environ_is_test():
+        os.environ["ENVIRONMENT"] = environment
+        config = get_config()
+
+        assert config.parquet_path() == expected_string
+
+
+@pytest.mark.parametrize(
+    ("environment", "expected_string"),
+    [
+        ("production", "price_data/production/bar_cache"),
+        ("development", "price_data/development/bar_cache"),
+        ("testing", "price_data/testing/bar_cache"),
+    ],
+)
+def test_bar_cache_path(environment, expected_string):
+    with temporary_disable_os_environ_is_test():
+        os.environ["ENVIRONMENT"] = environment
+        config = get_config()
+
+        assert config.bar_cache_path() == expected_string
+
+
+@pytest.mark.parametrize(
+    ("environment", "expected_string"),
+    [
+        ("production", "price_data/production/resampled"),
+        ("development", "price_data/development/resampled"),
+        ("testing", "price_data/testing/resampled"),
+    ],
+)
+def test_resampled_path(environment, expected_string):
+    with temporary_disable_os_environ_is_test():
+        os.environ["ENVIRONMENT"] = environment
+        config = get_config()
+
+        assert config.resampled_path() == expected_string
+
+
+@pytest.mark.parametrize(
+    ("environment", "expected_string"),
+    [
+        ("production", "price_data/production/indicator_cache"),
+        ("development", "price_data/development/indicator_cache"),
+        ("testing", "price_data/testing/indicator_cache"),
+    ],
+)
+def test_indicator_cache_path(environment, expected_string):
+    with temporary_disable_os_environ_is_test():
+        os.environ["ENVIRONMENT"] = environment
+        config = get_config()
+
+        assert config.indicator_cache_path() == expected_string
+
+
 @pytest.mark.parametrize(
     ("environment", "expected_string"),
     [
@@ -92,3 +156,35 @@ def test_results_path(environment, expected_string):
         config = get_config()
 
         assert config.results_path() == expected_string
+
+
+@pytest.mark.parametrize(
+    ("environment", "expected_string"),
+    [
+        ("production", "results/production/cache"),
+        ("development", "results/development/cache"),
+        ("testing", "results/testing/cache"),
+    ],
+)
+def test_result_cache_path(environment, expected_string):
+    with temporary_disable_os_environ_is_test():
+        os.environ["ENVIRONMENT"] = environment
+        config = get_config()
+
+        assert config.result_cache_path() == expected_string
+
+
+@pytest.mark.parametrize(
+    ("environment", "expected_string"),
+    [
+        ("production", "results/production/trades"),
+        ("development", "results/development/trades"),
+        ("testing", "results/testing/trades"),
+    ],
+)
+def test_trades_path(environment, expected_string):
+    with temporary_disable_os_environ_is_test():
+        os.environ["ENVIRONMENT"] = environment
+        config = get_config()
+
+        assert config.trades_path() == expected_string
@@ -2,7 +2,24 @@ import os
 
 os.environ["ENVIRONMENT"] = "testing"
 
+import pytest
+
 from config import config as project_config
+from src.catalog import PriceDataCatalog
+from testing_utils.backtest_utils import DATA_START, catalog_backtest_data
+from testing_utils.dbn_utils import write_ohlcv_dbn
 
 if not project_config.is_testing():
     err = f"Invalid testing environment: {project_config}"
+
+
+@pytest.fixture(scope="session")
+def catalog(tmp_path_factory):
+    root = tmp_path_factory.mktemp("price_data")
+    write_ohlcv_dbn(root / "data.dbn", DATA_START, 600)
+    return PriceDataCatalog.load(root)
+
+
+@pytest.fixture(scope="session")
+def data(catalog):
+    return catalog_backtest_data(catalog)
@@ -1,8 +1,52 @@
 import pytest
+from databento.common.dbnstore import FileDataSource
 
+from src.catalog import PriceDataCatalog
 from src.databento_client import DatabentoClient
+from src.download_cache import DownloadCache
+from testing_utils.databento_fakes import FakeHistorical
 
 
 def test_init_with_empty_api_key_raises_value_error():
     with pytest.raises(ValueError):
         DatabentoClient(api_key="")
+
+
+@pytest.fixture
+def fake_historical(monkeypatch):
+    historical = FakeHistorical()
+    monkeypatch.setattr("databento.Historical", lambda _: historical)
+    return historical
+
+
+def test_get_range_with_path_streams_to_file(fake_historical, tmp_path):
+    client = DatabentoClient(api_key="db-test")
+    path = tmp_path / "data.dbn"
+
+    data = client.get_range("2024-01-01", "2024-01-02", limit=None, path=path)
+
+    assert path.exists()
+    assert isinstance(data._data_source, FileDataSource)
+    assert len(data.to_ndarray()) == 1440
+
+
+def test_download_missing_streams_only_new_ranges(fake_historical, tmp_path):
+    catalog = PriceDataCatalog(tmp_path)
+    client = DatabentoClient(
+        api_key="db-test",
+        cache=DownloadCache(directory=tmp_path / "cache", catalog=catalog),
+    )
+
+    first = client.download_missing("2024-01-01", "2024-01-02", limit=None)
+    second = client.download_missing("2024-01-01", "2024-01-03", limit=None)
+
+    assert len(first) == 1
+    assert len(second) == 1
+    assert [catalog.entry(path).count for path in [*first, *second]] == [1440, 1440]
+
+
+def test_download_missing_requires_cache(fake_historical):
+    client = DatabentoClient(api_key="db-test")
+
+    with pytest.raises(ValueError):
+        client.download_missing("2024-01-01", "2024-01-02")
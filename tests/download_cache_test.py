@@ -0,0 +1,140 @@
+import pytest
+from databento.common.dbnstore import DBNStore
+
+from src.catalog import PriceDataCatalog
+from src.databento_client import DatabentoClient
+from src.download_cache import DownloadCache, merge_dbn_stores
+from src.utils import date_to_ns
+from testing_utils.databento_fakes import FakeHistorical
+from testing_utils.dbn_utils import MINUTE_NS, ohlcv_dbn_bytes, ohlcv_dbn_store
+
+KEY = {"dataset": "GLBX.MDP3", "schema": "ohlcv-1m", "symbol": "ES.v.0"}
+
+
+@pytest.fixture
+def fake_historical(monkeypatch):
+    historical = FakeHistorical()
+    monkeypatch.setattr("databento.Historical", lambda _: historical)
+    return historical
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    return PriceDataCatalog(tmp_path)
+
+
+@pytest.fixture
+def cache(tmp_path, catalog):
+    return DownloadCache(directory=tmp_path / "cache", catalog=catalog)
+
+
+@pytest.fixture
+def client(fake_historical, cache):
+    return DatabentoClient(api_key="db-test", cache=cache)
+
+
+def requested_ranges(fake_historical):
+    return [(c["start"], c["end"]) for c in fake_historical.timeseries.calls]
+
+
+def test_get_range_without_cache_requests_the_full_range(fake_historical):
+    client = DatabentoClient(api_key="db-test")
+
+    data = client.get_range("2024-01-01", "2024-01-02", limit=None)
+
+    assert len(data.to_ndarray()) == 1440
+    assert requested_ranges(fake_historical) == [
+        ("2024-01-01T00:00:00", "2024-01-02T00:00:00")
+    ]
+
+
+def test_get_range_fetches_only_missing_ranges(client, fake_historical):
+    client.get_range("2024-01-02", "2024-01-03", limit=None)
+    fake_historical.timeseries.calls.clear()
+
+    data = client.get_range("2024-01-01", "2024-01-04", limit=None)
+
+    assert requested_ranges(fake_historical) == [
+        (date_to_ns("2024-01-01"), date_to_ns("2024-01-02")),
+        (date_to_ns("2024-01-03"), date_to_ns("2024-01-04")),
+    ]
+    ts_event = data.to_ndarray()["ts_event"]
+    assert len(ts_event) == 3 * 1440
+    assert ts_event[0] == date_to_ns("2024-01-01")
+    assert (ts_event[1:] - ts_event[:-1] == MINUTE_NS).all()
+    assert data.metadata.start == date_to_ns("2024-01-01")
+    assert data.metadata.end == date_to_ns("2024-01-04")
+
+
+def test_get_range_answers_covered_range_from_cache(client, fake_historical):
+    client.get_range("2024-01-01", "2024-01-03", limit=None)
+    fake_historical.timeseries.calls.clear()
+
+    data = client.get_range("2024-01-02", "2024-01-03", limit=None)
+
+    assert fake_historical.timeseries.calls == []
+    assert len(data.to_ndarray()) == 1440
+
+
+def test_limited_response_only_covers_up_to_last_record(client, cache):
+    client.get_range("2024-01-01", "2024-01-02", limit=60)
+
+    assert cache.missing(
+        start=date_to_ns("2024-01-01"),
+        end=date_to_ns("2024-01-02"),
+        **KEY,
+    ) == [(date_to_ns("2024-01-01") + 60 * MINUTE_NS, date_to_ns("2024-01-02"))]
+
+
+def test_limited_responses_advance_through_the_range(client, cache, fake_historical):
+    start = date_to_ns("2024-01-01")
+    end = start + 3 * MINUTE_NS
+    for _ in range(3):
+        client.get_range("2024-01-01", "2024-01-01T00:03:00", limit=1)
+
+    assert cache.missing(start=start, end=end, **KEY) == []
+    # Each record was fetched once
+    assert [c["start"] for c in fake_historical.timeseries.calls] == [
+        start,
+        start + MINUTE_NS,
+        start + 2 * MINUTE_NS,
+    ]
+
+
+def test_limited_response_without_records_in_range_is_rejected(cache, tmp_path):
+    start = date_to_ns("2024-01-02")
+    end = start + 60 * MINUTE_NS
+
+    def fetch(_gap_start, _gap_end, path):
+        # Records before the requested range
+        path.write_bytes(ohlcv_dbn_bytes("2024-01-01T23:00:00", 10))
+        return DBNStore.from_file(path)
+
+    with pytest.raises(ValueError, match="cannot be cached"):
+        cache.fetch_missing(start=start, end=end, fetch=fetch, limit=10, **KEY)
+
+    assert cache.missing(start=start, end=end, **KEY) == [(start, end)]
+    assert not list(cache.directory.rglob("*.dbn"))
+
+
+def test_get_range_registers_new_files_in_catalog(client, catalog):
+    client.get_range("2024-01-01", "2024-01-02", limit=None)
+
+    assert [e.count for e in catalog.entries] == [1440]
+    assert catalog.entries[0].path.startswith("cache/GLBX.MDP3/ohlcv-1m/ES.v.0/")
+
+
+def test_merge_dbn_stores_sorts_clips_and_deduplicates():
+    stores = [
+        ohlcv_dbn_store("2024-01-01T01:00:00", 120),
+        ohlcv_dbn_store("2024-01-01T00:00:00", 90),
+    ]
+    start = date_to_ns("2024-01-01") + 30 * MINUTE_NS
+
+    merged = merge_dbn_stores(stores, start, start + 120 * MINUTE_NS)
+
+    ts_event = merged.to_ndarray()["ts_event"]
+    assert len(ts_event) == 120
+    assert ts_event[0] == start
+    assert (ts_event[1:] - ts_event[:-1] == MINUTE_NS).all()
+    assert merged.metadata.mappings == stores[0].metadata.mappings
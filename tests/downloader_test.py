@@ -0,0 +1,134 @@
+import json
+from datetime import date
+
+import pytest
+from databento import BentoClientError
+
+from src.databento_client import DatabentoClient
+from src.downloader import Partition, PartitionedDownloader, split_date_range
+from testing_utils.databento_fakes import FakeHistorical
+
+
+@pytest.fixture
+def fake_historical(monkeypatch):
+    historical = FakeHistorical()
+    monkeypatch.setattr("databento.Historical", lambda _: historical)
+    return historical
+
+
+@pytest.fixture
+def client(fake_historical):
+    return DatabentoClient(api_key="db-test")
+
+
+@pytest.fixture
+def downloader(client, tmp_path):
+    return PartitionedDownloader(client=client, directory=tmp_path, backoff=0)
+
+
+def test_split_date_range_by_day():
+    assert split_date_range("2024-01-01", "2024-01-04", "day") == [
+        Partition(date(2024, 1, 1), date(2024, 1, 2)),
+        Partition(date(2024, 1, 2), date(2024, 1, 3)),
+        Partition(date(2024, 1, 3), date(2024, 1, 4)),
+    ]
+
+
+def test_split_date_range_by_week_aligns_to_mondays():
+    assert split_date_range("2024-01-03", "2024-01-17", "week") == [
+        Partition(date(2024, 1, 3), date(2024, 1, 8)),
+        Partition(date(2024, 1, 8), date(2024, 1, 15)),
+        Partition(date(2024, 1, 15), date(2024, 1, 17)),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("start_date", "end_date", "frequency"),
+    [
+        ("2024-01-02", "2024-01-01", "day"),
+        ("2024-01-01", "2024-01-01", "day"),
+        ("2024-01-01", "2024-01-02", "month"),
+    ],
+)
+def test_split_date_range_invalid_arguments(start_date, end_date, frequency):
+    with pytest.raises(ValueError):
+        split_date_range(start_date, end_date, frequency)
+
+
+def test_download_writes_partitions_and_manifest(downloader, fake_historical, tmp_path):
+    written = downloader.download("2024-01-01", "2024-01-04", limit=10)
+
+    assert [p.name for p in written] == [
+        "2024-01-01_2024-01-02.dbn",
+        "2024-01-02_2024-01-03.dbn",
+        "2024-01-03_2024-01-04.dbn",
+    ]
+    assert len(fake_historical.timeseries.calls) == 3
+
+    with (tmp_path / "manifest.json").open() as f:
+        manifest = json.load(f)
+    assert sorted(manifest["partitions"]) == [p.stem for p in written]
+    assert [p["file"] for p in manifest["partitions"].values()] == [
+        p.name for p in written
+    ]
+
+
+def test_download_resumes_from_missing_partitions(downloader, fake_historical):
+    downloader.download("2024-01-01", "2024-01-03", limit=10)
+    fake_historical.timeseries.calls.clear()
+
+    written = downloader.download("2024-01-01", "2024-01-05", limit=10)
+
+    assert [p.name for p in written] == [
+        "2024-01-03_2024-01-04.dbn",
+        "2024-01-04_2024-01-05.dbn",
+    ]
+    assert sorted(c["start"] for c in fake_historical.timeseries.calls) == [
+        "2024-01-03T00:00:00",
+        "2024-01-04T00:00:00",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("limit", "resume_limit", "downloaded"),
+    [(10, 5, False), (10, 10, False), (10, 20, True), (10, None, True), (None, 5, False)],
+)
+def test_download_resumes_with_changed_limit(
+    downloader, fake_historical, limit, resume_limit, downloaded
+):
+    downloader.download("2024-01-01", "2024-01-03", limit=limit)
+    fake_historical.timeseries.calls.clear()
+
+    written = downloader.download("2024-01-01", "2024-01-03", limit=resume_limit)
+
+    assert len(written) == (2 if downloaded else 0)
+    assert [c["limit"] for c in fake_historical.timeseries.calls] == (
+        [resume_limit] * 2 if downloaded else []
+    )
+    with (downloader.directory / "manifest.json").open() as f:
+        manifest = json.load(f)
+    assert {p["limit"] for p in manifest["partitions"].values()} == {
+        resume_limit if downloaded else limit
+    }
+
+
+def test_download_retries_server_errors(downloader, fake_historical):
+    fake_historical.timeseries.failures = 2
+
+    written = downloader.download("2024-01-01", "2024-01-02", limit=10)
+
+    assert len(written) == 1
+    assert len(fake_historical.timeseries.calls) == 3
+
+
+def test_download_does_not_retry_client_errors(downloader, fake_historical, monkeypatch):
+    def get_range(**kwargs):
+        fake_historical.timeseries.calls.append(kwargs)
+        raise BentoClientError(http_status=401, message="Unauthorized")
+
+    monkeypatch.setattr(fake_historical.timeseries, "get_range", get_range)
+
+    with pytest.raises(BentoClientError):
+        downloader.download("2024-01-01", "2024-01-02")
+
+    assert len(fake_historical.timeseries.calls) == 1
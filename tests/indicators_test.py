@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+import pytest
+from nautilus_trader.indicators import ExponentialMovingAverage, SimpleMovingAverage
+
+from src.indicators import IndicatorCache, closes_hash, ema, load_series, sma
+
+NAUTILUS_AVERAGES = {
+    "sma": (sma, SimpleMovingAverage),
+    "ema": (ema, ExponentialMovingAverage),
+}
+
+
+@pytest.fixture
+def closes():
+    rng = np.random.default_rng(7)
+    return 4_500 + np.cumsum(rng.normal(0, 1, 500)).round(2)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return IndicatorCache(tmp_path / "indicator_cache", max_bytes=1024**2)
+
+
+@pytest.mark.parametrize("kind", ["sma", "ema"])
+@pytest.mark.parametrize("period", [1, 2, 7, 50])
+def test_averages_match_nautilus(closes, kind, period):
+    average, indicator_class = NAUTILUS_AVERAGES[kind]
+    indicator = indicator_class(period)
+    expected = []
+    for close in closes:
+        indicator.update_raw(float(close))
+        expected.append(indicator.value)
+
+    assert average(closes, period).tolist() == expected
+
+
+@pytest.mark.parametrize("period", [200, 1_000])
+def test_sma_matches_nautilus_on_long_periods(period):
+    # Summed close by close in the order of the indicator, so the rounding is the
+    # same however long the window
+    closes = 4_500 + np.cumsum(np.random.default_rng(11).normal(0, 1, 5_000)).round(2)
+    indicator = SimpleMovingAverage(period)
+    expected = []
+    for close in closes:
+        indicator.update_raw(float(close))
+        expected.append(indicator.value)
+
+    assert sma(closes, period).tolist() == expected
+
+
+def test_precompute_reuses_cached_series(cache, closes, monkeypatch):
+    data_hash = cache.precompute(closes, "sma", [5, 20])
+    monkeypatch.setattr("src.indicators.AVERAGES", {})
+
+    assert cache.precompute(closes, "sma", [20, 5]) == data_hash
+    assert data_hash == closes_hash(closes)
+    series = load_series(str(cache.directory), data_hash, "sma", 20)
+    assert series.tolist() == sma(closes, 20).tolist()
+
+
+def test_evicts_least_recently_used_series(closes, tmp_path):
+    cache = IndicatorCache(
+        tmp_path / "indicator_cache", max_bytes=2 * closes.nbytes + 512
+    )
+    data_hash = cache.precompute(closes, "sma", [5])
+    old = cache.directory / f"{data_hash}_sma_5.npy"
+    os.utime(old, ns=(0, 0))
+
+    cache.precompute(closes, "sma", [10, 20])
+
+    assert not old.exists()
+    assert sorted(p.name for p in cache.directory.glob("*.npy")) == [
+        f"{data_hash}_sma_10.npy",
+        f"{data_hash}_sma_20.npy",
+    ]
@@ -0,0 +1,49 @@
+import subprocess
+import sys
+
+import pytest
+from click.testing import CliRunner
+
+from cli.indicator.main import indicator_subcommands
+from cli.main import SUBCOMMANDS, main
+
+
+@pytest.mark.parametrize("group", [main, indicator_subcommands])
+def test_short_help_matches_commands(group):
+    for name, (_, short_help) in group.lazy_subcommands.items():
+        command = group.load_command(name)
+
+        assert command.name == name
+        assert command.help.startswith(short_help)
+
+
+def test_help_lists_every_command():
+    result = CliRunner().invoke(main, ["--help"])
+
+    assert result.exit_code == 0
+    assert all(name in result.output for name in SUBCOMMANDS)
+
+
+def test_lazy_command_runs():
+    result = CliRunner().invoke(main, ["indicator", "ma_cross", "--help"])
+
+    assert result.exit_code == 0
+    assert "--fast_period" in result.output
+
+
+def test_help_imports_no_heavy_modules():
+    code = (
+        "import sys\n"
+        "from cli.main import main\n"
+        "try:\n"
+        "    main(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print(sorted({'nautilus_trader', 'databento', 'reportlab', 'pandas'}"
+        " & set(sys.modules)), file=sys.stderr)\n"
+    )
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert output.stderr.strip() == "[]"
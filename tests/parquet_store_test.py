@@ -0,0 +1,97 @@
+import pytest
+
+from src.bars import bar_type_for, load_bars
+from src.catalog import PriceDataCatalog
+from src.parquet_store import ParquetBarStore
+from src.utils import date_to_ns
+from testing_utils.backtest_utils import INSTRUMENT_ID
+from testing_utils.dbn_utils import MINUTE_NS, write_ohlcv_dbn
+
+BAR_TYPE = bar_type_for(INSTRUMENT_ID, "ohlcv-1m")
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    dbn_path = tmp_path / "dbn"
+    dbn_path.mkdir()
+    write_ohlcv_dbn(dbn_path / "a.dbn", "2024-01-02T00:00:00", 120)
+    write_ohlcv_dbn(dbn_path / "b.dbn", "2024-01-02T03:00:00", 60)
+    write_ohlcv_dbn(dbn_path / "c.dbn", "2024-01-02T00:30:00", 240, seed=1)
+    return PriceDataCatalog.load(dbn_path)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ParquetBarStore(tmp_path / "parquet")
+
+
+def entry_bars(catalog, name):
+    entry = next(e for e in catalog.entries if e.path == name)
+    return load_bars(catalog, [entry], INSTRUMENT_ID)
+
+
+def test_bar_type_for_matches_loader(catalog):
+    assert entry_bars(catalog, "a.dbn")[0].bar_type == BAR_TYPE
+
+
+def test_write_skips_stored_bars_and_fills_gaps(catalog, store):
+    assert store.write(entry_bars(catalog, "a.dbn")) == 120
+    assert store.write(entry_bars(catalog, "b.dbn")) == 60
+    assert store.write(entry_bars(catalog, "c.dbn")) == 90
+    assert store.write(entry_bars(catalog, "c.dbn")) == 0
+
+    bars = store.bars(BAR_TYPE)
+    timestamps = [bar.ts_init for bar in bars]
+    assert len(bars) == 270
+    assert timestamps == sorted(set(timestamps))
+
+
+def test_write_replaces_bars_of_a_changed_file(catalog, store):
+    entry = next(e for e in catalog.entries if e.path == "a.dbn")
+    store.write(entry_bars(catalog, "a.dbn"))
+    store.write(entry_bars(catalog, "b.dbn"))
+    store.mark_converted(entry)
+    # Downloaded again with other prices and more bars
+    write_ohlcv_dbn(catalog.path(entry), "2024-01-02T00:00:00", 150, seed=2)
+    entry = catalog.add(catalog.path(entry))
+    assert store.is_changed(entry)
+
+    bars = entry_bars(catalog, "a.dbn")
+    assert store.write(bars, replace=True) == 150
+
+    stored = store.bars(BAR_TYPE)
+    assert len(stored) == 210
+    assert stored[:150] == bars
+
+
+def test_bars_returns_bars_opening_in_range(catalog, store):
+    store.write(entry_bars(catalog, "a.dbn"))
+    start = date_to_ns("2024-01-02") + 30 * MINUTE_NS
+
+    bars = store.bars(BAR_TYPE, start=start, end=start + 60 * MINUTE_NS)
+
+    assert len(bars) == 60
+    assert bars[0].ts_event == start + MINUTE_NS
+    assert bars == entry_bars(catalog, "a.dbn")[30:90]
+
+
+def test_stream_matches_bars(catalog, store):
+    store.write(entry_bars(catalog, "a.dbn"))
+    store.write(entry_bars(catalog, "b.dbn"))
+    start = date_to_ns("2024-01-02") + 30 * MINUTE_NS
+
+    chunks = list(store.stream(BAR_TYPE, start=start, chunk_size=50))
+
+    assert all(0 < len(chunk) <= 50 for chunk in chunks)
+    assert [bar for chunk in chunks for bar in chunk] == store.bars(BAR_TYPE, start=start)
+
+
+def test_converted_files_are_tracked(catalog, store, tmp_path):
+    entry = catalog.entries[0]
+    assert not store.is_converted(entry)
+
+    store.mark_converted(entry)
+
+    assert ParquetBarStore(tmp_path / "parquet").is_converted(entry)
+    write_ohlcv_dbn(catalog.path(entry), "2024-01-05", 10)
+    assert not store.is_converted(catalog.add(catalog.path(entry)))
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from src.backtest import STRATEGIES, BacktestRunner
+from src.catalog import PriceDataCatalog
+from src.indicators import ema
+from src.prescreen import prescreen, prescreen_bars, top_combinations
+from src.utils import date_to_ns
+from testing_utils.backtest_utils import INSTRUMENT_ID, catalog_backtest_data
+from testing_utils.dbn_utils import PRICE_SCALE, ohlcv_records, write_ohlcv_dbn
+
+
+@pytest.fixture
+def records():
+    return ohlcv_records(date_to_ns("2024-01-02"), 500)
+
+
+def reference_backtest(kind, closes, single_price, fast, slow, trade_size=100.0):  # noqa: PLR0913
+    """Bar by bar loop of the crossover logic the pre-screen vectorises."""
+    position = 0.0
+    equity = peak = drawdown = 0.0
+    trades = 0
+    for i in range(len(closes)):
+        if i:
+            equity += position * (closes[i] - closes[i - 1])
+        if i + 1 < slow or single_price[i]:
+            continue
+
+        peak = max(peak, equity)
+        drawdown = max(drawdown, peak - equity)
+        if kind == "sma":
+            fast_average = closes[i + 1 - fast : i + 1].mean()
+            slow_average = closes[i + 1 - slow : i + 1].mean()
+        else:
+            fast_average = ema(closes[: i + 1], fast)[-1]
+            slow_average = ema(closes[: i + 1], slow)[-1]
+        target = trade_size if fast_average >= slow_average else -trade_size
+        trades += target != position
+        position = target
+
+    peak = max(peak, equity)
+    drawdown = max(drawdown, peak - equity)
+    return equity, drawdown, trades
+
+
+@pytest.mark.parametrize("kind", ["sma", "ema"])
+def test_prescreen_matches_bar_by_bar_loop(records, kind):
+    closes = records["close"] / PRICE_SCALE
+    single_price = np.zeros(len(closes), dtype=bool)
+    single_price[::7] = True
+    grid = [(3, 10), (5, 20), (10, 20), (2, 60)]
+
+    rows = prescreen(kind, closes, single_price, grid, max_workers=1)
+
+    for row, (fast, slow) in zip(rows, grid, strict=True):
+        pnl, drawdown, trades = reference_backtest(kind, closes, single_price, fast, slow)
+        assert (row["fast_period"], row["slow_period"]) == (fast, slow)
+        assert row["approx_pnl"] == pytest.approx(pnl)
+        assert row["max_drawdown"] == pytest.approx(drawdown, rel=1e-4)
+        assert row["trades"] == trades
+
+
+def test_prescreen_in_parallel_matches_single_process(records):
+    closes = records["close"] / PRICE_SCALE
+    single_price = np.zeros(len(closes), dtype=bool)
+    grid = [(fast, slow) for fast in range(2, 20, 3) for slow in range(10, 60, 7)]
+
+    assert prescreen("sma", closes, single_price, grid, max_workers=3) == prescreen(
+        "sma", closes, single_price, grid, max_workers=1
+    )
+
+
+def test_top_combinations():
+    rows = [
+        {"fast_period": 5, "slow_period": 20, "approx_pnl": 10.0},
+        {"fast_period": 10, "slow_period": 20, "approx_pnl": 30.0},
+        {"fast_period": 5, "slow_period": 30, "approx_pnl": 20.0},
+    ]
+
+    assert top_combinations(rows, 2) == [(10, 20), (5, 30)]
+
+
+@pytest.mark.parametrize("strategy_name", ["ma_cross", "ema_cross"])
+def test_prescreen_cross_checked_with_engine(tmp_path, strategy_name):
+    write_ohlcv_dbn(tmp_path / "data.dbn", "2024-01-02", 2000)
+    catalog = PriceDataCatalog.load(tmp_path)
+    data = catalog_backtest_data(catalog)
+    grid = [(5, 20), (10, 30), (3, 50), (20, 40)]
+
+    rows = prescreen_bars(strategy_name, data.bars, grid, max_workers=1)
+    engine_pnls, engine_orders = [], []
+    with BacktestRunner(data, log_level="ERROR") as runner:
+        for fast, slow in grid:
+            result = runner.run(STRATEGIES[strategy_name], fast, slow)
+            pnl = runner.engine.portfolio.realized_pnl(INSTRUMENT_ID)
+            engine_pnls.append(pnl.as_double())
+            engine_orders.append(result.total_orders)
+
+    approx_pnls = [row["approx_pnl"] for row in rows]
+    # The engine fills against the bar volume, the pre-screen at the close
+    assert np.argsort(approx_pnls).tolist() == np.argsort(engine_pnls).tolist()
+    for approx_pnl, engine_pnl in zip(approx_pnls, engine_pnls, strict=True):
+        assert approx_pnl == pytest.approx(engine_pnl, abs=250)
+    for row, orders in zip(rows, engine_orders, strict=True):
+        # A flip is two orders, closing and opening, plus the close on stop
+        assert abs(orders - 2 * row["trades"]) <= 4
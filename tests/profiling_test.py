@@ -0,0 +1,50 @@
+import pstats
+import time
+
+from src.profiling import Profiler, phase, profile_table
+
+
+def busy(seconds):
+    end = time.process_time() + seconds
+    while time.process_time() < end:
+        pass
+
+
+def test_phases_record_wall_cpu_and_peak_rss():
+    profiler = Profiler()
+
+    with profiler.phase("first"):
+        busy(0.01)
+    with profiler.phase("second"):
+        time.sleep(0.01)
+
+    assert list(profiler.phases) == ["first", "second"]
+    first, second = profiler.phases["first"], profiler.phases["second"]
+    assert first["cpu_s"] >= 0.01
+    assert second["wall_s"] >= 0.01
+    assert second["cpu_s"] < second["wall_s"]
+    assert 0 < first["peak_rss_mb"] <= second["peak_rss_mb"]
+    assert "cprofile" not in first
+    assert "second" in profile_table(profiler.phases)
+
+
+def test_repeated_phase_adds_up(tmp_path):
+    profiler = Profiler(tmp_path / "profile")
+
+    for _ in range(2):
+        with profiler.phase("run"):
+            busy(0.01)
+
+    assert profiler.phases["run"]["cpu_s"] >= 0.02
+    stats = pstats.Stats(profiler.phases["run"]["cprofile"])
+    calls = [
+        count
+        for (_, _, function), (count, *_) in stats.stats.items()
+        if function == "busy"
+    ]
+    assert calls == [2]
+
+
+def test_phase_without_profiler_does_nothing():
+    with phase(None, "run"):
+        pass
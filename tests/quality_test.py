@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from src.quality import SESSION_BREAK, scan_files, scan_records
+from src.utils import date_to_ns
+from testing_utils.dbn_utils import MINUTE_NS, PRICE_SCALE, ohlcv_records, write_ohlcv_dbn
+
+
+@pytest.fixture
+def records():
+    return ohlcv_records(date_to_ns("2024-01-02"), 100)
+
+
+def test_scan_clean_records(records):
+    report = scan_records(records, MINUTE_NS)
+
+    assert report.count == 100
+    assert report.missing == 0
+    assert report.session_breaks == 0
+    assert report.duplicates == 0
+    assert report.out_of_order == 0
+    assert report.spikes == 0
+
+
+def test_scan_missing_minutes_and_session_breaks(records):
+    records = np.concatenate((records[:10], records[13:50], records[50:]))
+    records["ts_event"][40:] += SESSION_BREAK
+
+    report = scan_records(records, MINUTE_NS)
+
+    assert report.missing == 3
+    assert report.session_breaks == 1
+
+
+def test_scan_duplicates_and_out_of_order(records):
+    records = np.concatenate((records, records[[20]]))
+    records[[30, 31]] = records[[31, 30]]
+
+    report = scan_records(records, MINUTE_NS)
+
+    assert report.count == 101
+    assert report.duplicates == 1
+    assert report.out_of_order == 2
+    assert report.missing == 0
+
+
+def test_scan_single_price_bars(records):
+    single_price = scan_records(records, MINUTE_NS).single_price
+    bar = next(i for i in range(len(records)) if records["high"][i] != records["low"][i])
+    for column in ("open", "high", "low"):
+        records[column][bar] = records["close"][bar]
+
+    assert scan_records(records, MINUTE_NS).single_price == single_price + 1
+
+
+def test_scan_spikes(records):
+    records["close"][50] += 200 * PRICE_SCALE
+
+    # Up to the spike and back down
+    assert scan_records(records, MINUTE_NS).spikes == 2
+
+
+def test_scan_files_in_parallel(tmp_path):
+    paths = [
+        write_ohlcv_dbn(tmp_path / "a.dbn", "2024-01-02", 60),
+        write_ohlcv_dbn(tmp_path / "b.dbn", "2024-01-03", 30),
+    ]
+
+    reports = scan_files(paths, max_workers=2)
+
+    assert [report.count for report in reports] == [60, 30]
+    assert [report.missing for report in reports] == [0, 0]
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import pytest
+from nautilus_trader.adapters.databento import DatabentoDataLoader
+
+from src.catalog import PriceDataCatalog
+from src.resample import (
+    TIMEFRAME_INTERVALS,
+    ResampledBarStore,
+    read_source_records,
+    resample_records,
+)
+from src.shared_bars import bars_to_records
+from src.utils import date_to_ns
+from testing_utils.backtest_utils import INSTRUMENT_ID
+from testing_utils.dbn_utils import write_ohlcv_dbn
+
+MINUTE_NS = 60_000_000_000
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    root = tmp_path / "price_data"
+    root.mkdir()
+    write_ohlcv_dbn(root / "a.dbn", "2024-01-02", 600)
+    # Overlaps the first file by an hour, its duplicate bars are dropped
+    write_ohlcv_dbn(root / "b.dbn", "2024-01-02T09:00", 300, seed=1)
+    return PriceDataCatalog.load(root)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResampledBarStore(tmp_path / "resampled")
+
+
+def test_source_records_match_loader(catalog):
+    records = read_source_records(catalog, catalog.entries)
+
+    loader = DatabentoDataLoader()
+    bars_by_ts = {}
+    for entry in catalog.entries:
+        for bar in loader.from_dbn_file(catalog.path(entry), instrument_id=INSTRUMENT_ID):
+            bars_by_ts.setdefault(bar.ts_event, bar)
+    expected = bars_to_records([bars_by_ts[ts] for ts in sorted(bars_by_ts)])
+    assert records.tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize("timeframe", list(TIMEFRAME_INTERVALS))
+def test_resample_matches_pandas(catalog, timeframe):
+    records = read_source_records(catalog, catalog.entries)
+
+    resampled = resample_records(records, MINUTE_NS, TIMEFRAME_INTERVALS[timeframe])
+
+    frame = pd.DataFrame(records).set_index(
+        pd.to_datetime(records["ts_event"] - MINUTE_NS, unit="ns")
+    )
+    expected = (
+        frame.resample(pd.Timedelta(TIMEFRAME_INTERVALS[timeframe], unit="ns"))
+        .agg(
+            {
+                "open": "first",
+                "high": "max",
+                "low": "min",
+                "close": "last",
+                "volume": "sum",
+            }
+        )
+        .dropna()
+    )
+    closes = expected.index.as_unit("ns").asi8 + TIMEFRAME_INTERVALS[timeframe]
+    assert resampled["ts_event"].tolist() == closes.tolist()
+    for column in ("open", "high", "low", "close", "volume"):
+        assert resampled[column].tolist() == expected[column].tolist()
+
+
+def test_store_bars(catalog, store):
+    bars = store.bars(
+        catalog,
+        catalog.entries,
+        INSTRUMENT_ID,
+        "15m",
+        start=date_to_ns("2024-01-02") + 60 * MINUTE_NS,
+    )
+
+    assert str(bars[0].bar_type) == "ES.v.0.GLBX-15-MINUTE-LAST-EXTERNAL"
+    assert bars[0].ts_event == date_to_ns("2024-01-02") + 75 * MINUTE_NS
+    # 14 hours of bars, the first hour left out
+    assert len(bars) == 52
+    chunks = store.stream(catalog, catalog.entries, INSTRUMENT_ID, "15m", chunk_size=7)
+    assert [bar for chunk in chunks for bar in chunk] == store.bars(
+        catalog, catalog.entries, INSTRUMENT_ID, "15m"
+    )
+
+
+def test_changed_source_invalidates_store(catalog, store):
+    before = np.array(store.records(catalog, catalog.entries, INSTRUMENT_ID, "1h"))
+    assert store.is_current(catalog, catalog.entries, INSTRUMENT_ID, "1h")
+
+    write_ohlcv_dbn(catalog.root / "a.dbn", "2024-01-02", 600, seed=2)
+    catalog.refresh()
+
+    assert not store.is_current(catalog, catalog.entries, INSTRUMENT_ID, "1h")
+    after = store.records(catalog, catalog.entries, INSTRUMENT_ID, "1h")
+    assert after["close"].tolist() != before["close"].tolist()
+    assert store.is_current(catalog, catalog.entries, INSTRUMENT_ID, "1h")
+
+
+def test_build_rejects_other_schemas(catalog, store):
+    entries = [*catalog.entries]
+    entries[0] = type(entries[0])(**{**vars(entries[0]), "schema": "ohlcv-1h"})
+
+    with pytest.raises(ValueError, match="ohlcv-1m"):
+        store.build(catalog, entries, INSTRUMENT_ID, ["1h"])
@@ -0,0 +1,192 @@
+import json
+import math
+import sqlite3
+from dataclasses import replace
+
+import pytest
+
+from src.backtest import STRATEGIES, run_backtest
+from src.result_cache import (
+    REPORT_DEFERRED,
+    REPORT_INLINE,
+    REPORT_NONE,
+    ResultCache,
+    flatten_stats,
+    render_reports,
+    stat_column,
+)
+
+
+@pytest.fixture(scope="module")
+def result(data):
+    return run_backtest(data, STRATEGIES["ma_cross"], 5, 20, "ERROR")
+
+
+def test_get_returns_put_result(tmp_path, result):
+    cache = ResultCache(tmp_path / "cache")
+
+    cache.put("key", result)
+    cached = cache.get("key")
+
+    assert cached.stats_pnls == result.stats_pnls
+    assert cached.total_orders == result.total_orders
+    assert cached.backtest_start == result.backtest_start
+    assert cache.keys() == ["key"]
+
+
+def test_get_returns_none_for_missing_or_invalid_entries(tmp_path, result):
+    cache = ResultCache(tmp_path)
+    cache.put("invalid", result)
+    cache.put("other", result)
+    with sqlite3.connect(cache.db_path) as connection:
+        connection.execute("UPDATE results SET result = '{' WHERE key = 'invalid'")
+        connection.execute(
+            "UPDATE results SET result = ? WHERE key = 'other'",
+            (json.dumps({"pnl": 1}),),
+        )
+
+    assert cache.get("missing") is None
+    assert cache.get("invalid") is None
+    assert cache.get("other") is None
+
+
+@pytest.mark.parametrize(
+    ("names", "column"),
+    [
+        (("pnls", "USD", "PnL (total)"), "pnls_usd_pnl_total"),
+        (("pnls", "USD", "PnL% (total)"), "pnls_usd_pnl_pct_total"),
+        (("returns", "Sharpe Ratio (252 days)"), "returns_sharpe_ratio_252_days"),
+    ],
+)
+def test_stat_column(names, column):
+    assert stat_column(*names) == column
+
+
+def test_query_sorts_by_a_statistic(tmp_path, result):
+    cache = ResultCache(tmp_path)
+    params = {"strategy": "ma_cross", "fast_period": 5, "slow_period": 20}
+    sharpes = {"a": 1.5, "b": -0.5, "c": 3.0, "d": math.nan}
+    for key, sharpe in sharpes.items():
+        stats_returns = {**result.stats_returns, "Sharpe Ratio (252 days)": sharpe}
+        cache.put(key, replace(result, stats_returns=stats_returns), params)
+    cache.put("e", result, {**params, "strategy": "ema_cross"})
+
+    rows = cache.query(sort="sharpe", top=2, strategy="ma_cross")
+
+    assert [(row["key"], row["sharpe"]) for row in rows] == [("c", 3.0), ("a", 1.5)]
+    assert rows[0]["fast_period"] == 5
+    # NaN statistics are not ranked
+    assert [row["key"] for row in cache.query(strategy="ma_cross", ascending=True)] == [
+        "b",
+        "a",
+        "c",
+    ]
+    column = stat_column("returns", "Sharpe Ratio (252 days)")
+    assert cache.query(sort=column, top=1)[0]["key"] == "c"
+
+
+def test_query_rejects_unknown_columns(tmp_path, result):
+    cache = ResultCache(tmp_path)
+
+    assert cache.query(sort="sharpe") == []
+    cache.put("key", result)
+    with pytest.raises(ValueError, match="Unknown sort column result"):
+        cache.query(sort="result")
+
+
+def test_statistics_are_indexed_columns(tmp_path, result):
+    cache = ResultCache(tmp_path)
+    cache.put("key", result)
+
+    with sqlite3.connect(cache.db_path) as connection:
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(results)")}
+        indexes = {row[1] for row in connection.execute("PRAGMA index_list(results)")}
+    stats = flatten_stats(result)
+    assert "returns_sharpe_ratio_252_days" in stats
+    assert set(stats) <= columns
+    assert {f"ix_{column}" for column in stats} <= indexes
+
+
+def test_report_is_generated_once(tmp_path, result):
+    cache = ResultCache(tmp_path)
+    cache.put("key", result)
+
+    pdf_path = cache.report("key")
+    modified = pdf_path.stat().st_mtime_ns
+
+    assert pdf_path == cache.pdf_path("key")
+    assert cache.report("key").stat().st_mtime_ns == modified
+
+
+def test_profile_is_added_to_the_entry(tmp_path, result):
+    cache = ResultCache(tmp_path)
+    cache.put("key", result)
+
+    cache.add_profile("key", {"engine_run": {"wall_s": 1.0}})
+
+    assert cache.data("key")["profile"] == {"engine_run": {"wall_s": 1.0}}
+    assert cache.get("key").total_orders == result.total_orders
+
+
+def test_put_replaces_the_report_of_an_earlier_run(tmp_path, result):
+    cache = ResultCache(tmp_path)
+    cache.put("key", result)
+    cache.report("key")
+
+    cache.put("key", result)
+
+    assert not cache.pdf_path("key").exists()
+
+
+@pytest.mark.parametrize(
+    ("mode", "rendered", "deferred"),
+    [
+        (REPORT_INLINE, True, []),
+        (REPORT_DEFERRED, False, ["key"]),
+        (REPORT_NONE, False, []),
+    ],
+)
+def test_handle_report(tmp_path, result, mode, rendered, deferred):
+    cache = ResultCache(tmp_path)
+    cache.put("key", result)
+
+    cache.handle_report("key", mode)
+
+    assert cache.pdf_path("key").exists() is rendered
+    assert cache.deferred_reports() == deferred
+
+
+def test_deferred_reports_stay_deferred_until_rendered(tmp_path, result):
+    cache = ResultCache(tmp_path)
+    for key in ("b", "a", "c"):
+        cache.put(key, result)
+    for key in ("a", "b", "a", "missing"):
+        cache.defer_report(key)
+
+    # Read twice, as by a `bt report` interrupted before rendering
+    assert cache.deferred_reports() == ["a", "b"]
+    assert cache.deferred_reports() == ["a", "b"]
+    cache.report("a")
+
+    assert cache.deferred_reports() == ["b"]
+
+
+def test_render_reports(tmp_path, result):
+    cache = ResultCache(tmp_path)
+    cache.put("a", result)
+    cache.put("b", result)
+    cache.report("b")
+    finished = {}
+
+    failed = render_reports(
+        cache,
+        [*cache.missing_reports(), "missing"],
+        max_workers=2,
+        on_finish=lambda key, path, error: finished.update({key: (path, error)}),
+    )
+
+    assert cache.missing_reports() == []
+    assert failed == ["missing"]
+    assert finished["a"] == (cache.pdf_path("a"), None)
+    assert finished["missing"][0] is None
+    assert "KeyError" in finished["missing"][1]
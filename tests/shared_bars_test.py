@@ -0,0 +1,82 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+from nautilus_trader.adapters.databento import DatabentoDataLoader
+
+from src.shared_bars import SharedBars
+from src.utils import date_to_ns
+from testing_utils.backtest_utils import INSTRUMENT_ID
+from testing_utils.dbn_utils import MINUTE_NS, write_ohlcv_dbn
+
+
+@pytest.fixture
+def bars(tmp_path):
+    path = write_ohlcv_dbn(tmp_path / "data.dbn", "2024-01-02", 120)
+    return DatabentoDataLoader().from_dbn_file(path, instrument_id=INSTRUMENT_ID)
+
+
+def _attached_bar_count(handle, start, end):
+    with SharedBars.attach(handle) as shared_bars:
+        return len(shared_bars.bars(start, end))
+
+
+def test_bars_round_trip(bars, tmp_path):
+    with SharedBars.publish(bars, directory=tmp_path) as shared_bars:
+        assert shared_bars.bars() == bars
+
+
+def test_bars_in_range(bars, tmp_path):
+    start = date_to_ns("2024-01-02") + 30 * MINUTE_NS
+    end = date_to_ns("2024-01-02") + 90 * MINUTE_NS
+
+    with SharedBars.publish(bars, directory=tmp_path) as shared_bars:
+        range_bars = shared_bars.bars(start, end)
+
+    assert range_bars == [bar for bar in bars if start < bar.ts_event <= end]
+
+
+def test_stream_in_chunks(bars, tmp_path):
+    start = date_to_ns("2024-01-02") + 30 * MINUTE_NS
+
+    with SharedBars.publish(bars, directory=tmp_path) as shared_bars:
+        chunks = list(shared_bars.stream(start, chunk_size=25))
+        assert len(shared_bars.select(start)) == 90
+
+    assert [len(chunk) for chunk in chunks] == [25, 25, 25, 15]
+    assert [bar for chunk in chunks for bar in chunk] == bars[30:]
+
+
+def test_attach_from_worker_processes(bars, tmp_path):
+    start = date_to_ns("2024-01-02")
+
+    with (
+        SharedBars.publish(bars, directory=tmp_path) as shared_bars,
+        ProcessPoolExecutor(max_workers=2) as executor,
+    ):
+        counts = list(
+            executor.map(
+                _attached_bar_count,
+                [shared_bars.handle] * 3,
+                [None, start, start + 60 * MINUTE_NS],
+                [None, start + 10 * MINUTE_NS, None],
+            )
+        )
+
+    assert counts == [120, 10, 60]
+
+
+def test_close_deletes_published_file(bars, tmp_path):
+    shared_bars = SharedBars.publish(bars, directory=tmp_path)
+    path = Path(shared_bars.handle.path)
+    SharedBars.attach(shared_bars.handle).close()
+    assert path.exists()
+
+    shared_bars.close()
+
+    assert not path.exists()
+
+
+def test_publish_rejects_empty_bars(tmp_path):
+    with pytest.raises(ValueError):
+        SharedBars.publish([], directory=tmp_path)
@@ -0,0 +1,66 @@
+import hashlib
+import json
+
+import pytest
+from databento.common.dbnstore import DBNStore
+
+from src.summary import load_summary, summarize_records, summary_path
+from src.utils import date_to_ns
+from testing_utils.dbn_utils import MINUTE_NS, write_ohlcv_dbn
+
+
+@pytest.fixture
+def path(tmp_path):
+    return write_ohlcv_dbn(tmp_path / "data.dbn", "2024-01-03T12:00:00", 1440)
+
+
+def test_summarize_records_reads_in_chunks(path, monkeypatch):
+    monkeypatch.setattr("src.summary.READ_CHUNK_SIZE", 7)
+    store = DBNStore.from_file(path)
+
+    count, start, end = summarize_records(store)
+
+    assert count == 1440
+    assert start == date_to_ns("2024-01-03") + 12 * 60 * MINUTE_NS
+    assert end == start + 1439 * MINUTE_NS
+
+
+def test_load_summary_writes_sidecar(path):
+    summary = load_summary(path)
+
+    assert summary["count"] == 1440
+    assert summary["first_ts"] == date_to_ns("2024-01-03") + 12 * 60 * MINUTE_NS
+    assert summary["last_ts"] == summary["first_ts"] + 1439 * MINUTE_NS
+    assert summary["sha256"] == hashlib.sha256(path.read_bytes()).hexdigest()
+    assert summary["metadata"]["dataset"] == "GLBX.MDP3"
+    assert summary["metadata"]["schema"] == "ohlcv-1m"
+    assert summary["metadata"]["stype_in"] == "continuous"
+    assert summary["metadata"]["symbols"] == ["ES.v.0"]
+    assert summary["metadata"]["mappings"]["ES.v.0"][0]["start_date"] == "2024-01-03"
+    with summary_path(path).open() as f:
+        assert json.load(f) == summary
+
+
+def test_load_summary_reads_sidecar_without_decoding(path, monkeypatch):
+    load_summary(path)
+    monkeypatch.setattr("databento.common.dbnstore.DBNStore", None)
+
+    assert load_summary(path)["count"] == 1440
+
+
+def test_load_summary_rebuilds_stale_sidecar(path):
+    load_summary(path)
+    write_ohlcv_dbn(path.with_suffix(".new"), "2024-01-03", 10).replace(path)
+
+    assert load_summary(path)["count"] == 10
+
+
+def test_load_summary_recount(path):
+    load_summary(path)
+    sidecar = summary_path(path)
+    summary = json.loads(sidecar.read_text())
+    sidecar.write_text(json.dumps({**summary, "count": 1}))
+
+    assert load_summary(path)["count"] == 1
+    assert load_summary(path, recount=True)["count"] == 1440
+    assert json.loads(sidecar.read_text())["count"] == 1440
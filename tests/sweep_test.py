@@ -0,0 +1,95 @@
+import pytest
+
+from src.backtest import (
+    STRATEGIES,
+    THROUGHPUT_LOG_LEVEL,
+    BacktestData,
+    result_summary,
+    run_backtest,
+)
+from src.indicators import IndicatorCache, sma
+from src.result_cache import ResultCache
+from src.sweep import parameter_grid, parse_range, run_sweep
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("5:50:5", [5, 10, 15, 20, 25, 30, 35, 40, 45, 50]),
+        ("20:45:10", [20, 30, 40]),
+        ("3:5", [3, 4, 5]),
+        ("7", [7]),
+    ],
+)
+def test_parse_range(value, expected):
+    assert parse_range(value) == expected
+
+
+@pytest.mark.parametrize("value", ["a:b", "1:2:3:4", "10:5", "0:5", "5:10:0", ""])
+def test_parse_range_rejects_invalid_ranges(value):
+    with pytest.raises(ValueError):
+        parse_range(value)
+
+
+def test_parameter_grid_skips_fast_not_below_slow():
+    assert parameter_grid([10, 20, 30], [20, 30]) == [(10, 20), (10, 30), (20, 30)]
+
+
+@pytest.mark.parametrize("strategy_name", ["ma_cross", "ema_cross"])
+def test_run_sweep_matches_single_runs(data, strategy_name):
+    grid = [(5, 20), (10, 30)]
+
+    rows = run_sweep(data, strategy_name, grid, max_workers=2)
+
+    assert [(row["fast_period"], row["slow_period"]) for row in rows] == grid
+    for row, (fast, slow) in zip(rows, grid, strict=True):
+        result = run_backtest(data, STRATEGIES[strategy_name], fast, slow, "ERROR")
+        assert row["pnl"] == result_summary(result)["pnl"]
+        assert row["total_orders"] == result.total_orders
+        assert row["overhead_s"] > 0
+        assert row["run_s"] > 0
+
+
+def test_run_sweep_with_bypassed_logging(data):
+    grid = [(5, 20), (10, 30)]
+
+    rows = run_sweep(data, "ma_cross", grid, max_workers=1)
+    throughput_rows = run_sweep(
+        data, "ma_cross", grid, max_workers=1, log_level=THROUGHPUT_LOG_LEVEL
+    )
+
+    assert [row["pnl"] for row in throughput_rows] == [row["pnl"] for row in rows]
+
+
+def test_run_sweep_skips_cached_combinations(data, tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    data = BacktestData(data.bars, data.instrument, fingerprint="data")
+
+    first = run_sweep(data, "ma_cross", [(5, 20)], max_workers=1, cache=cache)
+    rows = run_sweep(data, "ma_cross", [(5, 20), (10, 30)], max_workers=1, cache=cache)
+
+    assert not first[0]["cached"]
+    assert [row["cached"] for row in rows] == [True, False]
+    assert rows[0]["pnl"] == first[0]["pnl"]
+    assert rows[0]["total_orders"] == first[0]["total_orders"]
+    assert rows[0]["run_s"] is None
+    assert {
+        (row["fast_period"], row["slow_period"], row["data_hash"])
+        for row in cache.query(sort="total_orders")
+    } == {(5, 20, "data"), (10, 30, "data")}
+
+
+def test_run_sweep_precomputes_each_period_once(data, tmp_path, monkeypatch):
+    indicators = IndicatorCache(tmp_path / "indicator_cache", max_bytes=1024**2)
+    grid = [(5, 20), (5, 30), (10, 30)]
+    expected = run_sweep(data, "ma_cross", grid, max_workers=1)
+    computed = []
+    monkeypatch.setattr(
+        "src.indicators.AVERAGES",
+        {"sma": lambda closes, period: computed.append(period) or sma(closes, period)},
+    )
+
+    rows = run_sweep(data, "ma_cross", grid, max_workers=1, indicators=indicators)
+
+    assert sorted(computed) == [5, 10, 20, 30]
+    assert [row["pnl"] for row in rows] == [row["pnl"] for row in expected]
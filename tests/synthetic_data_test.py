@@ -0,0 +1,33 @@
+import numpy as np
+
+from src.catalog import PriceDataCatalog
+from src.synthetic_data import DAY_NS, HOUR_NS, es_session_minutes, write_es_dbn
+from src.utils import date_to_ns
+
+
+def test_es_session_minutes_skip_breaks_and_weekends():
+    # Monday
+    start = date_to_ns("2024-01-01")
+
+    minutes = es_session_minutes(start, start + 7 * DAY_NS)
+
+    assert len(minutes) == 5 * 23 * 60
+    hours = minutes // HOUR_NS % 24
+    assert not np.any(hours == 22)
+    # Friday 22:00 to Sunday 23:00
+    closed = (minutes >= start + 4 * DAY_NS + 22 * HOUR_NS) & (
+        minutes < start + 6 * DAY_NS + 23 * HOUR_NS
+    )
+    assert not np.any(closed)
+    assert np.all(np.diff(minutes.astype(np.int64)) > 0)
+
+
+def test_write_es_dbn(tmp_path):
+    start = date_to_ns("2024-01-02")
+
+    write_es_dbn(tmp_path / "es.dbn", start, start + DAY_NS)
+
+    (entry,) = PriceDataCatalog.load(tmp_path).entries
+    assert entry.symbol == "ES.v.0"
+    assert entry.schema == "ohlcv-1m"
+    assert entry.start == start
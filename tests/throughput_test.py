@@ -0,0 +1,8 @@
+from src.throughput import LOGGING_OFF, LOGGING_ON, measure_throughput
+
+
+def test_measure_throughput_with_logging_on_and_off(data):
+    throughput = measure_throughput(data, "ma_cross", 5, 20)
+
+    assert set(throughput) == {LOGGING_ON, LOGGING_OFF}
+    assert all(bars_per_second > 0 for bars_per_second in throughput.values())
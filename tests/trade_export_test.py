@@ -0,0 +1,69 @@
+import pytest
+
+from src.backtest import (
+    STARTING_BALANCE,
+    STRATEGIES,
+    BacktestData,
+    BacktestRunner,
+)
+from src.trade_export import (
+    TRADE_TABLES,
+    export_trades,
+    has_trades,
+    read_trades,
+    trade_reports,
+)
+
+
+@pytest.fixture(scope="module")
+def runner(data):
+    with BacktestRunner(data, log_level="ERROR") as runner:
+        runner.result = runner.run(STRATEGIES["ma_cross"], 5, 20)
+        yield runner
+
+
+def test_export_trades(tmp_path, runner):
+    directory = tmp_path / "trades"
+
+    export_trades(runner.engine, directory)
+
+    assert has_trades(directory)
+    assert not list(directory.glob("*.tmp"))
+    for table, columns in TRADE_TABLES.items():
+        data = read_trades(directory, table)
+        assert data.dtypes.astype(str).to_dict() == columns
+    fills = read_trades(directory, "fills")
+    # Orders can be filled in several parts, or not at all at the end of the data
+    assert 0 < fills["client_order_id"].nunique() <= runner.result.total_orders
+    assert (fills["last_px"] > 0).all()
+    assert fills["ts_event"].is_monotonic_increasing
+    # The account balance ends at the starting balance plus the PnL of the run
+    account = read_trades(directory, "account")
+    assert account["total"].iloc[-1] == pytest.approx(
+        STARTING_BALANCE + runner.result.stats_pnls["USD"]["PnL (total)"]
+    )
+    positions = read_trades(directory, "positions")
+    assert positions["is_snapshot"].any()
+
+
+def test_read_trades_columns(tmp_path, runner):
+    export_trades(runner.engine, tmp_path)
+
+    fills = read_trades(tmp_path, "fills", columns=["ts_event", "last_px"])
+
+    assert list(fills.columns) == ["ts_event", "last_px"]
+
+
+def test_reports_of_an_engine_without_trades_are_empty(tmp_path, runner):
+    data = BacktestData(bars=runner.data.bars[:10], instrument=runner.data.instrument)
+    with BacktestRunner(data, log_level="ERROR") as empty:
+        empty.run(STRATEGIES["ma_cross"], 5, 20)
+        reports = trade_reports(empty.engine)
+        export_trades(empty.engine, tmp_path)
+
+    assert reports["fills"].empty
+    assert reports["positions"].empty
+    assert (
+        read_trades(tmp_path, "fills").dtypes.astype(str).to_dict()
+        == (TRADE_TABLES["fills"])
+    )
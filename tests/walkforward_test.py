@@ -0,0 +1,73 @@
+import pytest
+
+from src.backtest import (
+    STRATEGIES,
+    BacktestData,
+    result_summary,
+    run_backtest,
+)
+from src.walkforward import Fold, run_walkforward, split_folds, stitch_out_of_sample
+
+MINUTE = 60_000_000_000
+
+
+def test_split_folds():
+    assert split_folds(0, 100, 40, 25) == [
+        Fold(0, 0, 40, 40, 65),
+        Fold(1, 25, 65, 65, 90),
+        Fold(2, 50, 90, 90, 100),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("start", "end", "in_sample", "out_of_sample"),
+    [(0, 40, 40, 10), (0, 100, 0, 10), (0, 100, 40, 0)],
+)
+def test_split_folds_rejects_invalid_lengths(start, end, in_sample, out_of_sample):
+    with pytest.raises(ValueError):
+        split_folds(start, end, in_sample, out_of_sample)
+
+
+def slice_data(data, start, end):
+    bars = [bar for bar in data.bars if start < bar.ts_event <= end]
+    return BacktestData(bars=bars, instrument=data.instrument)
+
+
+def test_run_walkforward_matches_single_runs(data):
+    grid = [(5, 20), (10, 30)]
+    start = data.bars[0].ts_event - MINUTE
+    folds = split_folds(start, data.bars[-1].ts_event, 200 * MINUTE, 100 * MINUTE)
+
+    fold_results = run_walkforward(data, "ma_cross", grid, folds, max_workers=2)
+
+    assert [fold["index"] for fold in fold_results] == [0, 1, 2, 3]
+    strategy = STRATEGIES["ma_cross"]
+    for fold in fold_results:
+        in_sample = slice_data(data, fold["in_sample_start"], fold["in_sample_end"])
+        pnls = {
+            (fast, slow): result_summary(
+                run_backtest(in_sample, strategy, fast, slow, "ERROR")
+            )["pnl"]
+            for fast, slow in grid
+        }
+        best = max(pnls, key=pnls.get)
+        assert (fold["best"]["fast_period"], fold["best"]["slow_period"]) == best
+
+        out_of_sample = slice_data(
+            data, fold["out_of_sample_start"], fold["out_of_sample_end"]
+        )
+        result = run_backtest(out_of_sample, strategy, *best, "ERROR")
+        assert fold["out_of_sample"]["total_orders"] == result.total_orders
+        assert fold["equity"][-1][1] == pytest.approx(
+            result.stats_pnls["USD"]["PnL (total)"]
+        )
+
+    summary = stitch_out_of_sample(fold_results)
+
+    fold_pnls = [fold["equity"][-1][1] for fold in fold_results]
+    assert summary["stats_pnls"]["USD"]["PnL (total)"] == pytest.approx(sum(fold_pnls))
+    assert summary["equity"][-1][1] == pytest.approx(sum(fold_pnls))
+    assert summary["backtest_start"] == folds[0].out_of_sample_start
+    assert summary["total_orders"] == sum(
+        fold["out_of_sample"]["total_orders"] for fold in fold_results
+    )